@@ -0,0 +1,270 @@
+"""Batch create/update/soft-delete of organizations and memberships.
+
+POST /api/v1/batch/ with
+    {"operations": [{"op": "create", "type": "membership", "data": {...}},
+                    {"op": "update", "type": "organization", "id": 7, "data": {...}},
+                    {"op": "delete", "type": "membership", "id": 12}, ...]}
+
+All operations are validated together against a handful of prefetch queries; if any fails
+nothing is written and the valid ones are reported as "batch aborted". Otherwise they are applied with bulk statements (one bulk_create,
+bulk_update and soft-delete UPDATE per type) inside one transaction. The response holds one
+result per operation, in request order.
+
+Memberships reference existing organizations by id; create organizations in an earlier batch.
+"""
+import json
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.text import slugify
+from django.views.decorators.http import require_http_methods
+
+from apps.app_0.mod_0.gencache import bump, bump_queryset, namespaces_for
+from apps.app_admin.mod_siteadmin.models import Site, Organization, Membership, Role
+
+from .resources import Scope
+
+
+MAX_OPERATIONS = 5000
+ORG_FIELDS = {'create': {'site', 'name', 'slug', 'description'}, 'update': {'name', 'description'}}
+MEMBERSHIP_FIELDS = {'create': {'site', 'user', 'organization', 'role'}, 'update': {'organization', 'role', 'active'}}
+
+
+def _int(value):
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+class _Batch:
+    def __init__(self, user, operations: list):
+        self.ops = operations
+        self.scope = Scope.for_user(user)
+        self.errors: dict[int, list[str]] = defaultdict(list)
+        self.results: list[dict] = [{"index": i} for i in range(len(operations))]
+
+    def error(self, idx: int, message: str):
+        self.errors[idx].append(message)
+
+    def can_write(self, site_id) -> bool:
+        return self.scope.everything or site_id in self.scope.site_ids
+
+    # -- validation -------------------------------------------------------------------------
+    def check_shape(self):
+        seen = set()
+        for idx, op in enumerate(self.ops):
+            if not isinstance(op, dict):
+                self.error(idx, "Operation must be an object")
+                continue
+            kind, typ = op.get('op'), op.get('type')
+            if kind not in ('create', 'update', 'delete'):
+                self.error(idx, "op must be create, update or delete")
+            if typ not in ('organization', 'membership'):
+                self.error(idx, "type must be organization or membership")
+            if kind in ('update', 'delete'):
+                if _int(op.get('id')) is None:
+                    self.error(idx, "id is required")
+                elif (typ, op['id']) in seen:
+                    self.error(idx, f"{typ} {op['id']} appears more than once")
+                else:
+                    seen.add((typ, op['id']))
+            data = op.get('data')
+            if kind in ('create', 'update'):
+                allowed = (ORG_FIELDS if typ == 'organization' else MEMBERSHIP_FIELDS).get(kind, set())
+                if not isinstance(data, dict):
+                    self.error(idx, "data must be an object")
+                elif set(data) - allowed:
+                    self.error(idx, f"Unknown field(s): {', '.join(sorted(set(data) - allowed))}")
+            elif data is not None and not isinstance(data, dict):
+                # Deletes ignore data, but a malformed one is still an error
+                self.error(idx, "data must be an object")
+
+    def prefetch(self):
+        org_ids, mem_ids, site_ids, user_ids = set(), set(), set(), set()
+        for idx, op in enumerate(self.ops):
+            if idx in self.errors:
+                continue
+            data = op.get('data') or {} if op['op'] != 'delete' else {}
+            if op['type'] == 'organization':
+                if op['op'] == 'create':
+                    site_ids.add(_int(data.get('site')))
+                else:
+                    org_ids.add(op['id'])
+            else:
+                if op['op'] == 'create':
+                    site_ids.add(_int(data.get('site')))
+                    user_ids.add(_int(data.get('user')))
+                else:
+                    mem_ids.add(op['id'])
+                if _int(data.get('organization')) is not None:
+                    org_ids.add(data['organization'])
+        self.orgs = Organization.objects.in_bulk(list(org_ids))
+        self.memberships = Membership.objects.in_bulk(list(mem_ids))
+        site_ids |= {o.site_id for o in self.orgs.values()} | {m.site_id for m in self.memberships.values()}
+        self.sites = Site.objects.in_bulk([i for i in site_ids if i is not None])
+        user_ids |= {m.user_id for m in self.memberships.values()}
+        User = get_user_model()
+        self.users = set(User.objects.filter(id__in=[i for i in user_ids if i is not None]).values_list('id', flat=True))
+        self.roles = {}
+        for role in Role.objects.order_by('id'):
+            self.roles.setdefault(role.code, role)
+        # Unique keys include soft-deleted rows: the database constraints do
+        self.org_names, self.org_slugs = {}, set()
+        for site_id, name, slug, pk in Organization.all_objects.filter(site_id__in=self.sites).values_list('site_id', 'name', 'slug', 'id'):
+            self.org_names[(site_id, name)] = pk
+            self.org_slugs.add((site_id, slug))
+        self.mem_keys = {
+            (u, s, o, r): pk
+            for pk, u, s, o, r in Membership.all_objects.filter(user_id__in=self.users, site_id__in=self.sites)
+            .values_list('id', 'user_id', 'site_id', 'organization_id', 'role_id')
+        }
+
+    def check_organization(self, idx: int, op: dict):
+        data = op.get('data') or {}
+        if op['op'] == 'create':
+            site = self.sites.get(_int(data.get('site')))
+            if site is None:
+                return self.error(idx, "site not found")
+            org = Organization(site=site, description=str(data.get('description') or ''))
+        else:
+            org = self.orgs.get(op['id'])
+            if org is None:
+                return self.error(idx, "organization not found")
+            site = self.sites.get(org.site_id)
+        if not self.can_write(site.id):
+            return self.error(idx, "Forbidden")
+        if op['op'] == 'delete':
+            self.results[idx]["id"] = org.id
+            return
+        if 'name' in data or op['op'] == 'create':
+            name = str(data.get('name') or '').strip()
+            if not name or len(name) > 150:
+                return self.error(idx, "name is required (max 150 characters)")
+            owner = self.org_names.get((site.id, name))
+            if owner is not None and owner != org.pk:
+                return self.error(idx, f"Organization '{name}' already exists in this site")
+            if org.pk:
+                self.org_names.pop((site.id, org.name), None)
+            self.org_names[(site.id, name)] = org.pk or -idx - 1
+            org.name = name
+        if 'description' in data:
+            org.description = str(data.get('description') or '')
+        if op['op'] == 'create':
+            base = slugify(data.get('slug') or org.name)[:150] or 'org'
+            slug, n = base, 2
+            while (site.id, slug) in self.org_slugs:
+                slug, n = f"{base}-{n}", n + 1
+            self.org_slugs.add((site.id, slug))
+            org.slug = slug
+        op['_obj'] = org
+
+    def check_membership(self, idx: int, op: dict):
+        data = op.get('data') or {}
+        if op['op'] == 'create':
+            site = self.sites.get(_int(data.get('site')))
+            if site is None:
+                return self.error(idx, "site not found")
+            if _int(data.get('user')) not in self.users:
+                return self.error(idx, "user not found")
+            mem = Membership(site=site, user_id=data['user'])
+        else:
+            mem = self.memberships.get(op['id'])
+            if mem is None:
+                return self.error(idx, "membership not found")
+            site = self.sites.get(mem.site_id)
+        if not self.can_write(site.id):
+            return self.error(idx, "Forbidden")
+        if op['op'] == 'delete':
+            self.results[idx]["id"] = mem.id
+            return
+        old_key = (mem.user_id, mem.site_id, mem.organization_id, mem.role_id) if mem.pk else None
+        if 'role' in data or op['op'] == 'create':
+            role = self.roles.get(str(data.get('role')))
+            if role is None:
+                return self.error(idx, f"Unknown role '{data.get('role')}'")
+            mem.role = role
+        if 'organization' in data:
+            org_id = data.get('organization')
+            if org_id is not None:
+                org = self.orgs.get(_int(org_id))
+                if org is None or org.site_id != site.id:
+                    return self.error(idx, "organization not found in this site")
+            mem.organization_id = org_id
+        if 'active' in data:
+            if not isinstance(data['active'], bool):
+                return self.error(idx, "active must be a boolean")
+            mem.active = data['active']
+        key = (mem.user_id, mem.site_id, mem.organization_id, mem.role_id)
+        if key != old_key:
+            if key in self.mem_keys:
+                return self.error(idx, "An identical membership already exists")
+            self.mem_keys.pop(old_key, None)
+            self.mem_keys[key] = mem.pk or -idx - 1
+        op['_obj'] = mem
+
+    def validate(self) -> bool:
+        self.check_shape()
+        self.prefetch()
+        for idx, op in enumerate(self.ops):
+            if idx in self.errors:
+                continue
+            if op['type'] == 'organization':
+                self.check_organization(idx, op)
+            else:
+                self.check_membership(idx, op)
+        return not self.errors
+
+    # -- apply --------------------------------------------------------------------------------
+    @transaction.atomic
+    def apply(self):
+        now = timezone.now()
+        for model, fields in ((Organization, ['name', 'description', 'updated_at']),
+                              (Membership, ['organization', 'role', 'active', 'updated_at'])):
+            typ = 'organization' if model is Organization else 'membership'
+            ops = [(idx, op) for idx, op in enumerate(self.ops) if op['type'] == typ]
+            created = [(idx, op['_obj']) for idx, op in ops if op['op'] == 'create']
+            updated = [(idx, op['_obj']) for idx, op in ops if op['op'] == 'update']
+            deleted = [op['id'] for idx, op in ops if op['op'] == 'delete']
+            if updated:
+                # Cache namespaces of the owners the updated rows are moving away from
+                bump_queryset(model.all_objects.filter(pk__in=[obj.pk for _, obj in updated]))
+            model.objects.bulk_create([obj for _, obj in created], batch_size=1000)
+            for idx, obj in created + updated:
+                obj.updated_at = now
+                self.results[idx]["id"] = obj.pk
+            model.objects.bulk_update([obj for _, obj in updated], fields, batch_size=1000)
+            bump(*{ns for _, obj in created + updated for ns in namespaces_for(obj)})
+            # SoftDeleteQuerySet.delete() is a single UPDATE of deleted/active/updated_at
+            model.objects.filter(pk__in=deleted).delete()
+
+    def response(self) -> list[dict]:
+        for idx, result in enumerate(self.results):
+            if self.errors.get(idx):
+                result.update(ok=False, errors=self.errors[idx])
+            elif self.errors:
+                # Valid, but nothing was written because another operation failed
+                result.update(ok=False, errors=["batch aborted"])
+            else:
+                result.update(ok=True, op=self.ops[idx]['op'], type=self.ops[idx]['type'])
+        return self.results
+
+
+@require_http_methods(["POST"])
+def batch(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({"error": "Body must be JSON"}, status=400)
+    operations = payload.get('operations') if isinstance(payload, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return JsonResponse({"error": "operations must be a non-empty list"}, status=400)
+    if len(operations) > MAX_OPERATIONS:
+        return JsonResponse({"error": f"At most {MAX_OPERATIONS} operations per batch"}, status=400)
+    work = _Batch(request.user, operations)
+    if not work.validate():
+        return JsonResponse({"ok": False, "results": work.response()}, status=400)
+    work.apply()
+    return JsonResponse({"ok": True, "results": work.response()})
@@ -0,0 +1,129 @@
+"""Incremental change feed: GET /api/v1/changes/?since=<cursor>.
+
+Rows of every feed type are read with `WHERE (updated_at, rank, id) > cursor` on the
+(updated_at, id) indexes and merged, so a sync costs time in proportion to what changed.
+Soft-deleted rows are returned as tombstones (`"deleted": true`, no `data`).
+
+Rows written in the last SETTLE_SECONDS are held back: a transaction that commits late with
+an earlier `updated_at` would otherwise land behind a cursor the client already holds.
+"""
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+
+from apps.app_admin.mod_siteadmin.models import Site, Organization, Membership
+from apps.app_constructs.models import Construct
+from apps.app_organization.mod_organization.models import OrganizationSection
+
+from .pagination import PageError, decode_cursor, encode_cursor, parse_limit
+from .resources import RESOURCES, Scope, _dt
+
+
+SETTLE_SECONDS = 2
+
+
+def _construct_json(c: Construct) -> dict:
+    return {
+        "id": c.id, "organization": c.organization_id, "parent": c.parent_id, "type": c.type_id,
+        "name": c.name, "position": c.position, "done": c.done, "blocked": c.blocked,
+        "approved": c.approved, "completed_at": _dt(c.completed_at), "updated_at": _dt(c.updated_at),
+    }
+
+
+# (type name, model, serializer, scope lookups); the list index is the tie-break rank
+FEEDS = [
+    ('site', Site, RESOURCES['sites'].serialize, RESOURCES['sites'].scope),
+    ('organization', Organization, RESOURCES['organizations'].serialize, RESOURCES['organizations'].scope),
+    ('membership', Membership, RESOURCES['memberships'].serialize, RESOURCES['memberships'].scope),
+    ('section', OrganizationSection, RESOURCES['sections'].serialize, RESOURCES['sections'].scope),
+    ('construct', Construct, _construct_json, ('site_id', 'organization_id')),
+]
+RELATED = {'membership': ('user', 'role')}
+
+
+def _after(rank: int, cursor: tuple | None) -> Q:
+    if cursor is None:
+        return Q()
+    ts, cur_rank, cur_id = cursor
+    if rank < cur_rank:
+        return Q(updated_at__gt=ts)
+    if rank > cur_rank:
+        return Q(updated_at__gte=ts)
+    return Q(updated_at__gt=ts) | Q(updated_at=ts, id__gt=cur_id)
+
+
+def _parse_since(token: str | None) -> tuple | None:
+    if not token:
+        return None
+    ts, rank, pk = decode_cursor(token, 3)
+    try:
+        ts = datetime.fromisoformat(ts)
+    except (TypeError, ValueError):
+        raise PageError("Invalid cursor")
+    if not isinstance(rank, int) or not isinstance(pk, int) or timezone.is_naive(ts):
+        raise PageError("Invalid cursor")
+    return ts, rank, pk
+
+
+def read_changes(user, since: tuple | None, limit: int, types=None, site_ids=None) -> tuple[list[dict], tuple | None, bool]:
+    """Changes after `since` visible to `user`, optionally of some sites: (items, cursor of the last item, has_more)."""
+    scope = Scope.for_user(user)
+    horizon = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+    rows = []
+    for rank, (name, model, serialize, lookups) in enumerate(FEEDS):
+        if types and name not in types:
+            continue
+        qs = model.all_objects.filter(_after(rank, since), updated_at__lte=horizon)
+        scope_q = scope.q(*lookups)
+        if scope_q is not None:
+            qs = qs.filter(scope_q)
+        if site_ids is not None:
+            qs = qs.filter(**{f'{lookups[0]}__in': site_ids})
+        if name in RELATED:
+            qs = qs.select_related(*RELATED[name])
+        for obj in qs.order_by('updated_at', 'id')[:limit + 1]:
+            rows.append((obj.updated_at, rank, obj.id, obj))
+    rows.sort(key=lambda r: r[:3])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = []
+    for updated_at, rank, pk, obj in rows:
+        name, _model, serialize, _lookups = FEEDS[rank]
+        items.append({
+            "type": name,
+            "id": pk,
+            "created": since is None or bool(obj.created_at and obj.created_at > since[0]),
+            "updated_at": _dt(updated_at),
+            "deleted": obj.deleted,
+            "data": None if obj.deleted else serialize(obj),
+        })
+    cursor = rows[-1][:3] if rows else since
+    return items, cursor, has_more
+
+
+@require_http_methods(["GET"])
+def changes(request):
+    """Pass the returned `cursor` as `?since=` to resume; omit it for a full initial sync.
+    `?types=organization,membership` limits the feed to some types.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    types = [t.strip() for t in (request.GET.get('types') or '').split(',') if t.strip()]
+    known = [name for name, *_ in FEEDS]
+    try:
+        unknown = [t for t in types if t not in known]
+        if unknown:
+            raise PageError(f"Unknown type(s): {', '.join(unknown)}")
+        since = _parse_since(request.GET.get('since'))
+        limit = parse_limit(request.GET.get('limit'))
+    except PageError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    items, cursor, has_more = read_changes(request.user, since, limit, types=set(types))
+    return JsonResponse({
+        "changes": items,
+        "cursor": encode_cursor([cursor[0].isoformat(), cursor[1], cursor[2]]) if cursor else None,
+        "has_more": has_more,
+    })
@@ -0,0 +1,90 @@
+"""Keyset pagination and sparse fieldsets for the v1 JSON API.
+
+Pages are selected with `WHERE (key) > (last key seen)` on an indexed ordering instead of
+OFFSET, so page 10 000 costs the same as page 1. The cursor is an opaque, URL-safe token
+holding the ordering values of the last row of the previous page.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PageError(ValueError):
+    """Invalid cursor, limit or field selection (reported as HTTP 400)."""
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise PageError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise PageError("Invalid cursor")
+    return values
+
+
+def _cursor_values(model, keys: tuple[str, ...], values: list) -> list:
+    """Decoded cursor values converted to their key fields' types; anything else is a PageError."""
+    converted = []
+    for key, value in zip(keys, values):
+        if not isinstance(value, (int, str)) or isinstance(value, bool):
+            raise PageError("Invalid cursor")
+        if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+            raise PageError("Invalid cursor")
+        try:
+            converted.append(model._meta.get_field(key).to_python(value))
+        except (ValidationError, ValueError, TypeError):
+            raise PageError("Invalid cursor")
+    return converted
+
+
+def parse_limit(value: str | None) -> int:
+    if not value:
+        return DEFAULT_LIMIT
+    if not value.isdigit() or int(value) < 1:
+        raise PageError("limit must be a positive integer")
+    return min(int(value), MAX_LIMIT)
+
+
+def parse_fields(value: str | None, allowed) -> list[str] | None:
+    """`?fields=id,name` → ['id', 'name']; None means all fields."""
+    if not value:
+        return None
+    fields = [f.strip() for f in value.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise PageError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def _after(keys: tuple[str, ...], values: list) -> Q:
+    """Lexicographic `(k1, k2, ...) > (v1, v2, ...)` as a Q object."""
+    q = Q()
+    for idx in range(len(keys) - 1, -1, -1):
+        step = Q(**{f'{keys[idx]}__gt': values[idx]})
+        q = step if idx == len(keys) - 1 else step | (Q(**{keys[idx]: values[idx]}) & q)
+    return q
+
+
+async def akeyset_page(qs, keys: tuple[str, ...], cursor: str | None, limit: int):
+    """Return (objects, next_cursor) for the page after `cursor`; next_cursor is None on the last page."""
+    if cursor:
+        qs = qs.filter(_after(keys, _cursor_values(qs.model, keys, decode_cursor(cursor, len(keys)))))
+    objs = [obj async for obj in qs.order_by(*keys)[:limit + 1]]
+    if len(objs) <= limit:
+        return objs, None
+    objs = objs[:limit]
+    last = objs[-1]
+    return objs, encode_cursor([getattr(last, key) for key in keys])
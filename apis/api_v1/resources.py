@@ -0,0 +1,255 @@
+"""Read-only list/detail endpoints for sites, organizations, memberships and sections.
+
+Every list is a keyset page (see pagination.py) over a queryset with its relations
+`select_related`, so a page is always two queries: the caller's admin scope and the page.
+Soft-deleted rows are never returned. The views are async and use the async ORM API, so under
+ASGI a slow page does not hold a worker thread.
+"""
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.db.models import Q
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from apps.app_admin.mod_siteadmin.models import Site, Organization, Membership
+from apps.app_organization.mod_organization.models import OrganizationSection
+
+from .pagination import PageError, akeyset_page, parse_fields, parse_limit
+
+
+def _dt(value):
+    return value.isoformat() if value else None
+
+
+@dataclass
+class Scope:
+    """What a user may read: everything (staff) or the sites/organizations they administer."""
+    everything: bool = False
+    site_ids: set = field(default_factory=set)
+    org_ids: set = field(default_factory=set)
+
+    @staticmethod
+    def _admin_rows(user):
+        return Membership.objects.filter(
+            user=user, active=True, role__code__in=('siteadmin', 'orgadmin'),
+        ).values_list('site_id', 'organization_id', 'role__code')
+
+    @classmethod
+    def _from_rows(cls, rows) -> 'Scope':
+        scope = cls()
+        for site_id, org_id, code in rows:
+            if code == 'siteadmin' and org_id is None:
+                scope.site_ids.add(site_id)
+            elif code == 'orgadmin' and org_id is not None:
+                scope.org_ids.add(org_id)
+        return scope
+
+    @classmethod
+    def for_user(cls, user) -> 'Scope':
+        if user.is_staff or user.is_superuser:
+            return cls(everything=True)
+        return cls._from_rows(cls._admin_rows(user))
+
+    @classmethod
+    async def afor_user(cls, user) -> 'Scope':
+        if user.is_staff or user.is_superuser:
+            return cls(everything=True)
+        return cls._from_rows([row async for row in cls._admin_rows(user)])
+
+    def q(self, site_field: str, org_field: str | None) -> Q | None:
+        """Filter limiting a queryset to this scope; None when unrestricted."""
+        if self.everything:
+            return None
+        q = Q(**{f'{site_field}__in': self.site_ids})
+        if org_field:
+            q |= Q(**{f'{org_field}__in': self.org_ids})
+        return q
+
+
+@dataclass
+class Resource:
+    queryset: Callable
+    serialize: Callable
+    fields: tuple[str, ...]
+    # Scope lookups: (site field, organization field)
+    scope: tuple[str, str | None]
+    # Allowed ?order= values and their keyset keys; the first is the default
+    orderings: dict[str, tuple[str, ...]]
+    # ?<param>= → lookup (integer values)
+    filters: dict[str, str] = field(default_factory=dict)
+    # Columns an output field reads when it is not the model field of the same name
+    columns: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+
+def _serializer(getters: dict[str, Callable]) -> Callable:
+    """serialize(obj, fields=None) running only the getters of the requested fields, so the
+    columns left out by `_only` are never loaded.
+    """
+    def serialize(obj, fields=None) -> dict:
+        return {name: getters[name](obj) for name in (fields or getters)}
+    return serialize
+
+
+_site_json = _serializer({
+    "id": lambda s: s.id, "name": lambda s: s.name, "slug": lambda s: s.slug,
+    "description": lambda s: s.description, "active": lambda s: s.active,
+    "created_at": lambda s: _dt(s.created_at), "updated_at": lambda s: _dt(s.updated_at),
+})
+
+_org_json = _serializer({
+    "id": lambda o: o.id, "site": lambda o: o.site_id, "name": lambda o: o.name, "slug": lambda o: o.slug,
+    "description": lambda o: o.description, "active": lambda o: o.active,
+    "delivery_from_constructs": lambda o: o.delivery_from_constructs,
+    "created_at": lambda o: _dt(o.created_at), "updated_at": lambda o: _dt(o.updated_at),
+})
+
+_membership_json = _serializer({
+    "id": lambda m: m.id, "site": lambda m: m.site_id, "organization": lambda m: m.organization_id,
+    "user": lambda m: {"id": m.user_id, "username": m.user.username, "email": m.user.email},
+    "role": lambda m: m.role.code, "active": lambda m: m.active,
+    "created_at": lambda m: _dt(m.created_at), "updated_at": lambda m: _dt(m.updated_at),
+})
+
+_section_json = _serializer({
+    "id": lambda s: s.id, "organization": lambda s: s.organization_id, "tab": lambda s: s.tab,
+    "key": lambda s: s.key, "title": lambda s: s.title, "content": lambda s: s.content,
+    "order": lambda s: s.order, "active": lambda s: s.active, "updated_at": lambda s: _dt(s.updated_at),
+})
+
+
+RESOURCES = {
+    'sites': Resource(
+        queryset=lambda: Site.objects.all(),
+        serialize=_site_json,
+        fields=('id', 'name', 'slug', 'description', 'active', 'created_at', 'updated_at'),
+        scope=('id', None),
+        orderings={'id': ('id',), 'name': ('name', 'id')},
+    ),
+    'organizations': Resource(
+        queryset=lambda: Organization.objects.filter(site__deleted=False),
+        serialize=_org_json,
+        fields=('id', 'site', 'name', 'slug', 'description', 'active', 'delivery_from_constructs', 'created_at', 'updated_at'),
+        scope=('site_id', 'id'),
+        orderings={'id': ('id',), 'name': ('name', 'id')},
+        filters={'site': 'site_id'},
+    ),
+    'memberships': Resource(
+        queryset=lambda: Membership.objects.filter(
+            Q(organization__isnull=True) | Q(organization__deleted=False), site__deleted=False,
+        ).select_related('user', 'role'),
+        serialize=_membership_json,
+        fields=('id', 'site', 'organization', 'user', 'role', 'active', 'created_at', 'updated_at'),
+        scope=('site_id', 'organization_id'),
+        orderings={'id': ('id',)},
+        filters={'site': 'site_id', 'organization': 'organization_id', 'user': 'user_id'},
+        columns={'user': ('user__username', 'user__email'), 'role': ('role__code',)},
+    ),
+    'sections': Resource(
+        queryset=lambda: OrganizationSection.objects.filter(organization__deleted=False, organization__site__deleted=False),
+        serialize=_section_json,
+        fields=('id', 'organization', 'tab', 'key', 'title', 'content', 'order', 'active', 'updated_at'),
+        scope=('organization__site_id', 'organization_id'),
+        orderings={'id': ('id',)},
+        filters={'organization': 'organization_id'},
+    ),
+}
+
+
+async def _scoped(user, resource: Resource):
+    qs = resource.queryset()
+    q = (await Scope.afor_user(user)).q(*resource.scope)
+    return qs if q is None else qs.filter(q)
+
+
+def _only(qs, resource: Resource, fields: list[str] | None, keys: tuple[str, ...] = ()):
+    """Load only the columns of the requested fields (and the keyset keys)."""
+    if fields is None:
+        return qs
+    paths = {*keys, *(path for name in fields for path in resource.columns.get(name, (name,)))}
+    related = {path.split('__')[0] for path in paths if '__' in path}
+    return qs.select_related(None).select_related(*related).only(*paths)
+
+
+async def resource_list(request, name: str):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    resource = RESOURCES[name]
+    try:
+        fields = parse_fields(request.GET.get('fields'), resource.fields)
+        limit = parse_limit(request.GET.get('limit'))
+        order = request.GET.get('order') or next(iter(resource.orderings))
+        if order not in resource.orderings:
+            raise PageError(f"order must be one of: {', '.join(resource.orderings)}")
+        qs = await _scoped(user, resource)
+        for param, lookup in resource.filters.items():
+            value = request.GET.get(param)
+            if value:
+                if not value.isdigit():
+                    raise PageError(f"{param} must be an integer id")
+                qs = qs.filter(**{lookup: int(value)})
+        keys = resource.orderings[order]
+        objs, next_cursor = await akeyset_page(_only(qs, resource, fields, keys), keys, request.GET.get('cursor'), limit)
+    except PageError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    return JsonResponse({
+        "results": [resource.serialize(obj, fields) for obj in objs],
+        "next_cursor": next_cursor,
+    })
+
+
+async def resource_detail(request, name: str, pk: int):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    resource = RESOURCES[name]
+    try:
+        fields = parse_fields(request.GET.get('fields'), resource.fields)
+    except PageError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+    # Out-of-scope rows are reported as missing rather than forbidden
+    obj = await _only(await _scoped(user, resource), resource, fields).filter(pk=pk).afirst()
+    if obj is None:
+        return JsonResponse({"error": "Not found"}, status=404)
+    return JsonResponse(resource.serialize(obj, fields))
+
+
+@require_http_methods(["GET"])
+async def site_list(request):
+    return await resource_list(request, 'sites')
+
+
+@require_http_methods(["GET"])
+async def site_detail(request, pk: int):
+    return await resource_detail(request, 'sites', pk)
+
+
+@require_http_methods(["GET"])
+async def organization_list(request):
+    return await resource_list(request, 'organizations')
+
+
+@require_http_methods(["GET"])
+async def organization_detail(request, pk: int):
+    return await resource_detail(request, 'organizations', pk)
+
+
+@require_http_methods(["GET"])
+async def membership_list(request):
+    return await resource_list(request, 'memberships')
+
+
+@require_http_methods(["GET"])
+async def membership_detail(request, pk: int):
+    return await resource_detail(request, 'memberships', pk)
+
+
+@require_http_methods(["GET"])
+async def section_list(request):
+    return await resource_list(request, 'sections')
+
+
+@require_http_methods(["GET"])
+async def section_detail(request, pk: int):
+    return await resource_detail(request, 'sections', pk)
@@ -1,8 +1,33 @@
 from django.urls import path
-from .views import ping, info
+from .views import ping, info, construct_tree, construct_import, construct_metrics
+from .batch import batch
+from .changes import changes
+from .resources import (
+    site_list,
+    site_detail,
+    organization_list,
+    organization_detail,
+    membership_list,
+    membership_detail,
+    section_list,
+    section_detail,
+)
 
 
 urlpatterns = [
     path('ping/', ping, name='api_ping'),
     path('info/', info, name='api_info'),
+    path('batch/', batch, name='api_batch'),
+    path('changes/', changes, name='api_changes'),
+    path('sites/', site_list, name='api_site_list'),
+    path('sites/<int:pk>/', site_detail, name='api_site_detail'),
+    path('orgs/', organization_list, name='api_org_list'),
+    path('orgs/<int:pk>/', organization_detail, name='api_org_detail'),
+    path('memberships/', membership_list, name='api_membership_list'),
+    path('memberships/<int:pk>/', membership_detail, name='api_membership_detail'),
+    path('sections/', section_list, name='api_section_list'),
+    path('sections/<int:pk>/', section_detail, name='api_section_detail'),
+    path('orgs/<int:org_id>/constructs/tree/', construct_tree, name='api_construct_tree'),
+    path('orgs/<int:org_id>/constructs/import/', construct_import, name='api_construct_import'),
+    path('orgs/<int:org_id>/constructs/metrics/', construct_metrics, name='api_construct_metrics'),
 ]
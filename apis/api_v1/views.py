@@ -1,12 +1,115 @@
 from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_http_methods
 
+from apps.app_admin.mod_siteadmin.models import Organization
+from apps.app_constructs.flow_metrics import flow_metrics
+from apps.app_constructs.importer import ConstructImportError, import_constructs, parse_rows
+from apps.app_constructs.models import Construct, ConstructType
+from apps.app_constructs.synonyms import resolve_construct_type
+from apps.app_admin.mod_siteadmin.permissions import is_org_admin, is_site_admin
 
-def ping(_request):
+
+async def ping(_request):
     return JsonResponse({"status": "ok"})
 
 
-def info(_request):
+async def info(_request):
     return JsonResponse({
         "name": "JIVAPMS API",
         "version": "v1",
     })
+
+
+def _can_access_org(user, org: Organization) -> bool:
+    """Site admins and the organization's admins; the construct endpoints read and write alike."""
+    return is_site_admin(user, org.site) or is_org_admin(user, org.site, org)
+
+
+def _construct_json(c: Construct, type_codes: dict[int, str]) -> dict:
+    rollup = getattr(c, 'rollup', None)
+    return {
+        "id": c.id,
+        "parent": c.parent_id,
+        "name": c.name,
+        "type": type_codes.get(c.type_id),
+        "position": c.position,
+        "done": c.done,
+        "blocked": c.blocked,
+        "approved": c.approved,
+        "completed_at": c.completed_at.isoformat() if c.completed_at else None,
+        "rollup": {
+            "descendants": rollup.descendant_count,
+            "by_type": {type_codes.get(int(k), k): v for k, v in (rollup.type_counts or {}).items()},
+            "done": rollup.done_count,
+            "blocked": rollup.blocked_count,
+            "approved": rollup.approved_count,
+            "latest_completed_at": rollup.latest_completed_at.isoformat() if rollup.latest_completed_at else None,
+        } if rollup else None,
+    }
+
+
+@require_http_methods(["GET"])
+def construct_tree(request, org_id: int):
+    """Flat construct tree of an organization (clients nest by `parent`).
+    `?type=` accepts a type name, code or synonym, e.g. `?type=ART`.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    org = get_object_or_404(Organization.objects.select_related('site'), pk=org_id)
+    if not _can_access_org(request.user, org):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+    qs = Construct.objects.for_organization(org).select_related('rollup').order_by('parent_id', 'position', 'id')
+    type_name = request.GET.get('type')
+    ctype = None
+    if type_name:
+        ctype = resolve_construct_type(type_name)
+        if ctype is None:
+            return JsonResponse({"error": f"Unknown construct type '{type_name}'"}, status=400)
+        qs = qs.filter(type=ctype)
+    type_codes = dict(ConstructType.all_objects.values_list('id', 'code'))
+    return JsonResponse({
+        "organization": org.id,
+        "type": ctype.code if ctype else None,
+        "nodes": [_construct_json(c, type_codes) for c in qs],
+    })
+
+
+@require_http_methods(["POST"])
+def construct_import(request, org_id: int):
+    """Bulk-create constructs from CSV or NDJSON rows (request body or a `file` upload).
+    Format comes from `?format=` or the content type; all rows are rejected if any is invalid.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    org = get_object_or_404(Organization.objects.select_related('site'), pk=org_id)
+    if not _can_access_org(request.user, org):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+    upload = request.FILES.get('file')
+    raw = upload.read() if upload else request.body
+    fmt = request.GET.get('format')
+    if fmt not in {'csv', 'ndjson'}:
+        name = (upload.name if upload else '').lower()
+        is_ndjson = 'ndjson' in (request.content_type or '') or name.endswith(('.ndjson', '.jsonl'))
+        fmt = 'ndjson' if is_ndjson else 'csv'
+    try:
+        rows = parse_rows(raw.decode('utf-8', errors='replace'), fmt)
+        result = import_constructs(org, rows)
+    except ConstructImportError as exc:
+        return JsonResponse({"ok": False, "errors": exc.errors}, status=400)
+    return JsonResponse({"ok": True, **result})
+
+
+@require_http_methods(["GET"])
+def construct_metrics(request, org_id: int):
+    """Flow metrics of an organization, or of the subtree under `?root=<construct id>`."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"error": "Authentication required"}, status=401)
+    org = get_object_or_404(Organization.objects.select_related('site'), pk=org_id)
+    if not _can_access_org(request.user, org):
+        return JsonResponse({"error": "Forbidden"}, status=403)
+    root = request.GET.get('root')
+    data = flow_metrics(org, root_id=int(root) if root and root.isdigit() else None)
+    if data is None:
+        return JsonResponse({"error": "Flow metrics need NumPy installed"}, status=501)
+    return JsonResponse({"organization": org.id, "root": int(root) if root and root.isdigit() else None, **data})
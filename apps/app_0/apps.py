@@ -1,6 +1,8 @@
-import os
 from django.apps import AppConfig
+from django.conf import settings
 from django.contrib import admin
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class App0Config(AppConfig):
@@ -9,6 +11,20 @@ class App0Config(AppConfig):
     verbose_name = 'Common'
 
     def ready(self):
-        admin.site.site_header = os.environ.get('SITE_HEADER', 'JIVAPMS Admin')
-        admin.site.site_title = os.environ.get('SITE_NAME', 'JIVAPMS')
-        admin.site.index_title = os.environ.get('SITE_TAGLINE', 'Product and Project Management System')
+        admin.site.site_header = settings.SITE_HEADER
+        admin.site.site_title = settings.SITE_NAME
+        admin.site.index_title = settings.SITE_TAGLINE
+
+        from .mod_0 import authcache, gencache
+        from .mod_0.sqlite import apply_pragmas
+        connection_created.connect(apply_pragmas, dispatch_uid='app_0_sqlite_pragmas')
+        gencache.connect()
+        authcache.connect()
+        post_migrate.connect(_migrated, dispatch_uid='app_0_health_migrations')
+
+
+def _migrated(**kwargs):
+    # The cached readiness status predates these migrations; health is imported lazily to keep
+    # the migration loader out of startup
+    from .mod_0 import health
+    health.invalidate()
@@ -0,0 +1,136 @@
+import asyncio
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+
+DEFAULT_URLS = ['/health/', '/api/v1/sites/', '/api/v1/orgs/?limit=50', '/api/v1/memberships/?limit=50']
+
+
+def _summary(mode: str, latencies: list[float], elapsed: float, errors: int) -> dict:
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000 if latencies else 0.0
+    return {
+        'mode': mode,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': pick(0.50),
+        'p95_ms': pick(0.95),
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    help = ("Compare sync WSGI and async ASGI throughput in-process: N concurrent clients replay the "
+            "same URLs against the configured database through each Django handler")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=2000, help='Total requests per mode')
+        parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads (as a threaded WSGI server)')
+        parser.add_argument('--url', action='append', dest='urls', help='URL to request (repeatable)')
+        parser.add_argument('--user', default='bench', help='Staff user to authenticate as (created if missing)')
+
+    def handle(self, *args, **options):
+        urls = options['urls'] or DEFAULT_URLS
+        User = get_user_model()
+        user, created = User.objects.get_or_create(username=options['user'], defaults={'is_staff': True})
+        if created:
+            user.set_unusable_password()
+            user.save()
+        client = Client()
+        client.force_login(user)
+        cookie = f"sessionid={client.cookies['sessionid'].value}"
+        plan = [urls[i % len(urls)] for i in range(options['requests'])]
+
+        results = [
+            self.run_wsgi(plan, cookie, options['clients'], options['threads']),
+            asyncio.run(self.run_asgi(plan, cookie, options['clients'])),
+        ]
+        self.stdout.write(f"{len(plan)} requests, {options['clients']} concurrent clients, URLs: {', '.join(urls)}")
+        self.stdout.write(f"{'mode':<6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9} {'errors':>7}")
+        for r in results:
+            self.stdout.write(
+                f"{r['mode']:<6} {r['rps']:>9.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['mean_ms']:>9.1f} {r['errors']:>7}"
+            )
+
+    # Both modes issue the plan in waves of `clients` simultaneous requests. Latency is measured
+    # from the moment a wave is issued, so time spent queued for a worker counts, as it would
+    # behind a real server.
+    def run_wsgi(self, plan: list[str], cookie: str, clients: int, threads: int) -> dict:
+        handler = WSGIHandler()
+        latencies, errors = [], 0
+
+        def call(url: str):
+            parts = urlsplit(url)
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': parts.path, 'QUERY_STRING': parts.query,
+                'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+                'HTTP_COOKIE': cookie, 'wsgi.input': io.BytesIO(b''), 'wsgi.url_scheme': 'http',
+                'wsgi.errors': io.StringIO(),
+            }
+            status = []
+            body = handler(environ, lambda s, h, exc_info=None: status.append(s))
+            try:
+                for _ in body:
+                    pass
+            finally:
+                body.close()
+            return status[0], time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            start = time.perf_counter()
+            # Each wave is `clients` requests issued at once
+            for offset in range(0, len(plan), clients):
+                issued = time.perf_counter()
+                for status, done in pool.map(call, plan[offset:offset + clients]):
+                    latencies.append(done - issued)
+                    errors += not status.startswith('200')
+            elapsed = time.perf_counter() - start
+        return _summary('wsgi', latencies, elapsed, errors)
+
+    async def run_asgi(self, plan: list[str], cookie: str, clients: int) -> dict:
+        handler = ASGIHandler()
+        latencies, errors = [], 0
+
+        async def call(url: str, issued: float):
+            nonlocal errors
+            parts = urlsplit(url)
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': parts.path, 'raw_path': parts.path.encode(), 'root_path': '',
+                'query_string': parts.query.encode(), 'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+                'headers': [(b'host', b'localhost'), (b'cookie', cookie.encode())],
+            }
+            sent_request = False
+            status = []
+
+            async def receive():
+                nonlocal sent_request
+                if not sent_request:
+                    sent_request = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            await handler(scope, receive, send)
+            latencies.append(time.perf_counter() - issued)
+            errors += status[:1] != [200]
+
+        start = time.perf_counter()
+        for offset in range(0, len(plan), clients):
+            issued = time.perf_counter()
+            await asyncio.gather(*(call(url, issued) for url in plan[offset:offset + clients]))
+        return _summary('asgi', latencies, time.perf_counter() - start, errors)
@@ -0,0 +1,96 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from contextlib import closing
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+PROFILES = ('development', 'production')
+
+
+def journal_mode(db_path: str, mode: str | None = None) -> str:
+    """Current journal mode of the database file, after switching it to `mode` if given."""
+    with closing(sqlite3.connect(db_path)) as raw:
+        return raw.execute(f'PRAGMA journal_mode = {mode}' if mode else 'PRAGMA journal_mode').fetchone()[0]
+
+
+class Command(BaseCommand):
+    help = ("Run the loadtest mix once per DB_PROFILE (development, then production) against the "
+            "configured SQLite database and compare throughput, p95 latency and lock waits. "
+            "Seed data first with generate_load_data; the runs add rows to the database. The "
+            "database is left in the journal mode it started in.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--mode', choices=('threads', 'processes', 'asgi'), default='processes')
+        parser.add_argument('--duration', type=float, default=20.0, help='Seconds per profile')
+        parser.add_argument('--mix', default=None, help='Scenario weights passed to loadtest')
+        parser.add_argument('--output', default=None, help='Write both loadtest reports to this JSON file')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('bench_db_profile compares SQLite profiles; the default database is not SQLite')
+        db_path = str(connection.settings_dict['NAME'])
+        connection.close()
+        # journal_mode=wal is stored in the file: reset it for the development run, restore it after
+        original_mode = journal_mode(db_path)
+        try:
+            reports = self.run_profiles(db_path, options)
+        finally:
+            journal_mode(db_path, original_mode)
+
+        self.report(reports)
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(reports, indent=2) + '\n')
+
+    def run_profiles(self, db_path: str, options) -> dict:
+        reports = {}
+        with tempfile.TemporaryDirectory(prefix='bench_db_profile_') as tmp:
+            for profile in PROFILES:
+                if profile == 'development':
+                    journal_mode(db_path, 'delete')
+                out = Path(tmp) / f'{profile}.json'
+                cmd = [sys.executable, str(Path(settings.BASE_DIR) / 'manage.py'), 'loadtest',
+                       '--workers', str(options['workers']), '--mode', options['mode'],
+                       '--duration', str(options['duration']), '--json', str(out)]
+                if options['mix']:
+                    cmd += ['--mix', options['mix']]
+                self.stdout.write(f"== {profile}")
+                result = subprocess.run(cmd, env={**os.environ, 'DB_PROFILE': profile},
+                                        capture_output=True, text=True)
+                self.stdout.write(result.stdout)
+                if result.returncode:
+                    raise CommandError(f"loadtest failed under {profile}:\n{result.stderr}")
+                reports[profile] = json.loads(out.read_text())
+        return reports
+
+    def report(self, reports: dict):
+        dev, prod = (reports[p] for p in PROFILES)
+        dev_urls = {r['name']: r for r in dev['urls']}
+        prod_urls = {r['name']: r for r in prod['urls']}
+        self.stdout.write(f"{'':<40} {'development':>14} {'production':>14} {'change':>9}")
+        self.line('req/s', dev['rps'], prod['rps'], higher_is_better=True)
+        for name in sorted(dev_urls.keys() & prod_urls.keys()):
+            self.line(f'{name} p95 ms', dev_urls[name]['p95_ms'], prod_urls[name]['p95_ms'])
+        self.stdout.write(
+            f"{'sqlite locked errors':<40} {dev['sqlite']['errors']:>14} {prod['sqlite']['errors']:>14}"
+        )
+        self.stdout.write(
+            f"{'sqlite lock waits':<40} {dev['sqlite']['waits']:>14} {prod['sqlite']['waits']:>14}"
+        )
+        errors = [sum(r['errors'] for r in rep['urls']) for rep in (dev, prod)]
+        self.stdout.write(f"{'http errors':<40} {errors[0]:>14} {errors[1]:>14}")
+
+    def line(self, label: str, before: float, after: float, higher_is_better: bool = False):
+        change = (after / before - 1) * 100 if before else 0.0
+        better = change > 0 if higher_is_better else change < 0
+        text = f"{change:+8.0f}%"
+        self.stdout.write(f"{label:<40} {before:>14.1f} {after:>14.1f} "
+                          f"{(self.style.SUCCESS if better else self.style.WARNING)(text)}")
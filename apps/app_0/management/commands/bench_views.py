@@ -0,0 +1,222 @@
+import json
+import platform
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from apps.app_0.mod_0.querycheck import QueryRecorder
+
+from apps.app_admin.mod_siteadmin.models import Site
+from apps.app_organization.mod_organization.models import OrganizationSection
+
+
+# Dataset label → generate_load_data preset
+SIZES = {'100': 'small', '10k': 'medium', '1m': 'large'}
+PREFIX = 'bench'
+# A case regresses when it runs more queries than the baseline, or when time or peak memory
+# grow by more than --tolerance and by at least these absolute amounts (noise floor)
+MIN_MS_DELTA = 5.0
+MIN_KIB_DELTA = 256.0
+
+
+def _default_baseline() -> Path:
+    return Path(settings.BASE_DIR) / 'benchmarks' / 'bench_views_baseline.json'
+
+
+class Target:
+    """The objects a case acts on, picked from the generated dataset."""
+
+    def __init__(self, tmp: Path):
+        self.site = Site.objects.filter(slug__startswith=f'{PREFIX}-').order_by('id').first()
+        self.org = self.site.organizations.order_by('id').first()
+        self.sections = list(OrganizationSection.objects.filter(organization=self.org, tab='business', active=True))
+        self.bootstrap_file = tmp / 'bootstrap.json'
+        self.bootstrap_file.write_text(json.dumps({
+            'site': {'slug': 'bench-bootstrap', 'name': 'Bench bootstrap'},
+            'organizations': [{'slug': f'org-{n}', 'name': f'Org {n}'} for n in range(10)],
+            'memberships': [
+                {'username': f'bench_boot_{n}', 'email': f'bench_boot_{n}@example.com',
+                 'role': 'orgadmin' if n % 10 == 0 else 'member', 'organization': f'org-{n % 10}'}
+                for n in range(50)
+            ],
+        }))
+
+    def url(self, name: str, *keys: str) -> str:
+        ids = {'site_id': self.site.pk, 'org_id': self.org.pk}
+        return reverse(name, kwargs={k: ids[k] for k in keys})
+
+
+def _get(name, *keys, query=''):
+    def run(client, target):
+        return client.get(target.url(name, *keys) + query)
+    return run
+
+
+def _tab_edit_post(client, target):
+    data = {'tab': 'business'}
+    for sec in target.sections:
+        data[f'sec_{sec.pk}-content'] = sec.content
+    return client.post(target.url('siteadmin_org_tab_edit_modal', 'site_id', 'org_id'), data)
+
+
+def _user_bulk_post(client, target):
+    csv_text = '\n'.join(f'bench_bulk_{n},bench_bulk_{n}@example.com,Bench,User{n},Bulk#{n}pass' for n in range(5))
+    return client.post(reverse('useradmin_bulk'), {'csv_text': csv_text})
+
+
+def _bootstrap_site(client, target):
+    call_command('bootstrap_site', str(target.bootstrap_file), create_users=True, stdout=StringIO())
+
+
+CASES = [
+    ('dashboard', _get('siteadmin_dashboard')),
+    ('site_detail', _get('siteadmin_detail', 'site_id')),
+    ('organization_home', _get('siteadmin_org_home', 'site_id', 'org_id')),
+    ('organization_tab_edit_modal GET', _get('siteadmin_org_tab_edit_modal', 'site_id', 'org_id', query='?tab=business')),
+    ('organization_tab_edit_modal POST', _tab_edit_post),
+    ('user_list', _get('useradmin_list')),
+    ('user_bulk POST', _user_bulk_post),
+    ('bootstrap_site', _bootstrap_site),
+]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of `results` against `baseline` (both {size: {case: metrics}})."""
+    problems = []
+    for size, cases in results.items():
+        for case, now in cases.items():
+            before = baseline.get(size, {}).get(case)
+            if not before:
+                continue
+            if now['queries'] > before['queries']:
+                problems.append(f"[{size}] {case}: {now['queries']} queries (baseline {before['queries']})")
+            for key, floor, unit in (('ms', MIN_MS_DELTA, 'ms'), ('peak_kib', MIN_KIB_DELTA, 'KiB')):
+                if now[key] > before[key] * (1 + tolerance) and now[key] - before[key] >= floor:
+                    problems.append(f"[{size}] {case}: {now[key]:.1f} {unit} (baseline {before[key]:.1f})")
+    return problems
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the siteadmin, orgadmin and useradmin hot paths on generated datasets of several "
+            "sizes (wall time, query count, peak Python memory) and compare with a stored baseline")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES), help='Dataset sizes (rows)')
+        parser.add_argument('--case', action='append', dest='cases', help='Only run cases starting with this name (repeatable)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case (after one warm-up run)')
+        parser.add_argument('--output', default='bench_views.json', help='Results file')
+        parser.add_argument('--baseline', default=None, help='Baseline file (default: benchmarks/bench_views_baseline.json)')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown / memory growth')
+        parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit non-zero when a case regressed')
+
+    def handle(self, *args, **options):
+        cases = [c for c in CASES if not options['cases'] or any(c[0].startswith(p) for p in options['cases'])]
+        if not cases:
+            raise CommandError('No case matches --case')
+        baseline_path = Path(options['baseline'] or _default_baseline())
+
+        results = {}
+        setup_test_environment()
+        try:
+            for size in options['sizes']:
+                results[size] = self.run_size(size, cases, options['repeat'])
+        finally:
+            teardown_test_environment()
+
+        payload = {
+            'meta': {
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'repeat': options['repeat'],
+            },
+            'results': results,
+        }
+        Path(options['output']).write_text(json.dumps(payload, indent=2) + '\n')
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if options['update_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(payload, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Baseline updated: {baseline_path}"))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; run with --update-baseline to create one.")
+            return
+        problems = compare(results, json.loads(baseline_path.read_text())['results'], options['tolerance'])
+        for message in problems:
+            self.stdout.write(self.style.WARNING(f"REGRESSION {message}"))
+        if not problems:
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}."))
+        elif options['fail_on_regression']:
+            raise CommandError(f"{len(problems)} regression(s) against {baseline_path}")
+
+    def run_size(self, size: str, cases, repeat: int) -> dict:
+        """Seed a fresh file-backed test database with the preset for `size` and run every case on it."""
+        with tempfile.TemporaryDirectory(prefix='bench_views_') as tmp:
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = str(Path(tmp) / 'bench.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                started = time.perf_counter()
+                call_command('generate_load_data', size=SIZES[size], prefix=PREFIX, stdout=StringIO())
+                self.stdout.write(f"[{size}] dataset seeded in {time.perf_counter() - started:.1f}s")
+                user = get_user_model().objects.create_superuser('bench-admin', 'bench-admin@example.com', 'bench')
+                client = Client()
+                client.force_login(user)
+                target = Target(Path(tmp))
+
+                self.stdout.write(f"{'case':<36} {'ms':>9} {'min ms':>9} {'queries':>8} {'peak KiB':>10}")
+                out = {}
+                for name, run in cases:
+                    out[name] = metrics = self.measure(run, client, target, repeat)
+                    self.stdout.write(
+                        f"{name:<36} {metrics['ms']:>9.1f} {metrics['ms_min']:>9.1f} "
+                        f"{metrics['queries']:>8} {metrics['peak_kib']:>10.1f}"
+                    )
+                return out
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def measure(self, run, client, target, repeat: int) -> dict:
+        response = run(client, target)
+        status = getattr(response, 'status_code', 200)
+        if status >= 400:
+            raise CommandError(f"Benchmark request failed with status {status}")
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run(client, target)
+            timings.append((time.perf_counter() - started) * 1000)
+        # Counted with an execute wrapper: connection.queries is reset at every request start
+        recorder = QueryRecorder(capture_stack=False)
+        with connection.execute_wrapper(recorder):
+            run(client, target)
+        # Separate run: tracemalloc slows allocation-heavy code down too much to time it
+        tracemalloc.start()
+        try:
+            run(client, target)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            'ms': round(statistics.median(timings), 2),
+            'ms_min': round(min(timings), 2),
+            'queries': recorder.total,
+            'peak_kib': round(peak / 1024, 1),
+        }
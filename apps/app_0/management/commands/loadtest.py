@@ -0,0 +1,406 @@
+import asyncio
+import io
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+from apps.app_admin.mod_siteadmin.models import Membership, Organization, Role
+from apps.app_organization.mod_organization.models import OrganizationSection
+
+
+DEFAULT_MIX = 'browse=70,tab_edit=15,membership=10,login=5'
+SAMPLE_ORGS = 200
+SAMPLE_USERS = 5000
+_WRITES = ('INSERT', 'UPDATE', 'DELETE', 'BEGIN')
+
+
+@dataclass
+class Step:
+    name: str
+    method: str
+    path: str
+    data: dict | None = None
+    anonymous: bool = False
+
+
+@dataclass
+class Context:
+    """Everything the scenarios need, loaded once before the workers start."""
+    session: str
+    csrf: str
+    orgs: list[tuple[int, int]]
+    sections: dict[int, list[tuple[int, str]]]
+    users: list[int]
+    existing: set[tuple[int, int]]
+    member_role: int | None
+    logins: list[str]
+    password: str
+
+
+@dataclass
+class Samples:
+    latencies: dict = field(default_factory=lambda: defaultdict(list))
+    errors: dict = field(default_factory=lambda: defaultdict(int))
+    elapsed: float = 0.0
+
+    def merge(self, other: 'Samples'):
+        for name, values in other.latencies.items():
+            self.latencies[name].extend(values)
+        for name, count in other.errors.items():
+            self.errors[name] += count
+
+
+# -- lock-wait accounting -------------------------------------------------------------------------
+class LockStats:
+    """Execute wrapper on every connection: counts 'database is locked' errors and writes that
+    took longer than `threshold` seconds (time spent in SQLite's busy handler).
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.errors = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as exc:
+            if 'locked' in str(exc):
+                with self.lock:
+                    self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if elapsed >= self.threshold and sql.lstrip()[:6].upper().startswith(_WRITES):
+                with self.lock:
+                    self.waits += 1
+                    self.wait_seconds += elapsed
+
+    def install(self):
+        def attach(sender, connection, **kwargs):
+            if self not in connection.execute_wrappers:
+                connection.execute_wrappers.append(self)
+        connection_created.connect(attach, weak=False, dispatch_uid='loadtest_lock_stats')
+        for conn in connections.all(initialized_only=True):
+            attach(None, conn)
+
+    def snapshot(self) -> dict:
+        return {'errors': self.errors, 'waits': self.waits, 'wait_seconds': self.wait_seconds}
+
+
+# -- scenarios --------------------------------------------------------------------------------------
+def browse(ctx: Context, rng: random.Random, worker: int, workers: int) -> list[Step]:
+    site_id, org_id = rng.choice(ctx.orgs)
+    org = {'site_id': site_id, 'org_id': org_id}
+    return [
+        Step('siteadmin_dashboard', 'GET', reverse('siteadmin_dashboard')),
+        Step('siteadmin_detail', 'GET', reverse('siteadmin_detail', kwargs={'site_id': site_id})),
+        Step('siteadmin_org_home', 'GET', reverse('siteadmin_org_home', kwargs=org)),
+        Step('siteadmin_org_home', 'GET', reverse('siteadmin_org_home', kwargs=org) + '?tab=business'),
+    ]
+
+
+def tab_edit(ctx: Context, rng: random.Random, worker: int, workers: int) -> list[Step]:
+    site_id, org_id = rng.choice(ctx.orgs)
+    path = reverse('siteadmin_org_tab_edit_modal', kwargs={'site_id': site_id, 'org_id': org_id})
+    steps = [Step('siteadmin_org_tab_edit_modal', 'GET', path + '?tab=business')]
+    sections = ctx.sections.get(org_id)
+    if sections:
+        # Every section is posted (a missing one would be blanked); one of them changes
+        data = {'tab': 'business', **{f'sec_{pk}-content': content for pk, content in sections}}
+        data[f'sec_{rng.choice(sections)[0]}-content'] = f'Edited by load test {rng.random():.6f}'
+        steps.append(Step('siteadmin_org_tab_edit_modal', 'POST', path, data))
+    return steps
+
+
+def membership(ctx: Context, rng: random.Random, worker: int, workers: int) -> list[Step]:
+    site_id, org_id = rng.choice(ctx.orgs)
+    path = reverse('siteadmin_membership_new_modal', kwargs={'site_id': site_id}) + f'?org_id={org_id}'
+    steps = [Step('siteadmin_membership_new_modal', 'GET', path)]
+    # Workers draw from disjoint slices of the user sample so they never create the same row
+    mine = ctx.users[worker::workers]
+    for _ in range(10):
+        user_id = rng.choice(mine) if mine else None
+        if user_id is not None and (user_id, org_id) not in ctx.existing:
+            ctx.existing.add((user_id, org_id))
+            data = {'user': user_id, 'role': ctx.member_role, 'organization': org_id}
+            steps.append(Step('siteadmin_membership_new_modal', 'POST', path, data))
+            break
+    return steps
+
+
+def login(ctx: Context, rng: random.Random, worker: int, workers: int) -> list[Step]:
+    path = reverse('login')
+    steps = [Step('login', 'GET', path, anonymous=True)]
+    if ctx.logins:
+        data = {'username': rng.choice(ctx.logins), 'password': ctx.password}
+        steps.append(Step('login', 'POST', path, data, anonymous=True))
+    return steps
+
+
+SCENARIOS = {'browse': browse, 'tab_edit': tab_edit, 'membership': membership, 'login': login}
+
+
+def parse_mix(raw: str) -> dict[str, int]:
+    mix = {}
+    for part in raw.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS or not weight.strip().isdigit():
+            raise CommandError(f"Invalid --mix entry '{part}' (scenarios: {', '.join(SCENARIOS)})")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise CommandError('--mix needs a positive weight')
+    return mix
+
+
+# -- transports -------------------------------------------------------------------------------------
+def _request_parts(ctx: Context, step: Step) -> tuple[str, str, bytes, str]:
+    path, _, query = step.path.partition('?')
+    body = urlencode(step.data, doseq=True).encode() if step.data is not None else b''
+    cookie = f'csrftoken={ctx.csrf}' + ('' if step.anonymous else f'; sessionid={ctx.session}')
+    return path, query, body, cookie
+
+
+def wsgi_call(handler: WSGIHandler, ctx: Context, step: Step) -> int:
+    path, query, body, cookie = _request_parts(ctx, step)
+    environ = {
+        'REQUEST_METHOD': step.method, 'PATH_INFO': path, 'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+        'HTTP_COOKIE': cookie, 'HTTP_X_CSRFTOKEN': ctx.csrf,
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded', 'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body), 'wsgi.url_scheme': 'http', 'wsgi.errors': io.StringIO(),
+    }
+    status = []
+    result = handler(environ, lambda s, h, exc_info=None: status.append(s))
+    try:
+        for _ in result:
+            pass
+    finally:
+        result.close()
+    return int(status[0].split(' ', 1)[0])
+
+
+async def asgi_call(handler: ASGIHandler, ctx: Context, step: Step) -> int:
+    path, query, body, cookie = _request_parts(ctx, step)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': step.method,
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': query.encode(), 'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+        'headers': [
+            (b'host', b'localhost'), (b'cookie', cookie.encode()), (b'x-csrftoken', ctx.csrf.encode()),
+            (b'content-type', b'application/x-www-form-urlencoded'), (b'content-length', str(len(body)).encode()),
+        ],
+    }
+    sent = False
+    status = []
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await handler(scope, receive, send)
+    return status[0] if status else 599
+
+
+def _record(samples: Samples, step: Step, status: int, seconds: float):
+    samples.latencies[step.name].append(seconds)
+    if status >= 400:
+        samples.errors[step.name] += 1
+
+
+def run_worker(call, ctx: Context, mix: dict, worker: int, workers: int, deadline: float, seed: int) -> Samples:
+    rng = random.Random(seed * 1000 + worker)
+    names, weights = list(mix), list(mix.values())
+    samples = Samples()
+    while time.monotonic() < deadline:
+        for step in SCENARIOS[rng.choices(names, weights)[0]](ctx, rng, worker, workers):
+            started = time.perf_counter()
+            status = call(ctx, step)
+            _record(samples, step, status, time.perf_counter() - started)
+    return samples
+
+
+def _process_worker(ctx, mix, worker, workers, deadline_in, seed, threshold):
+    """Entry point of one forked worker process: its own handler, connection and lock counters."""
+    stats = LockStats(threshold)
+    stats.install()
+    handler = WSGIHandler()
+    samples = run_worker(lambda c, s: wsgi_call(handler, c, s), ctx, mix, worker, workers,
+                         time.monotonic() + deadline_in, seed)
+    connections.close_all()
+    return samples, stats.snapshot()
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return values[min(int(q * len(values)), len(values) - 1)] * 1000 if values else 0.0
+
+
+class Command(BaseCommand):
+    help = ("Run a scripted mix of admin traffic (browsing, tab edits, membership creates, logins) from N "
+            "threads, processes or ASGI tasks against the in-process Django handler and the configured "
+            "database; report throughput, p50/p95/p99 latency per URL name and SQLite lock waits. "
+            "Seed data first with generate_load_data.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent workers')
+        parser.add_argument('--mode', choices=('threads', 'processes', 'asgi'), default='threads',
+                            help='WSGI from a thread pool, WSGI from forked processes, or ASGI tasks on one event loop')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Scenario weights (default {DEFAULT_MIX})')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--user', default='loadtest', help='Staff user the admin scenarios run as (created if missing)')
+        parser.add_argument('--login-prefix', default='load', help='Username prefix (and password) of generated login users')
+        parser.add_argument('--lock-threshold-ms', type=float, default=50.0,
+                            help='Writes slower than this count as lock waits')
+        parser.add_argument('--json', dest='json_path', help='Also write the report as JSON to this file')
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options['mix'])
+        ctx = self.build_context(options)
+        workers, seed = options['workers'], options['seed']
+        threshold = options['lock_threshold_ms'] / 1000
+        self.stdout.write(f"{options['mode']}: {workers} workers for {options['duration']:.0f}s, mix {options['mix']}")
+
+        samples, locks = Samples(), LockStats(threshold)
+        started = time.perf_counter()
+        if options['mode'] == 'processes':
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('fork')) as pool:
+                futures = [pool.submit(_process_worker, ctx, mix, w, workers, options['duration'], seed, threshold)
+                           for w in range(workers)]
+                for future in futures:
+                    part, lock_part = future.result()
+                    samples.merge(part)
+                    locks.errors += lock_part['errors']
+                    locks.waits += lock_part['waits']
+                    locks.wait_seconds += lock_part['wait_seconds']
+        elif options['mode'] == 'threads':
+            locks.install()
+            handler = WSGIHandler()
+            deadline = time.monotonic() + options['duration']
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(run_worker, lambda c, s: wsgi_call(handler, c, s), ctx, mix, w, workers, deadline, seed)
+                           for w in range(workers)]
+                for future in futures:
+                    samples.merge(future.result())
+        else:
+            locks.install()
+            samples = asyncio.run(self.run_asgi(ctx, mix, workers, options['duration'], seed))
+        samples.elapsed = time.perf_counter() - started
+        self.report(samples, locks.snapshot(), options)
+
+    def build_context(self, options) -> Context:
+        rng = random.Random(options['seed'])
+        User = get_user_model()
+        user, created = User.objects.get_or_create(username=options['user'], defaults={'is_staff': True})
+        if created:
+            user.set_unusable_password()
+            user.save()
+        client = Client()
+        client.force_login(user)
+
+        orgs = list(Organization.objects.order_by('id').values_list('site_id', 'id'))
+        if not orgs:
+            raise CommandError('No organizations found; seed data with generate_load_data first')
+        orgs = rng.sample(orgs, min(SAMPLE_ORGS, len(orgs)))
+        org_ids = [org_id for _, org_id in orgs]
+        sections = defaultdict(list)
+        for org_id, pk, content in OrganizationSection.objects.filter(
+            organization_id__in=org_ids, tab='business', active=True,
+        ).values_list('organization_id', 'id', 'content'):
+            sections[org_id].append((pk, content))
+        prefix = options['login_prefix']
+        users = list(User.objects.filter(username__startswith=f'{prefix}_u').order_by('id').values_list('id', 'username'))
+        users = rng.sample(users, min(SAMPLE_USERS, len(users)))
+        user_ids = [pk for pk, _ in users]
+        existing = set(Membership.all_objects.filter(
+            organization_id__in=org_ids, user_id__in=user_ids,
+        ).values_list('user_id', 'organization_id'))
+        return Context(
+            session=client.cookies['sessionid'].value,
+            csrf=get_random_string(32),
+            orgs=orgs,
+            sections=dict(sections),
+            users=user_ids,
+            existing=existing,
+            member_role=Role.objects.filter(code='member').values_list('id', flat=True).first(),
+            logins=[username for _, username in users[:100]],
+            password=prefix,
+        )
+
+    async def run_asgi(self, ctx: Context, mix: dict, workers: int, duration: float, seed: int) -> Samples:
+        handler = ASGIHandler()
+        deadline = time.monotonic() + duration
+        samples = Samples()
+
+        async def worker(w: int):
+            rng = random.Random(seed * 1000 + w)
+            names, weights = list(mix), list(mix.values())
+            while time.monotonic() < deadline:
+                for step in SCENARIOS[rng.choices(names, weights)[0]](ctx, rng, w, workers):
+                    started = time.perf_counter()
+                    status = await asgi_call(handler, ctx, step)
+                    _record(samples, step, status, time.perf_counter() - started)
+
+        await asyncio.gather(*(worker(w) for w in range(workers)))
+        return samples
+
+    def report(self, samples: Samples, locks: dict, options):
+        rows = []
+        for name, values in sorted(samples.latencies.items()):
+            values.sort()
+            rows.append({
+                'name': name,
+                'requests': len(values),
+                'rps': len(values) / samples.elapsed,
+                'p50_ms': _percentile(values, 0.50),
+                'p95_ms': _percentile(values, 0.95),
+                'p99_ms': _percentile(values, 0.99),
+                'max_ms': values[-1] * 1000,
+                'errors': samples.errors.get(name, 0),
+            })
+        total = sum(r['requests'] for r in rows)
+        self.stdout.write(f"{'url name':<32} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+        for r in rows:
+            self.stdout.write(
+                f"{r['name']:<32} {r['requests']:>7} {r['rps']:>8.1f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+                f"{r['p99_ms']:>8.1f} {r['max_ms']:>8.1f} {r['errors']:>7}"
+            )
+        self.stdout.write(f"total: {total} requests in {samples.elapsed:.1f}s = {total / samples.elapsed:.1f} req/s, "
+                          f"{sum(r['errors'] for r in rows)} errors")
+        self.stdout.write(f"sqlite: {locks['errors']} 'database is locked' errors, {locks['waits']} writes waited "
+                          f">= {options['lock_threshold_ms']:.0f}ms ({locks['wait_seconds']:.2f}s total)")
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump({
+                    'mode': options['mode'], 'workers': options['workers'], 'duration': samples.elapsed,
+                    'mix': options['mix'], 'requests': total, 'rps': total / samples.elapsed,
+                    'urls': rows, 'sqlite': locks,
+                }, fh, indent=2)
@@ -0,0 +1,159 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Runs in a fresh interpreter so nothing is already imported. Times each phase of
+# django.setup(), every AppConfig.ready() and the URLconf import, and counts the
+# queries issued before the first request.
+SCRIPT = r'''
+import json, os, time
+t0 = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+from django.apps import AppConfig
+
+ready = {}
+_create = AppConfig.create.__func__
+
+def create(cls, entry):
+    config = _create(cls, entry)
+    original = config.ready
+    def timed_ready():
+        start = time.perf_counter()
+        original()
+        ready[config.label] = (time.perf_counter() - start) * 1000
+    config.ready = timed_ready
+    return config
+
+AppConfig.create = classmethod(create)
+
+queries = []
+from django.db.backends.signals import connection_created
+def track(sender, connection, **kwargs):
+    connection.execute_wrappers.append(lambda execute, sql, *a: (queries.append(sql), execute(sql, *a))[1])
+connection_created.connect(track)
+
+import django
+from django.conf import settings
+t1 = time.perf_counter()
+settings.INSTALLED_APPS
+t2 = time.perf_counter()
+django.setup()
+t3 = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+t4 = time.perf_counter()
+print(json.dumps({
+    'django_import_ms': (t1 - t0) * 1000,
+    'settings_ms': (t2 - t1) * 1000,
+    'setup_ms': (t3 - t2) * 1000,
+    'urls_ms': (t4 - t3) * 1000,
+    'total_ms': (t4 - t0) * 1000,
+    'ready_ms': ready,
+    'queries': queries,
+}))
+'''
+
+IMPORTTIME = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def group_of(module: str) -> str:
+    """Bucket a module under its app (apps.app_x, apis.api_x) or top-level package."""
+    parts = module.split('.')
+    if parts[0] in ('apps', 'apis') and len(parts) > 1:
+        return '.'.join(parts[:2])
+    if parts[0] == 'django' and len(parts) > 2 and parts[1] == 'contrib':
+        return '.'.join(parts[:3])
+    return parts[0]
+
+
+class Command(BaseCommand):
+    help = ("Profile a cold start: import time per app/package and module (python -X importtime), "
+            "AppConfig.ready() durations, URLconf import and any queries run before the first request.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Fresh interpreters to average over')
+        parser.add_argument('--top', type=int, default=15, help='Rows per table')
+        parser.add_argument('--json', default=None, help='Write the report to this JSON file')
+
+    def handle(self, *args, **options):
+        runs = [self.run_once() for _ in range(max(1, options['runs']))]
+        report = self.summarise(runs, options['top'])
+        if options['json']:
+            Path(options['json']).write_text(json.dumps(report, indent=2) + '\n')
+        self.render(report)
+
+    def run_once(self) -> dict:
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', SCRIPT],
+                                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        if result.returncode:
+            raise CommandError(f"startup failed:\n{result.stderr[-2000:]}")
+        run = json.loads(result.stdout.strip().splitlines()[-1])
+        modules = {}
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME.match(line)
+            if match:
+                modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+        run['modules'] = modules
+        return run
+
+    def summarise(self, runs: list, top: int) -> dict:
+        def median(values):
+            return round(statistics.median(values), 2)
+
+        phases = {key: median([r[key] for r in runs])
+                  for key in ('django_import_ms', 'settings_ms', 'setup_ms', 'urls_ms', 'total_ms')}
+        labels = sorted({label for r in runs for label in r['ready_ms']})
+        ready = {label: median([r['ready_ms'].get(label, 0.0) for r in runs]) for label in labels}
+
+        self_us = defaultdict(list)
+        cumulative_us = defaultdict(list)
+        for r in runs:
+            for module, (own, cumulative) in r['modules'].items():
+                self_us[module].append(own)
+                cumulative_us[module].append(cumulative)
+        groups = defaultdict(float)
+        for module, values in self_us.items():
+            groups[group_of(module)] += statistics.median(values) / 1000
+        modules = sorted(((m, statistics.median(v) / 1000, statistics.median(cumulative_us[m]) / 1000)
+                          for m, v in self_us.items()), key=lambda row: -row[1])
+
+        return {
+            'runs': len(runs),
+            'phases_ms': phases,
+            'ready_ms': dict(sorted(ready.items(), key=lambda kv: -kv[1])),
+            'import_ms_by_group': {g: round(ms, 2) for g, ms in
+                                   sorted(groups.items(), key=lambda kv: -kv[1])[:top]},
+            'import_ms_by_module': [{'module': m, 'self_ms': round(own, 2), 'cumulative_ms': round(cum, 2)}
+                                    for m, own, cum in modules[:top]],
+            'import_ms_total': round(sum(groups.values()), 2),
+            'startup_queries': runs[0]['queries'],
+        }
+
+    def render(self, report: dict):
+        self.stdout.write(f"Cold start, median of {report['runs']} run(s)")
+        for key, ms in report['phases_ms'].items():
+            self.stdout.write(f"  {key:<24} {ms:>9.1f}")
+        self.stdout.write("\nAppConfig.ready() ms")
+        for label, ms in report['ready_ms'].items():
+            self.stdout.write(f"  {label:<40} {ms:>9.2f}")
+        self.stdout.write(f"\nImport self time by app/package ms (total {report['import_ms_total']:.1f})")
+        for group, ms in report['import_ms_by_group'].items():
+            self.stdout.write(f"  {group:<40} {ms:>9.1f}")
+        self.stdout.write(f"\nSlowest modules ms{'self':>33} {'cumul':>9}")
+        for row in report['import_ms_by_module']:
+            self.stdout.write(f"  {row['module']:<40} {row['self_ms']:>9.1f} {row['cumulative_ms']:>9.1f}")
+        queries = report['startup_queries']
+        style = self.style.WARNING if queries else self.style.SUCCESS
+        self.stdout.write(style(f"\nQueries before first request: {len(queries)}"))
+        for sql in queries:
+            self.stdout.write(f"  {sql[:160]}")
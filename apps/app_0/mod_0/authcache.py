@@ -0,0 +1,71 @@
+"""Request user served from the cache (settings.AUTH_USER_CACHE_SECONDS > 0).
+
+Replaces the per-request user query of AuthenticationMiddleware. A cached user is only used
+when the session's auth hash still matches it, so password changes and
+update_session_auth_hash() behave as with the database lookup. Saving or deleting a user, or
+changing its groups or permissions, drops the entry in this process; other processes hold a
+stale copy for at most AUTH_USER_CACHE_SECONDS unless CACHE_BACKEND is shared.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.crypto import constant_time_compare
+
+
+def _key(user_id) -> str:
+    return f'auth:user:{user_id}'
+
+
+def cache_seconds() -> int:
+    return getattr(settings, 'AUTH_USER_CACHE_SECONDS', 0)
+
+
+def get_cached_user(request):
+    """Drop-in for django.contrib.auth.get_user() with the user read from the cache."""
+    if hasattr(request, '_cached_user'):
+        return request._cached_user
+    user = None
+    session = request.session
+    if session.get(BACKEND_SESSION_KEY) in settings.AUTHENTICATION_BACKENDS and SESSION_KEY in session:
+        cached = cache.get(_key(session[SESSION_KEY]))
+        if cached is not None and constant_time_compare(
+            session.get(HASH_SESSION_KEY, ''), cached.get_session_auth_hash(),
+        ):
+            user = cached
+    if user is None:
+        # Full lookup: also flushes sessions whose hash no longer matches
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            cache.set(_key(user.pk), user, cache_seconds())
+    request._cached_user = user
+    return user
+
+
+def invalidate(user_id):
+    cache.delete(_key(user_id))
+
+
+def _on_user_change(sender, instance, **kwargs):
+    invalidate(instance.pk)
+
+
+def _on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        # group.user_set.add(...) and friends: instance is the group/permission
+        for pk in pk_set or ():
+            invalidate(pk)
+    else:
+        invalidate(instance.pk)
+
+
+def connect():
+    User = get_user_model()
+    post_save.connect(_on_user_change, sender=User, dispatch_uid='authcache_user_save')
+    post_delete.connect(_on_user_change, sender=User, dispatch_uid='authcache_user_delete')
+    for field in ('groups', 'user_permissions'):
+        m2m_changed.connect(_on_m2m_change, sender=getattr(User, field).through,
+                            dispatch_uid=f'authcache_user_{field}')
@@ -0,0 +1,55 @@
+"""Primary/replica routing (settings.DATABASE_REPLICAS).
+
+Writes always go to the primary ('default'); reads go to a random replica until the current
+request (or context) writes, after which they are pinned to the primary so the request sees
+its own writes. ReplicaPinMiddleware resets the pin per request and carries it to the same
+browser for settings.REPLICA_PIN_SECONDS through a cookie, covering replication lag.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'db_pin'
+# Sessions must be readable right after login/logout, whatever the replica lag
+PRIMARY_ONLY_APPS = {'sessions'}
+
+_pinned = ContextVar('db_pinned', default=False)
+_wrote = ContextVar('db_wrote', default=False)
+
+
+def replicas() -> list[str]:
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def pin_to_primary():
+    """Route the remaining reads of this request/context to the primary."""
+    _pinned.set(True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if not aliases or _pinned.get() or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Related lookups follow the database the instance came from
+            return instance._state.db
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,232 @@
+"""Namespaced cache with generation-counter invalidation.
+
+A cached value declares the namespaces it depends on ("site:12", "org:44:organizationsection")
+and its key embeds their current generations (CacheGeneration rows, one query per lookup).
+Writes bump the generations, so every process stops hitting the old entries at once without
+deletes or an external service; stale entries simply expire.
+
+Saves and deletes of BaseModelImpl rows bump their namespaces through signals (connected in
+App0Config.ready), as does SoftDeleteQuerySet.delete(). Call bump() or bump_queryset() after
+queryset.update(), bulk_create() and raw SQL.
+"""
+import hashlib
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, models, router
+from django.db.models import F
+from django.db.models.signals import class_prepared, post_delete, post_save
+
+from .models import BaseModelImpl, CacheGeneration
+
+KEY_PREFIX = 'gen'
+LOCK_POLL_SECONDS = 0.05
+
+_batch = ContextVar('gencache_batch', default=None)
+
+
+def scope(model) -> str:
+    return model._meta.concrete_model._meta.model_name
+
+
+def site_ns(site_id, model=None) -> str:
+    """Namespace of a site, or of one model's rows within it (site_ns(12, Membership))."""
+    return f'site:{site_id}' + (f':{scope(model)}' if model else '')
+
+
+def org_ns(org_id, model=None) -> str:
+    """Namespace of an organization, or of one model's rows within it (org_ns(44, OrganizationSection))."""
+    return f'org:{org_id}' + (f':{scope(model)}' if model else '')
+
+
+def model_ns(model) -> str:
+    """Namespace of a model that belongs to no site or organization (roles, types)."""
+    return f'all:{scope(model)}'
+
+
+def _owners(model):
+    """(site field, org field) attnames of `model`; 'pk' for Site and Organization themselves."""
+    concrete = model._meta.concrete_model
+    fields = {f.name: f for f in concrete._meta.concrete_fields if f.is_relation}
+    site = 'pk' if concrete._meta.label == 'app_admin.Site' else (fields['site'].attname if 'site' in fields else None)
+    org = 'pk' if concrete._meta.label == 'app_admin.Organization' else (
+        fields['organization'].attname if 'organization' in fields else None)
+    return site, org
+
+
+def _namespaces(model, site_id, org_id) -> list[str]:
+    names = []
+    if site_id is not None:
+        names += [site_ns(site_id), site_ns(site_id, model)]
+    if org_id is not None:
+        names += [org_ns(org_id), org_ns(org_id, model)]
+    return names or [model_ns(model)]
+
+
+def namespaces_for(instance) -> list[str]:
+    site, org = _owners(type(instance))
+    return _namespaces(
+        type(instance),
+        getattr(instance, site) if site else None,
+        getattr(instance, org) if org else None,
+    )
+
+
+def bump(*namespaces, using=None):
+    """Invalidate everything cached under `namespaces` (a single upsert statement)."""
+    pending = _batch.get()
+    if pending is not None:
+        pending.update(namespaces)
+        return
+    namespaces = sorted(set(namespaces))
+    if not namespaces:
+        return
+    alias = using or router.db_for_write(CacheGeneration)
+    conn = connections[alias]
+    if conn.vendor in ('sqlite', 'postgresql'):
+        table = conn.ops.quote_name(CacheGeneration._meta.db_table)
+        with conn.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} (namespace, generation) VALUES (%s, 1) "
+                f"ON CONFLICT (namespace) DO UPDATE SET generation = {table}.generation + 1",
+                [(ns,) for ns in namespaces],
+            )
+        return
+    manager = CacheGeneration.objects.using(alias)
+    if manager.filter(namespace__in=namespaces).update(generation=F('generation') + 1) < len(namespaces):
+        # First bump of some namespace: existing rows were already incremented above
+        manager.bulk_create(
+            [CacheGeneration(namespace=ns, generation=1) for ns in namespaces], ignore_conflicts=True,
+        )
+
+
+def bump_queryset(queryset):
+    """bump() the namespaces of every row `queryset` matches (before an update or bulk delete)."""
+    site, org = _owners(queryset.model)
+    if site is None and org is None:
+        bump(model_ns(queryset.model), using=queryset.db)
+        return
+    fields = [f for f in (site, org) if f]
+    names = set()
+    for row in queryset.order_by().values_list(*fields).distinct():
+        owners = dict(zip(fields, row))
+        names.update(_namespaces(queryset.model, owners.get(site), owners.get(org)))
+    bump(*names, using=queryset.db)
+
+
+def generations(namespaces) -> dict[str, int]:
+    if not namespaces:
+        return {}
+    found = dict(CacheGeneration.objects.filter(namespace__in=namespaces).values_list('namespace', 'generation'))
+    return {ns: found.get(ns, 0) for ns in namespaces}
+
+
+def make_key(name: str, depends_on) -> str:
+    gens = generations(sorted(set(depends_on)))
+    key = f'{name}:' + ','.join(f'{ns}={gen}' for ns, gen in gens.items())
+    if len(key) > 200:
+        # Keep within memcached's 250-character limit
+        key = f'{name[:100]}:{hashlib.md5(key.encode()).hexdigest()}'
+    return f'{KEY_PREFIX}:{key}'
+
+
+def _recompute(key: str, lock_key: str | None, compute, soft_ttl: float, hard_ttl: float):
+    try:
+        value = compute()
+        cache.set(key, (value, time.time() + soft_ttl), hard_ttl)
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
+    return value
+
+
+def get_or_set(name: str, depends_on, compute, soft_ttl=None, hard_ttl=None):
+    """Cached `compute()` for `name`, recomputed after any namespace in `depends_on` is bumped.
+
+    Generations are read before computing, so a concurrent write can only make the entry newer
+    than its key, never older. Entries are fresh for `soft_ttl` seconds and kept for `hard_ttl`.
+    Recomputation is single-flight: the caller that wins a lock in the cache recomputes while the
+    others get the stale entry or, when there is none, wait up to GENCACHE_LOCK_WAIT seconds for
+    the winner's result. The lock is shared across processes only with a shared CACHE_BACKEND.
+    """
+    soft_ttl = settings.GENCACHE_SOFT_TTL if soft_ttl is None else soft_ttl
+    hard_ttl = settings.GENCACHE_HARD_TTL if hard_ttl is None else hard_ttl
+    key = make_key(name, depends_on)
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() < fresh_until or not cache.add(lock_key, 1, settings.GENCACHE_LOCK_TIMEOUT):
+            return value
+        return _recompute(key, lock_key, compute, soft_ttl, hard_ttl)
+    if cache.add(lock_key, 1, settings.GENCACHE_LOCK_TIMEOUT):
+        return _recompute(key, lock_key, compute, soft_ttl, hard_ttl)
+    deadline = time.monotonic() + settings.GENCACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    # The winner is slow or gone; compute without the lock rather than fail
+    return _recompute(key, None, compute, soft_ttl, hard_ttl)
+
+
+def _arg_key(value) -> str:
+    return str(value.pk) if isinstance(value, models.Model) else repr(value)
+
+
+def cached(depends_on, soft_ttl=None, hard_ttl=None):
+    """Decorator form of get_or_set() for data builders. `depends_on(*args, **kwargs)` returns
+    the namespaces; the key is the function name plus its arguments (model instances by pk).
+
+        @cached(lambda site: [site_ns(site.pk)], soft_ttl=60)
+        def site_stats(site): ...
+    """
+    def decorator(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            parts = [_arg_key(a) for a in args] + [f'{k}={_arg_key(v)}' for k, v in sorted(kwargs.items())]
+            return get_or_set(f"{name}({','.join(parts)})", depends_on(*args, **kwargs),
+                              lambda: func(*args, **kwargs), soft_ttl, hard_ttl)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def batched(using=None):
+    """Collect the bumps made inside the block and issue them once at the end, e.g. around
+    cascading hard deletes that would otherwise bump once per row.
+    """
+    names = set()
+    token = _batch.set(names)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+    bump(*names, using=using)
+
+
+def _on_change(sender, instance, using=None, **kwargs):
+    bump(*namespaces_for(instance), using=using)
+
+
+def _connect_model(sender, **kwargs):
+    # Per sender, so models outside BaseModelImpl keep Django's fast (signal-free) deletes
+    if issubclass(sender, BaseModelImpl) and not sender._meta.abstract:
+        uid = f'gencache_{sender._meta.label}'
+        post_save.connect(_on_change, sender=sender, dispatch_uid=uid)
+        post_delete.connect(_on_change, sender=sender, dispatch_uid=uid)
+
+
+def connect():
+    from django.apps import apps
+    for model in apps.get_models():
+        _connect_model(model)
+    # Models in mod_* packages may only be imported after the apps are ready
+    class_prepared.connect(_connect_model, dispatch_uid='gencache_class_prepared')
@@ -0,0 +1,117 @@
+"""Readiness checks: database round trip and pending migrations.
+
+The migration graph is read from disk once per process (it cannot change while the process
+runs); afterwards a status refresh is a single `django_migrations` query, and the result is
+reused for HEALTH_MIGRATIONS_TTL seconds. Probes every couple of seconds therefore cost one
+`SELECT 1` each. Pending migrations or a failed check are re-read after
+HEALTH_MIGRATIONS_RETRY_TTL seconds instead, so a process turns ready soon after another one
+ran `migrate`; a `migrate` in this process drops the cached status (post_migrate).
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+
+
+_lock = threading.Lock()
+_disk: dict[tuple[str, str], tuple] | None = None
+_status: dict | None = None
+
+
+def _ttl(status: dict) -> float:
+    if status['pending'] == []:
+        return float(getattr(settings, 'HEALTH_MIGRATIONS_TTL', 300))
+    return float(getattr(settings, 'HEALTH_MIGRATIONS_RETRY_TTL', 5))
+
+
+def _fresh(status: dict | None) -> bool:
+    return status is not None and time.time() - status['checked_at'] < _ttl(status)
+
+
+def _disk_migrations() -> dict[tuple[str, str], tuple]:
+    """{(app, name): replaced keys} for every migration on disk (loaded once)."""
+    global _disk
+    if _disk is None:
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        _disk = {key: tuple(migration.replaces or ()) for key, migration in loader.disk_migrations.items()}
+    return _disk
+
+
+def _compute(using: str) -> dict:
+    disk = _disk_migrations()
+    recorder = MigrationRecorder(connections[using])
+    try:
+        applied = set(recorder.migration_qs.values_list('app', 'name')) if recorder.has_table() else set()
+    except Exception as exc:
+        return {'pending': None, 'error': str(exc), 'checked_at': time.time()}
+    pending = []
+    for key, replaces in disk.items():
+        if key in applied:
+            continue
+        # A squashed migration counts as applied once everything it replaces is
+        if replaces and all(r in applied for r in replaces):
+            continue
+        pending.append(f'{key[0]}.{key[1]}')
+    return {'pending': sorted(pending), 'error': None, 'checked_at': time.time()}
+
+
+def migration_status(using: str = DEFAULT_DB_ALIAS, refresh: bool = False) -> dict:
+    """{'pending': [...] or None, 'error', 'checked_at'}; cached, see the module docstring."""
+    global _status
+    status = _status
+    if not refresh and _fresh(status):
+        return status
+    with _lock:
+        if refresh or not _fresh(_status):
+            _status = _compute(using)
+        return _status
+
+
+def warm(using: str = DEFAULT_DB_ALIAS):
+    """Compute the status at process start (called from the WSGI/ASGI entry points)."""
+    try:
+        migration_status(using, refresh=True)
+    except Exception:
+        # Never block startup; the first probe retries
+        invalidate()
+
+
+def invalidate():
+    global _status
+    _status = None
+
+
+def database_check(using: str = DEFAULT_DB_ALIAS) -> dict:
+    conn = connections[using]
+    was_connected = conn.connection is not None
+    start = time.perf_counter()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except Exception as exc:
+        return {'ok': False, 'error': str(exc), 'reused_connection': was_connected}
+    return {
+        'ok': True,
+        'latency_ms': round((time.perf_counter() - start) * 1000, 3),
+        'vendor': conn.vendor,
+        'reused_connection': was_connected,
+    }
+
+
+def readiness(using: str = DEFAULT_DB_ALIAS) -> tuple[bool, dict]:
+    db = database_check(using)
+    migrations = migration_status(using) if db['ok'] else {'pending': None, 'error': 'database unavailable'}
+    ready = db['ok'] and migrations['pending'] == []
+    return ready, {
+        'status': 'ok' if ready else 'fail',
+        'database': db,
+        'migrations': {
+            'pending': migrations['pending'],
+            'error': migrations.get('error'),
+            'age_s': round(time.time() - migrations['checked_at'], 1) if migrations.get('checked_at') else None,
+        },
+    }
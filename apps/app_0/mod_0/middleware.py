@@ -0,0 +1,182 @@
+import random
+import time
+from contextlib import ExitStack
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.functional import SimpleLazyObject
+
+from . import authcache, dbrouter, querycheck, telemetry
+
+
+class _QueryTimer:
+    """Execute wrapper counting queries and SQL time of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """Record latency, query count, SQL time and response size per resolved URL name.
+    Put it first in MIDDLEWARE so the whole stack is timed.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _start(self, stack: ExitStack) -> _QueryTimer:
+        timer = _QueryTimer()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(timer))
+        return timer
+
+    def _record(self, request, response, started: float, timer: _QueryTimer):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or '<unmatched>'
+        size = None if response.streaming else len(response.content)
+        telemetry.observe(
+            view, request.method, response.status_code, time.perf_counter() - started,
+            timer.count, timer.seconds, size,
+        )
+        telemetry.flush()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            timer = self._start(stack)
+            response = self.get_response(request)
+        self._record(request, response, started, timer)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            timer = self._start(stack)
+            response = await self.get_response(request)
+        self._record(request, response, started, timer)
+        return response
+
+
+class QueryInspectorMiddleware:
+    """Flag likely N+1 query loops and enforce per-view query budgets (settings.QUERY_INSPECTOR).
+    Removed from the stack entirely unless ENABLED; SAMPLE_RATE and CAPTURE_STACK keep its cost
+    low enough for load tests.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.cfg = querycheck.config()
+        if not self.cfg['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _recorder(self, stack: ExitStack) -> querycheck.QueryRecorder | None:
+        if self.cfg['SAMPLE_RATE'] < 1 and random.random() >= self.cfg['SAMPLE_RATE']:
+            return None
+        recorder = querycheck.QueryRecorder(capture_stack=self.cfg['CAPTURE_STACK'])
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        return recorder
+
+    def _check(self, request, response, recorder):
+        if recorder is None:
+            return
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or '<unmatched>'
+        response['X-Query-Count'] = str(recorder.total)
+        querycheck.enforce(view, recorder, self.cfg)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with ExitStack() as stack:
+            recorder = self._recorder(stack)
+            response = self.get_response(request)
+        self._check(request, response, recorder)
+        return response
+
+    async def __acall__(self, request):
+        with ExitStack() as stack:
+            recorder = self._recorder(stack)
+            response = await self.get_response(request)
+        self._check(request, response, recorder)
+        return response
+
+
+class ReplicaPinMiddleware:
+    """Request scope for dbrouter's read-your-writes pin. Unsafe methods and browsers that
+    wrote within REPLICA_PIN_SECONDS read from the primary; a request that writes sets the
+    pin cookie. Removed from the stack when no replicas are configured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not dbrouter.replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _start(self, request):
+        pinned = request.method not in ('GET', 'HEAD', 'OPTIONS') or dbrouter.PIN_COOKIE in request.COOKIES
+        return dbrouter._pinned.set(pinned), dbrouter._wrote.set(False)
+
+    def _finish(self, response, tokens):
+        if dbrouter._wrote.get():
+            seconds = int(getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+            response.set_cookie(dbrouter.PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+        dbrouter._pinned.reset(tokens[0])
+        dbrouter._wrote.reset(tokens[1])
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tokens = self._start(request)
+        response = self.get_response(request)
+        self._finish(response, tokens)
+        return response
+
+    async def __acall__(self, request):
+        tokens = self._start(request)
+        response = await self.get_response(request)
+        self._finish(response, tokens)
+        return response
+
+
+async def _auser(request):
+    return await sync_to_async(authcache.get_cached_user)(request)
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that loads request.user through authcache when
+    AUTH_USER_CACHE_SECONDS is set; Django's behaviour otherwise.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        if authcache.cache_seconds():
+            request.user = SimpleLazyObject(lambda: authcache.get_cached_user(request))
+            request.auser = partial(_auser, request)
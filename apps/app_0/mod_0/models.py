@@ -4,6 +4,8 @@ from django.utils import timezone
 
 class SoftDeleteQuerySet(models.QuerySet):
     def delete(self):
+        from .gencache import bump_queryset
+        bump_queryset(self)
         return super().update(deleted=True, active=False, updated_at=timezone.now())
 
     def hard_delete(self):
@@ -16,12 +18,36 @@ class SoftDeleteQuerySet(models.QuerySet):
         return self.filter(deleted=True)
 
 
+class TenantQuerySet(SoftDeleteQuerySet):
+    """Rows partitioned by site (and organization). Filtering through these methods keeps the
+    tenant columns leading, which is what the (site, ...) and (organization, ...) indexes expect.
+    """
+
+    def for_site(self, site):
+        return self.filter(site=site)
+
+    def for_organization(self, organization):
+        return self.filter(organization=organization)
+
+
 class SoftDeleteManager(models.Manager):
+    _queryset_class = SoftDeleteQuerySet
+
     def get_queryset(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).filter(deleted=False)
+        return self._queryset_class(self.model, using=self._db).filter(deleted=False)
 
     def hard_delete(self):
-        return SoftDeleteQuerySet(self.model, using=self._db).delete()
+        return self._queryset_class(self.model, using=self._db).delete()
+
+
+class TenantManager(SoftDeleteManager):
+    _queryset_class = TenantQuerySet
+
+    def for_site(self, site):
+        return self.get_queryset().for_site(site)
+
+    def for_organization(self, organization):
+        return self.get_queryset().for_organization(organization)
 
 
 class BaseModelImpl(models.Model):
@@ -69,3 +95,18 @@ class BaseModelImpl(models.Model):
 
     def hard_delete(self, using=None, keep_parents=False):
         return super().delete(using=using, keep_parents=keep_parents)
+
+
+class CacheGeneration(models.Model):
+    """Generation counter of one cache namespace ("site:12", "org:44:organizationsection").
+    Cache keys embed the generations they depend on; see apps/app_0/mod_0/gencache.py.
+    """
+    namespace = models.CharField(max_length=100, primary_key=True)
+    generation = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Cache generation'
+        verbose_name_plural = 'Cache generations'
+
+    def __str__(self):
+        return f"{self.namespace}@{self.generation}"
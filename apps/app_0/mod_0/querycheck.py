@@ -0,0 +1,126 @@
+"""Per-request SQL inspection: N+1 detection and query budgets.
+
+Statements are grouped by shape (literals and IN-lists collapsed), so
+`SELECT ... WHERE "id" = %s` run once per row of a loop shows up as one shape executed N
+times. A shape repeated REPEAT_THRESHOLD times or more in one request is reported as a likely
+N+1 together with the Python stack of its first execution.
+"""
+import logging
+import re
+import traceback
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+
+
+logger = logging.getLogger('jivapms.queries')
+
+DEFAULTS = {
+    'ENABLED': False,
+    # Fraction of requests inspected (1.0 = all); lower it for load tests
+    'SAMPLE_RATE': 1.0,
+    'REPEAT_THRESHOLD': 5,
+    # 'log' or 'raise'
+    'ACTION': 'log',
+    # Query budget for views not listed in BUDGETS (None = no budget)
+    'DEFAULT_BUDGET': None,
+    # {url name: max queries}
+    'BUDGETS': {},
+    # Capture the stack of the first execution of each shape (the main cost when enabled)
+    'CAPTURE_STACK': True,
+}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN \((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+_PROJECT_DIRS = ('apps', 'apis')
+
+
+def config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'QUERY_INSPECTOR', {})}
+
+
+def normalize(sql: str) -> str:
+    """Statement shape: literals → ?, IN-lists → IN (...), whitespace collapsed."""
+    shape = _STRING.sub('?', sql)
+    shape = _NUMBER.sub('?', shape)
+    shape = shape.replace('%s', '?')
+    shape = _IN_LIST.sub('IN (...)', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+def _project_stack() -> list[str]:
+    """Frames from project code (apps/, apis/), innermost last, excluding this module."""
+    root = Path(getattr(settings, 'TOP_LEVEL_DIR', settings.BASE_DIR.parent))
+    prefixes = tuple(str(root / d) for d in _PROJECT_DIRS)
+    frames = []
+    for frame in traceback.extract_stack()[:-3]:
+        if frame.filename.startswith(prefixes) and not frame.filename.endswith(('querycheck.py', 'middleware.py')):
+            frames.append(f'{frame.filename}:{frame.lineno} in {frame.name}')
+    return frames
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised (ACTION='raise') when a request exceeds its query budget or repeats a shape."""
+
+
+@dataclass
+class Repeat:
+    shape: str
+    count: int
+    stack: list[str] = field(default_factory=list)
+
+
+class QueryRecorder:
+    """Execute wrapper collecting statement shapes of one request."""
+
+    def __init__(self, capture_stack: bool = True):
+        self.capture_stack = capture_stack
+        self.shapes: Counter = Counter()
+        self.stacks: dict[str, list[str]] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = normalize(sql)
+        self.shapes[shape] += 1
+        if self.capture_stack and shape not in self.stacks:
+            self.stacks[shape] = _project_stack()
+        return execute(sql, params, many, context)
+
+    @property
+    def total(self) -> int:
+        return sum(self.shapes.values())
+
+    def repeats(self, threshold: int) -> list[Repeat]:
+        return [
+            Repeat(shape, count, self.stacks.get(shape, []))
+            for shape, count in self.shapes.most_common() if count >= threshold
+        ]
+
+
+def budget_for(view: str, cfg: dict) -> int | None:
+    return cfg['BUDGETS'].get(view, cfg['DEFAULT_BUDGET'])
+
+
+def report(view: str, recorder: QueryRecorder, cfg: dict) -> list[str]:
+    """Problems found in one request, as log-ready messages."""
+    problems = []
+    budget = budget_for(view, cfg)
+    if budget is not None and recorder.total > budget:
+        problems.append(f"{view}: {recorder.total} queries, budget {budget}")
+    for rep in recorder.repeats(cfg['REPEAT_THRESHOLD']):
+        where = "\n    first executed at:\n      " + "\n      ".join(rep.stack) if rep.stack else ''
+        problems.append(f"{view}: likely N+1, {rep.count}x {rep.shape}{where}")
+    return problems
+
+
+def enforce(view: str, recorder: QueryRecorder, cfg: dict):
+    problems = report(view, recorder, cfg)
+    if not problems:
+        return
+    if cfg['ACTION'] == 'raise':
+        raise QueryBudgetExceeded('\n'.join(problems))
+    for message in problems:
+        logger.warning(message)
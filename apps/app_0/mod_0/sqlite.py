@@ -0,0 +1,13 @@
+"""SQLite connection tuning: applies settings.SQLITE_PRAGMAS to every new connection."""
+from django.conf import settings
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """connection_created receiver. Runs on the raw connection so the pragmas stay out of
+    connection.queries and execute wrappers.
+    """
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    for name, value in pragmas.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,205 @@
+"""Per-view request metrics in Prometheus text format.
+
+Each thread records into its own shard (a plain dict only that thread writes), so the request
+path takes no lock. A process periodically merges its shards and upserts the cumulative
+totals as one row of a small SQLite file shared by all worker processes (METRICS_STORE);
+the /metrics/ endpoint sums the rows of every process. Without METRICS_STORE nothing is
+written and /metrics/ reports the serving process only. Rows are keyed by pid and start time,
+so a restarted worker adds a new row instead of resetting another one's counters. The key is
+taken on first use and again after a fork, so workers forked from a preloaded parent get rows
+of their own. Rows not updated for STALE_FLUSHES flush intervals (dead processes) are deleted;
+a live process writes its cumulative totals back on its next flush.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+PREFIX = 'jivapms'
+STALE_FLUSHES = 60
+
+_process: tuple[int, str] | None = None
+_local = threading.local()
+_shards: list[dict] = []
+_shards_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_last_flush = 0.0
+
+
+def _process_key() -> str:
+    global _process
+    pid = os.getpid()
+    if _process is None or _process[0] != pid:
+        _process = (pid, f'{pid}-{int(time.time() * 1000)}')
+    return _process[1]
+
+
+def _after_fork():
+    # The child starts with its own totals; the parent's stay in the parent's row
+    global _local, _shards, _shards_lock, _flush_lock, _last_flush
+    _local = threading.local()
+    _shards = []
+    _shards_lock = threading.Lock()
+    _flush_lock = threading.Lock()
+    _last_flush = 0.0
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def _shard() -> dict:
+    shard = getattr(_local, 'shard', None)
+    if shard is None:
+        shard = _local.shard = defaultdict(float)
+        with _shards_lock:
+            _shards.append(shard)
+    return shard
+
+
+def _bucket(value: float, bounds: tuple) -> int:
+    for idx, bound in enumerate(bounds):
+        if value <= bound:
+            return idx
+    return len(bounds)
+
+
+def observe(view: str, method: str, status: int, seconds: float, queries: int, sql_seconds: float, size: int | None):
+    shard = _shard()
+    labels = (view, method)
+    shard[('requests', labels + (f'{status // 100}xx',))] += 1
+    shard[('latency_bucket', labels + (_bucket(seconds, LATENCY_BUCKETS),))] += 1
+    shard[('latency_sum', labels)] += seconds
+    shard[('queries_bucket', labels + (_bucket(queries, QUERY_BUCKETS),))] += 1
+    shard[('queries_sum', labels)] += queries
+    shard[('sql_seconds', labels)] += sql_seconds
+    if size is not None:
+        shard[('response_bytes', labels)] += size
+
+
+def snapshot() -> dict:
+    """Cumulative totals of this process (all threads)."""
+    totals = defaultdict(float)
+    with _shards_lock:
+        shards = list(_shards)
+    for shard in shards:
+        for key, value in list(shard.items()):
+            totals[key] += value
+    return totals
+
+
+# -- shared store -----------------------------------------------------------------------------
+def _store_path() -> str:
+    return str(getattr(settings, 'METRICS_STORE', '') or '')
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(_store_path(), timeout=1.0)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('CREATE TABLE IF NOT EXISTS process_metrics (process TEXT PRIMARY KEY, updated REAL, data TEXT)')
+    return conn
+
+
+def _encode(totals: dict) -> str:
+    return json.dumps([[metric, list(labels), value] for (metric, labels), value in totals.items()])
+
+
+def flush(force: bool = False):
+    """Write this process's totals to the shared store (at most every METRICS_FLUSH_SECONDS)."""
+    global _last_flush
+    if not _store_path():
+        return
+    interval = float(getattr(settings, 'METRICS_FLUSH_SECONDS', 10))
+    if not force and time.monotonic() - _last_flush < interval:
+        return
+    if not _flush_lock.acquire(blocking=force):
+        return
+    try:
+        _last_flush = time.monotonic()
+        data = _encode(snapshot())
+        now = time.time()
+        with _connect() as conn:
+            conn.execute(
+                'INSERT INTO process_metrics (process, updated, data) VALUES (?, ?, ?) '
+                'ON CONFLICT(process) DO UPDATE SET updated = excluded.updated, data = excluded.data',
+                (_process_key(), now, data),
+            )
+            conn.execute('DELETE FROM process_metrics WHERE updated < ?', (now - STALE_FLUSHES * max(interval, 1),))
+    except sqlite3.Error:
+        # Metrics must never fail a request; the next flush retries
+        pass
+    finally:
+        _flush_lock.release()
+
+
+def collect() -> dict:
+    """Totals summed over every process that has flushed, including this one (flushed first)."""
+    if not _store_path():
+        return snapshot()
+    flush(force=True)
+    totals = defaultdict(float)
+    try:
+        with _connect() as conn:
+            rows = conn.execute('SELECT data FROM process_metrics').fetchall()
+    except sqlite3.Error:
+        return snapshot()
+    for (data,) in rows:
+        for metric, labels, value in json.loads(data):
+            totals[(metric, tuple(labels))] += value
+    return totals
+
+
+# -- exposition ---------------------------------------------------------------------------------
+def _esc(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(view, method, **extra) -> str:
+    pairs = [('view', view), ('method', method)] + list(extra.items())
+    return '{' + ','.join(f'{k}="{_esc(v)}"' for k, v in pairs) + '}'
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _histogram(lines: list, name: str, help_text: str, totals: dict, metric: str, sum_metric: str, bounds: tuple):
+    lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+    counts = defaultdict(lambda: [0.0] * (len(bounds) + 1))
+    for (m, labels), value in totals.items():
+        if m == metric:
+            counts[labels[:2]][int(labels[2])] += value
+    for (view, method), buckets in sorted(counts.items()):
+        running = 0.0
+        for bound, count in zip(bounds + ('+Inf',), buckets):
+            running += count
+            lines.append(f'{name}_bucket{_labels(view, method, le=bound)} {_fmt(running)}')
+        lines.append(f'{name}_sum{_labels(view, method)} {_fmt(totals.get((sum_metric, (view, method)), 0.0))}')
+        lines.append(f'{name}_count{_labels(view, method)} {_fmt(running)}')
+
+
+def render(totals: dict) -> str:
+    lines = [f'# HELP {PREFIX}_requests_total Requests by URL name, method and status class',
+             f'# TYPE {PREFIX}_requests_total counter']
+    for (metric, labels), value in sorted(totals.items()):
+        if metric == 'requests':
+            lines.append(f'{PREFIX}_requests_total{_labels(labels[0], labels[1], status=labels[2])} {_fmt(value)}')
+    _histogram(lines, f'{PREFIX}_request_duration_seconds', 'Request latency by URL name',
+               totals, 'latency_bucket', 'latency_sum', LATENCY_BUCKETS)
+    _histogram(lines, f'{PREFIX}_request_queries', 'SQL queries per request by URL name',
+               totals, 'queries_bucket', 'queries_sum', QUERY_BUCKETS)
+    for metric, name, help_text in (
+        ('sql_seconds', f'{PREFIX}_sql_seconds_total', 'Time spent in SQL by URL name'),
+        ('response_bytes', f'{PREFIX}_response_bytes_total', 'Response body bytes by URL name (non-streaming responses)'),
+    ):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for (m, labels), value in sorted(totals.items()):
+            if m == metric:
+                lines.append(f'{name}{_labels(*labels)} {_fmt(value)}')
+    return '\n'.join(lines) + '\n'
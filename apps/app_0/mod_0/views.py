@@ -3,13 +3,15 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 from django.core.management import call_command
 from django.db import connections
-from django.db.migrations.executor import MigrationExecutor
-from django.http import HttpResponseForbidden
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from django.shortcuts import redirect, render
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 
+from . import health, telemetry
+
 
 def _is_localhost(request):
     host = request.get_host().split(':')[0]
@@ -48,6 +50,28 @@ def help_page(request):
     return render(request, 'help/index.html', ctx)
 
 
+@require_http_methods(["GET"])
+def readiness(request):
+    """Load balancer readiness probe: 200 when the database answers and no migration is pending."""
+    ready, report = health.readiness()
+    return JsonResponse(report, status=200 if ready else 503)
+
+
+@require_http_methods(["GET"])
+def metrics(request):
+    """Prometheus exposition of per-view request metrics, summed over all worker processes.
+    Staff only; a scraper can send `Authorization: Bearer <METRICS_TOKEN>` instead.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorized = request.user.is_authenticated and request.user.is_staff
+    if token and request.headers.get('Authorization') == f'Bearer {token}':
+        authorized = True
+    if not authorized:
+        return HttpResponseForbidden()
+    body = telemetry.render(telemetry.collect())
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @require_http_methods(["GET", "POST"])
 @csrf_protect
 def setup(request):
@@ -67,14 +91,10 @@ def setup(request):
     except Exception:
         status['health_ok'] = False
 
-    # Pending migrations
-    try:
-        executor = MigrationExecutor(connections['default'])
-        targets = executor.loader.graph.leaf_nodes()
-        status['pending_migrations'] = executor.migration_plan(targets) != []
-    except Exception:
-        # If tables are missing, treat as pending
-        status['pending_migrations'] = True
+    # Pending migrations (cached; recomputed after running migrate below)
+    migrations = health.migration_status()
+    # If the status cannot be read (e.g. tables are missing), treat as pending
+    status['pending_migrations'] = migrations['pending'] != []
 
     UserModel = get_user_model()
     status['superuser_exists'] = UserModel.objects.filter(is_superuser=True).exists()
@@ -1,3 +1,1316 @@
-from django.test import TestCase
+import contextvars
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps as app_registry
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connection, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper as SqliteDatabaseWrapper
+from django.db.models.signals import post_migrate
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from apis.api_v1 import urls as api_urls
+from apis.api_v1.pagination import encode_cursor
+from apps.app_0.management.commands.bench_db_profile import journal_mode
+from apps.app_0.mod_0 import health, querycheck, telemetry
+from apps.app_0.mod_0.dbrouter import PIN_COOKIE, PrimaryReplicaRouter
+from apps.app_0.mod_0.gencache import bump, generations, get_or_set, make_key, org_ns, site_ns
+from apps.app_0.mod_0.middleware import QueryInspectorMiddleware
+from apps.app_0.mod_0.querycheck import QueryRecorder
+from apps.app_admin.mod_siteadmin.models import Membership, Organization, Role, Site
+from apps.app_admin.mod_useradmin import urls as useradmin_urls
+from apps.app_constructs import delivery
+from apps.app_constructs.flow_metrics import compute as flow_compute, flow_metrics, load_arrays
+from apps.app_constructs.models import Construct, ConstructRollup, ConstructType
+from apps.app_constructs.rollups import TRACKED_FIELDS, compute_rollups
+from apps.app_constructs.synonyms import resolve_construct_type
+from apps.app_organization.mod_organization import urls as orgadmin_urls
+from apps.app_organization.mod_organization.models import OrganizationSection
+from apps.app_organization.mod_reports.builders import BUILDERS, KEEP_SNAPSHOTS, build_all, latest_snapshots
+from apps.app_organization.mod_reports.models import ReportRow, ReportSnapshot
+from apps.app_site.mod_site import events as site_events, urls as siteadmin_urls
+
+
+class Target:
+    """Objects of one generated dataset the URL cases act on."""
+
+    def __init__(self, prefix: str):
+        self.site = Site.objects.filter(slug__startswith=f'{prefix}-').order_by('id').first()
+        orgs = list(self.site.organizations.order_by('id')[:3])
+        self.org, self.orgs = orgs[0], orgs[1:]
+        self.membership = Membership.objects.filter(organization=self.org).order_by('id').first()
+        self.section = OrganizationSection.objects.filter(organization=self.org, tab='business').order_by('id').first()
+        self.sections = list(OrganizationSection.objects.filter(organization=self.org, tab='business', active=True))
+        self.user = get_user_model().objects.filter(username__startswith=f'{prefix}_u').order_by('id').first()
+        build_all(self.org)
+
+    def kwargs(self, keys) -> dict:
+        ids = {
+            'site_id': self.site.pk, 'org_id': self.org.pk, 'membership_id': self.membership.pk,
+            'section_id': self.section.pk, 'user_id': self.user.pk, 'kind': 'membership',
+        }
+        return {key: ids[key] for key in keys}
+
+
+def _tab_edit(t):
+    data = {'tab': 'business'}
+    for sec in t.sections:
+        data[f'sec_{sec.pk}-content'] = sec.content
+    return data
+
+
+def _batch(t):
+    return json.dumps({'operations': [
+        {'op': 'update', 'type': 'organization', 'id': t.org.pk, 'data': {'description': 'batched'}},
+        {'op': 'create', 'type': 'membership',
+         'data': {'site': t.site.pk, 'user': t.user.pk, 'organization': t.orgs[0].pk, 'role': 'orgadmin'}},
+    ]})
+
+
+def _import(t):
+    return 'external_id,parent_external_id,type,name\nqc-1,,Portfolio,P\nqc-2,qc-1,Program,Q\n'
+
+
+# (label, url name, url kwargs, method, query string, data(target) or None, content type, budget)
+# Every URL name of the modules below must appear at least once; budgets are absolute query
+# counts per request on the larger dataset.
+CASES = [
+    # siteadmin
+    ('dashboard', 'siteadmin_dashboard', (), 'get', '', None, None, 8),
+    ('dashboard table', 'siteadmin_dashboard', (), 'get', '?view=table&page_size=all&bin=1', None, None, 8),
+    ('site_detail', 'siteadmin_detail', ('site_id',), 'get', '', None, None, 13),
+    ('site_events', 'siteadmin_site_events', ('site_id',), 'get', '', None, None, 7),
+    ('dashboard_events', 'siteadmin_dashboard_events', (), 'get', '', None, None, 7),
+    ('org_detail', 'siteadmin_org_detail', ('site_id', 'org_id'), 'get', '', None, None, 6),
+    ('org_home', 'siteadmin_org_home', ('site_id', 'org_id'), 'get', '', None, None, 10),
+    ('org_home business', 'siteadmin_org_home', ('site_id', 'org_id'), 'get', '?tab=business', None, None, 7),
+    ('org_home delivery', 'siteadmin_org_home', ('site_id', 'org_id'), 'get', '?tab=delivery', None, None, 10),
+    ('org_home reports', 'siteadmin_org_home', ('site_id', 'org_id'), 'get', '?tab=reports', None, None, 10),
+    ('report_refresh', 'siteadmin_org_report_refresh', ('site_id', 'org_id'), 'post', '', lambda t: {}, None, 23),
+    ('report_csv', 'siteadmin_org_report_csv', ('site_id', 'org_id', 'kind'), 'get', '', None, None, 6),
+    ('org_bulk_admin', 'siteadmin_org_bulk_admin', ('site_id',), 'get', '', None, None, 5),
+    ('org_bulk_admin POST', 'siteadmin_org_bulk_admin', ('site_id',), 'post', '',
+     lambda t: {'user': t.user.pk, 'org_ids': [o.pk for o in t.orgs]}, None, 20),
+    ('org_delete', 'siteadmin_org_delete', ('site_id', 'org_id'), 'post', '', lambda t: {}, None, 6),
+    ('org_restore', 'siteadmin_org_restore', ('site_id', 'org_id'), 'post', '', lambda t: {}, None, 6),
+    ('org_bulk_delete', 'siteadmin_org_bulk_delete', ('site_id',), 'post', '',
+     lambda t: {'ids': [o.pk for o in t.orgs]}, None, 8),
+    ('org_bulk_restore', 'siteadmin_org_bulk_restore', ('site_id',), 'post', '',
+     lambda t: {'ids': [o.pk for o in t.orgs]}, None, 8),
+    ('site_delete', 'siteadmin_site_delete', ('site_id',), 'post', '', lambda t: {}, None, 5),
+    ('site_restore', 'siteadmin_site_restore', ('site_id',), 'post', '', lambda t: {}, None, 5),
+    ('site_bulk_delete', 'siteadmin_site_bulk_delete', (), 'post', '', lambda t: {'ids': [t.site.pk]}, None, 5),
+    ('site_bulk_restore', 'siteadmin_site_bulk_restore', (), 'post', '', lambda t: {'ids': [t.site.pk]}, None, 5),
+    ('site_bulk_permadelete', 'siteadmin_site_bulk_permadelete', (), 'post', '',
+     lambda t: {'ids': [t.site.pk]}, None, 5),
+    ('site_new_modal', 'siteadmin_site_new_modal', (), 'get', '', None, None, 2),
+    ('site_modal', 'siteadmin_site_modal', ('site_id',), 'get', '', None, None, 3),
+    ('org_new_modal', 'siteadmin_org_new_modal', ('site_id',), 'get', '', None, None, 3),
+    ('org_edit_modal', 'siteadmin_org_edit_modal', ('site_id', 'org_id'), 'get', '', None, None, 4),
+    ('membership_new_modal', 'siteadmin_membership_new_modal', ('site_id',), 'get', '', None, None, 6),
+    ('membership_edit_modal', 'siteadmin_membership_edit_modal', ('site_id', 'membership_id'), 'get', '',
+     None, None, 7),
+    ('org_section_modal', 'siteadmin_org_section_modal', ('site_id', 'org_id', 'section_id'), 'get', '',
+     None, None, 7),
+    ('org_type_new_modal', 'siteadmin_org_type_new_modal', ('site_id', 'org_id'), 'get', '', None, None, 4),
+    ('org_type_manage_modal', 'siteadmin_org_type_manage_modal', ('site_id', 'org_id'), 'get', '',
+     None, None, 5),
+    ('org_tab_edit_modal', 'siteadmin_org_tab_edit_modal', ('site_id', 'org_id'), 'get', '?tab=business',
+     None, None, 7),
+    ('org_tab_edit_modal POST', 'siteadmin_org_tab_edit_modal', ('site_id', 'org_id'), 'post', '',
+     _tab_edit, None, 7),
+    ('org_settings_modal', 'siteadmin_org_settings_modal', ('site_id', 'org_id'), 'get', '', None, None, 4),
+    ('membership_delete', 'siteadmin_membership_delete', ('site_id', 'membership_id'), 'post', '',
+     lambda t: {}, None, 6),
+    ('site_permadelete', 'siteadmin_site_permadelete', ('site_id',), 'post', '', lambda t: {}, None, 8),
+    # orgadmin portal
+    ('orgadmin_dashboard', 'orgadmin_dashboard', (), 'get', '', None, None, 4),
+    ('orgadmin_org_home', 'orgadmin_org_home', ('site_id', 'org_id'), 'get', '', None, None, 14),
+    ('orgadmin_org_edit', 'orgadmin_org_edit', ('site_id', 'org_id'), 'get', '', None, None, 24),
+    # useradmin and auth
+    ('register', 'register', (), 'get', '', None, None, 2),
+    ('login', 'login', (), 'get', '', None, None, 2),
+    ('logout', 'logout', (), 'get', '', None, None, 4),
+    ('auth dashboard', 'dashboard', (), 'get', '', None, None, 2),
+    ('profile', 'profile', (), 'get', '', None, None, 2),
+    ('change_password', 'change_password', (), 'get', '', None, None, 2),
+    ('useradmin_list', 'useradmin_list', (), 'get', '', None, None, 3),
+    ('useradmin_create', 'useradmin_create', (), 'get', '', None, None, 2),
+    ('useradmin_edit', 'useradmin_edit', ('user_id',), 'get', '', None, None, 3),
+    ('useradmin_delete', 'useradmin_delete', ('user_id',), 'post', '', lambda t: {}, None, 13),
+    ('useradmin_bulk', 'useradmin_bulk', (), 'get', '', None, None, 4),
+    # API
+    ('api_ping', 'api_ping', (), 'get', '', None, None, 0),
+    ('api_info', 'api_info', (), 'get', '', None, None, 0),
+    ('api_batch', 'api_batch', (), 'post', '', _batch, 'application/json', 16),
+    ('api_changes', 'api_changes', (), 'get', '?limit=50', None, None, 7),
+    ('api_site_list', 'api_site_list', (), 'get', '', None, None, 3),
+    ('api_site_detail', 'api_site_detail', ('pk:site',), 'get', '', None, None, 3),
+    ('api_org_list', 'api_org_list', (), 'get', '?limit=50', None, None, 3),
+    ('api_org_detail', 'api_org_detail', ('pk:org',), 'get', '', None, None, 3),
+    ('api_membership_list', 'api_membership_list', (), 'get', '?limit=50', None, None, 3),
+    ('api_membership_detail', 'api_membership_detail', ('pk:membership',), 'get', '', None, None, 3),
+    ('api_section_list', 'api_section_list', (), 'get', '?limit=50', None, None, 3),
+    ('api_section_detail', 'api_section_detail', ('pk:section',), 'get', '', None, None, 3),
+    ('api_construct_tree', 'api_construct_tree', ('org_id',), 'get', '', None, None, 5),
+    ('api_construct_import', 'api_construct_import', ('org_id',), 'post', '', _import, 'text/csv', 13),
+    ('api_construct_metrics', 'api_construct_metrics', ('org_id',), 'get', '', None, None, 5),
+]
+URL_MODULES = (siteadmin_urls, orgadmin_urls, useradmin_urls, api_urls)
+
+
+def _url(name: str, keys, target: Target) -> str:
+    kwargs = {}
+    for key in keys:
+        if key.startswith('pk:'):
+            obj = {'site': target.site, 'org': target.org, 'membership': target.membership,
+                   'section': target.section}[key[3:]]
+            kwargs['pk'] = obj.pk
+        else:
+            kwargs.update(target.kwargs([key]))
+    return reverse(name, kwargs=kwargs)
+
+
+class QueryScalingTests(TestCase):
+    """Every view runs the same number of queries on a small and a larger generated dataset
+    (O(1) in data size) and stays within its declared budget.
+    """
+    # generate_load_data options; the small set still has the three organizations the cases use
+    SIZES = {'small': {'size': 'small', 'orgs': 3}, 'medium': {'size': 'medium'}}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser('qc-admin', 'qc-admin@example.com', 'qc-pass')
+
+    def run_case(self, target: Target, case) -> QueryRecorder:
+        label, name, keys, method, query, data, content_type, _ = case
+        client = Client()
+        client.force_login(self.admin)
+        url = _url(name, keys, target) + query
+        payload = data(target) if data else None
+        recorder = QueryRecorder(capture_stack=False)
+        # Cold cache: ids repeat between the rolled-back datasets and would hit the other one's entries
+        cache.clear()
+        sid = transaction.savepoint()
+        try:
+            with connection.execute_wrapper(recorder):
+                if method == 'get':
+                    response = client.get(url)
+                elif content_type:
+                    response = client.post(url, payload, content_type=content_type)
+                else:
+                    response = client.post(url, payload)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+        finally:
+            transaction.savepoint_rollback(sid)
+        self.assertLess(response.status_code, 400, f"{label}: HTTP {response.status_code}")
+        return recorder
+
+    def measure(self) -> dict[str, dict[str, QueryRecorder]]:
+        results = {}
+        for size, options in self.SIZES.items():
+            sid = transaction.savepoint()
+            call_command('generate_load_data', prefix=f'qc{size}', stdout=StringIO(), **options)
+            target = Target(f'qc{size}')
+            results[size] = {case[0]: self.run_case(target, case) for case in CASES}
+            transaction.savepoint_rollback(sid)
+        return results
+
+    def test_every_url_has_a_case(self):
+        names = {case[1] for case in CASES}
+        for module in URL_MODULES:
+            for pattern in module.urlpatterns:
+                if isinstance(pattern, URLPattern):
+                    self.assertIn(pattern.name, names, f"{pattern.name} has no query-count case")
+
+    def test_query_counts_are_constant_and_within_budget(self):
+        results = self.measure()
+        (small_size, small), (large_size, large) = results.items()
+        for label, *_, budget in CASES:
+            with self.subTest(label):
+                a, b = small[label], large[label]
+                if a.total != b.total:
+                    grown = [
+                        f"  {a.shapes[shape]} -> {b.shapes[shape]}x {shape}"
+                        for shape in a.shapes | b.shapes if a.shapes[shape] != b.shapes[shape]
+                    ]
+                    self.fail(f"{label}: {a.total} queries on {small_size}, {b.total} on {large_size}\n"
+                              + '\n'.join(grown))
+                if b.total > budget:
+                    shapes = [f"  {count}x {shape}" for shape, count in b.shapes.most_common()]
+                    self.fail(f"{label}: {b.total} queries, budget {budget}\n" + '\n'.join(shapes))
+
+
+class ResourceApiTests(TestCase):
+    """Organizations and memberships under a soft-deleted site or organization are hidden from
+    the list and detail endpoints, as the site itself is.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser('res-admin', 'res-admin@example.com', 'x')
+        role = Role.objects.get(code='member')
+        cls.alive, cls.dead = (Site.objects.create(name=f'Res {n}', slug=f'res-{n}') for n in ('alive', 'dead'))
+        cls.org, cls.dead_site_org, cls.dead_org = (
+            Organization.objects.create(site=site, name=f'Res org {i}', slug=f'res-org-{i}')
+            for i, site in enumerate((cls.alive, cls.dead, cls.alive))
+        )
+        users = [User.objects.create_user(f'res-u{i}', f'res-u{i}@example.com', 'x') for i in range(4)]
+        cls.membership, cls.site_membership, cls.dead_site_membership, cls.dead_org_membership = (
+            Membership.objects.create(user=user, site=site, organization=org, role=role)
+            for user, site, org in zip(users, (cls.alive, cls.alive, cls.dead, cls.alive),
+                                       (cls.org, None, cls.dead_site_org, cls.dead_org))
+        )
+        Site.objects.filter(pk=cls.dead.pk).update(deleted=True)
+        Organization.objects.filter(pk=cls.dead_org.pk).update(deleted=True)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def listed(self, name: str) -> set[int]:
+        return {row['id'] for row in self.client.get(reverse(name), {'limit': 100}).json()['results']}
+
+    def status(self, name: str, obj) -> int:
+        return self.client.get(reverse(name, kwargs={'pk': obj.pk})).status_code
+
+    def test_organizations(self):
+        listed = self.listed('api_org_list')
+        self.assertIn(self.org.pk, listed)
+        self.assertNotIn(self.dead_site_org.pk, listed)
+        self.assertEqual(self.status('api_org_detail', self.org), 200)
+        self.assertEqual(self.status('api_org_detail', self.dead_site_org), 404)
+
+    def test_memberships(self):
+        listed = self.listed('api_membership_list')
+        self.assertLessEqual({self.membership.pk, self.site_membership.pk}, listed)
+        self.assertFalse({self.dead_site_membership.pk, self.dead_org_membership.pk} & listed)
+        for membership, status in ((self.membership, 200), (self.site_membership, 200),
+                                   (self.dead_site_membership, 404), (self.dead_org_membership, 404)):
+            with self.subTest(membership=membership.pk):
+                self.assertEqual(self.status('api_membership_detail', membership), status)
+
+    def test_malformed_cursor_is_a_bad_request(self):
+        for name, order, values in (('api_site_list', 'id', ['abc']), ('api_site_list', 'id', [{'a': 1}]),
+                                    ('api_site_list', 'id', [None]), ('api_site_list', 'id', [True]),
+                                    ('api_site_list', 'id', [2 ** 70]), ('api_org_list', 'name', ['x', 'y']),
+                                    ('api_org_list', 'name', [[1], 1])):
+            with self.subTest(name=name, values=values):
+                response = self.client.get(reverse(name), {'order': order, 'cursor': encode_cursor(values)})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': 'Invalid cursor'})
+
+    def test_fields_limit_the_columns_loaded(self):
+        with CaptureQueriesContext(connection) as captured:
+            rows = self.client.get(reverse('api_membership_list'), {'fields': 'id,role'}).json()['results']
+            detail = self.client.get(reverse('api_membership_detail', kwargs={'pk': self.membership.pk}),
+                                     {'fields': 'user'}).json()
+        self.assertIn({'id': self.membership.pk, 'role': 'member'}, rows)
+        self.assertEqual(detail, {'user': {'id': self.membership.user_id, 'username': 'res-u0',
+                                           'email': 'res-u0@example.com'}})
+        page_sql = [q['sql'] for q in captured.captured_queries if q['sql'].startswith('SELECT "app_admin_membership"')]
+        self.assertEqual(len(page_sql), 2)
+        self.assertNotIn('"email"', page_sql[0])
+        self.assertNotIn('"description"', page_sql[0])
+        self.assertNotIn('"code"', page_sql[1])
+
+
+# Defined in config/settings_test.py: a second database standing in for a replica that has not caught up
+REPLICA = 'replica_test'
+
+
+@override_settings(DATABASE_ROUTERS=['apps.app_0.mod_0.dbrouter.PrimaryReplicaRouter'], DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TestCase):
+    """Reads go to the replica until the request, or the same browser shortly after, writes."""
+    databases = {DEFAULT_DB_ALIAS, REPLICA}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser('rr-admin', 'rr-admin@example.com', 'rr-pass')
+        cls.admin.save(using=REPLICA)  # replicated; the site below is not yet
+        cls.site = Site.objects.create(name='Primary only', slug='primary-only')
+
+    def test_router_pins_reads_to_primary_after_a_write(self):
+        router = PrimaryReplicaRouter()
+
+        def check():
+            self.assertEqual(router.db_for_read(Site), REPLICA)
+            self.assertEqual(router.db_for_read(Session), DEFAULT_DB_ALIAS)
+            self.assertEqual(router.db_for_write(Site), DEFAULT_DB_ALIAS)
+            self.assertEqual(router.db_for_read(Site), DEFAULT_DB_ALIAS)
+
+        contextvars.Context().run(check)
+
+    def test_request_reads_its_own_writes(self):
+        client = Client()
+        client.force_login(self.admin)
+        url = reverse('siteadmin_detail', kwargs={'site_id': self.site.pk})
+        self.assertEqual(client.get(url).status_code, 404)
+
+        response = client.post(reverse('siteadmin_site_new_modal'), {'name': 'Written', 'description': ''})
+        self.assertTrue(response.json()['ok'])
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(client.get(url).status_code, 200)
+
+        del client.cookies[PIN_COOKIE]
+        self.assertEqual(client.get(url).status_code, 404)
+
+
+class GenerationCacheTests(TestCase):
+    """Writes bump the namespaces of their site/organization; cached values follow."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(name='Gen site', slug='gen-site')
+        cls.org = Organization.objects.create(site=cls.site, name='Gen org', slug='gen-org')
+
+    def test_writes_bump_their_owner_namespaces(self):
+        watched = [site_ns(self.site.pk), site_ns(self.site.pk, Organization), org_ns(self.org.pk),
+                   org_ns(self.org.pk, OrganizationSection)]
+        before = generations(watched)
+        OrganizationSection.objects.create(organization=self.org, tab='business', key='k', title='K')
+        after = generations(watched)
+        self.assertEqual(after[site_ns(self.site.pk)], before[site_ns(self.site.pk)])
+        self.assertGreater(after[org_ns(self.org.pk, OrganizationSection)], before[org_ns(self.org.pk, OrganizationSection)])
+
+        # Queryset soft delete bypasses save() and bumps through SoftDeleteQuerySet
+        Organization.objects.filter(pk=self.org.pk).delete()
+        final = generations(watched)
+        self.assertGreater(final[site_ns(self.site.pk, Organization)], after[site_ns(self.site.pk, Organization)])
+
+    def test_get_or_set_recomputes_after_a_bump(self):
+        cache.clear()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        depends_on = [org_ns(self.org.pk, OrganizationSection)]
+        self.assertEqual(get_or_set('t', depends_on, compute), 1)
+        self.assertEqual(get_or_set('t', depends_on, compute), 1)
+        bump(site_ns(self.site.pk, Membership))
+        self.assertEqual(get_or_set('t', depends_on, compute), 1)
+        bump(*depends_on)
+        self.assertEqual(get_or_set('t', depends_on, compute), 2)
+
+    def test_stale_entry_is_served_while_another_caller_refreshes(self):
+        cache.clear()
+        self.assertEqual(get_or_set('swr', (), lambda: 'old', soft_ttl=0), 'old')
+        lock_key = f"{make_key('swr', ())}:lock"
+        cache.add(lock_key, 1)
+        self.assertEqual(get_or_set('swr', (), lambda: 'new', soft_ttl=0), 'old')
+        cache.delete(lock_key)
+        self.assertEqual(get_or_set('swr', (), lambda: 'new', soft_ttl=0), 'new')
+
+    def test_concurrent_misses_compute_once(self):
+        cache.clear()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: get_or_set('burst', (), compute), range(4)))
+        self.assertEqual(results, ['value'] * 4)
+        self.assertEqual(len(calls), 1)
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies', AUTH_USER_CACHE_SECONDS=60)
+class CachedSessionTests(TestCase):
+    """Signed-cookie sessions with the cached user: a warm request reads neither django_session
+    nor auth_user, and login, logout and password changes behave as with the database lookups.
+    """
+    PASSWORD = 'Cs#pass-1'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('cs-user', 'cs-user@example.com', cls.PASSWORD)
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self) -> Client:
+        client = Client()
+        response = client.post(reverse('login'), {'username': 'cs-user', 'password': self.PASSWORD})
+        self.assertEqual(response.status_code, 302)
+        return client
+
+    def auth_queries(self, client: Client, url: str):
+        recorder = QueryRecorder(capture_stack=False)
+        with connection.execute_wrapper(recorder):
+            response = client.get(url)
+        count = sum(n for shape, n in recorder.shapes.items() if 'django_session' in shape or '"auth_user"' in shape)
+        return count, response
+
+    def test_warm_request_skips_session_and_user_queries(self):
+        client = self.login()
+        self.auth_queries(client, reverse('dashboard'))
+        count, response = self.auth_queries(client, reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(count, 0)
+
+    def test_password_change_keeps_this_session_and_ends_the_others(self):
+        client, other = self.login(), self.login()
+        for c in (client, other):
+            self.assertEqual(c.get(reverse('dashboard')).status_code, 200)
+        response = client.post(reverse('change_password'), {
+            'old_password': self.PASSWORD, 'new_password1': 'Cs#pass-2x', 'new_password2': 'Cs#pass-2x',
+        })
+        self.assertRedirects(response, reverse('profile'), fetch_redirect_response=False)
+        self.assertEqual(client.get(reverse('dashboard')).status_code, 200)
+        self.assertEqual(other.get(reverse('dashboard')).status_code, 302)
+
+    def test_logout_ends_the_session(self):
+        client = self.login()
+        self.assertEqual(client.get(reverse('dashboard')).status_code, 200)
+        client.get(reverse('logout'))
+        self.assertEqual(client.get(reverse('dashboard')).status_code, 302)
+
+
+class SqlitePragmaTests(TestCase):
+    """SQLITE_PRAGMAS are applied to every new connection."""
+
+    PRAGMAS = {'journal_mode': 'wal', 'synchronous': 'normal', 'busy_timeout': 4321, 'foreign_keys': 'on'}
+
+    def test_fresh_connection_reads_back_the_pragmas(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(SQLITE_PRAGMAS=self.PRAGMAS):
+            fresh = SqliteDatabaseWrapper({**connection.settings_dict, 'NAME': str(Path(tmp) / 'pragmas.sqlite3')},
+                                          alias='pragma_test')
+            try:
+                with fresh.cursor() as cursor:
+                    found = {name: cursor.execute(f'PRAGMA {name}').fetchone()[0] for name in self.PRAGMAS}
+            finally:
+                fresh.close()
+        # synchronous=normal reads back as 1
+        self.assertEqual(found, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 4321, 'foreign_keys': 1})
+
+    def test_bench_db_profile_restores_the_journal_mode(self):
+        def run_profiles(db_path, options):
+            journal_mode(db_path, 'wal')
+            raise CommandError('loadtest failed')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / 'bench.sqlite3')
+            self.assertEqual(journal_mode(path), 'delete')
+            module = 'apps.app_0.management.commands.bench_db_profile'
+            with mock.patch(f'{module}.connection', vendor='sqlite', settings_dict={'NAME': path}), \
+                    mock.patch(f'{module}.Command.run_profiles', side_effect=run_profiles), \
+                    self.assertRaises(CommandError):
+                call_command('bench_db_profile')
+            self.assertEqual(journal_mode(path), 'delete')
+
+
+class StartupTests(TestCase):
+    """Process start does no database work: roles come from a data migration."""
+
+    def test_roles_are_seeded_by_migration(self):
+        self.assertEqual(set(Role.objects.values_list('code', flat=True)), {'siteadmin', 'orgadmin', 'member'})
+
+    def test_ready_runs_no_queries(self):
+        recorder = QueryRecorder(capture_stack=False)
+        with connection.execute_wrapper(recorder):
+            for config in app_registry.get_app_configs():
+                if config.name.startswith('apps.'):
+                    config.ready()
+        self.assertEqual(recorder.total, 0)
+
+
+@override_settings(HEALTH_MIGRATIONS_TTL=300, HEALTH_MIGRATIONS_RETRY_TTL=5)
+class MigrationStatusTests(TestCase):
+    """The cached readiness status: a clean result is reused for the full TTL, pending ones are
+    re-read after the retry TTL, and a migrate in this process drops the cache.
+    """
+
+    def setUp(self):
+        self.addCleanup(health.invalidate)
+
+    def cache(self, pending, age: float):
+        health._status = {'pending': pending, 'error': None, 'checked_at': time.time() - age}
+
+    def test_clean_result_is_reused(self):
+        self.cache([], 60)
+        self.assertIs(health.migration_status(), health._status)
+        self.assertGreaterEqual(time.time() - health.migration_status()['checked_at'], 60)
+
+    def test_pending_result_is_rechecked_after_retry_ttl(self):
+        self.cache(['app_0.9999_stale'], 1)
+        self.assertEqual(health.migration_status()['pending'], ['app_0.9999_stale'])
+        self.cache(['app_0.9999_stale'], 10)
+        self.assertEqual(health.migration_status()['pending'], [])
+
+    def test_post_migrate_drops_cached_status(self):
+        self.cache(['app_0.9999_stale'], 0)
+        config = app_registry.get_app_config('app_0')
+        post_migrate.send(sender=config, app_config=config, verbosity=0, interactive=False,
+                          using=DEFAULT_DB_ALIAS, apps=app_registry, plan=[])
+        self.assertEqual(health.migration_status()['pending'], [])
+
+
+class TenantIndexTests(TestCase):
+    """EXPLAIN of the hot tenant-scoped queries: each searches its (partial) composite index,
+    and the ordered reads need no separate sort step.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(name='Tenant site', slug='tenant-site')
+        cls.org = Organization.objects.create(site=cls.site, name='Tenant org', slug='tenant-org')
+        cls.role = Role.objects.get(code='orgadmin')
+
+    def assertUsesIndex(self, qs, index: str, sorted_by_index: bool = False):
+        plan = qs.explain()
+        self.assertIn(f'USING INDEX {index}', plan)
+        if sorted_by_index:
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_site_organizations(self):
+        self.assertUsesIndex(Organization.objects.for_site(self.site).order_by('name'),
+                             'org_site_name_alive', sorted_by_index=True)
+        self.assertUsesIndex(Organization.all_objects.dead().for_site(self.site).order_by('name'),
+                             'org_site_name_deleted', sorted_by_index=True)
+
+    def test_site_and_organization_memberships(self):
+        self.assertUsesIndex(Membership.objects.for_site(self.site).filter(
+            organization__isnull=True, role=self.role, active=True), 'membership_site_org_role')
+        self.assertUsesIndex(Membership.objects.for_site(self.site).for_organization(self.org).filter(active=True),
+                             'membership_site_org_role')
+
+    def test_construct_tree(self):
+        self.assertUsesIndex(Construct.objects.for_organization(self.org).order_by('parent_id', 'position', 'id'),
+                             'construct_org_parent_pos', sorted_by_index=True)
+        self.assertUsesIndex(Construct.objects.for_organization(self.org).filter(parent_id=1).order_by('position'),
+                             'construct_org_parent_pos', sorted_by_index=True)
+
+
+class ConstructRollupTests(TestCase):
+    """Incrementally maintained rollups equal a from-scratch compute_rollups() after every kind of write."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(name='Rollup site', slug='rollup-site')
+        cls.org = Organization.objects.create(site=cls.site, name='Rollup org', slug='rollup-org')
+        cls.epic = ConstructType.objects.create(name='Rollup epic', code='rollup-epic')
+        cls.story = ConstructType.objects.create(name='Rollup story', code='rollup-story')
+
+    def setUp(self):
+        now = timezone.now()
+        self.root = self.add('root', None, self.epic)
+        self.a = self.add('a', self.root, self.epic, done=True, completed_at=now - timedelta(days=5))
+        self.b = self.add('b', self.root, self.epic, blocked=True)
+        self.a1 = self.add('a1', self.a, self.story, done=True, completed_at=now - timedelta(days=1))
+        self.a2 = self.add('a2', self.a1, self.story, approved=True)
+        self.b1 = self.add('b1', self.b, self.story, done=True, completed_at=now - timedelta(days=3))
+
+    def add(self, name, parent, ctype, **fields) -> Construct:
+        return Construct.objects.create(site=self.site, organization=self.org, parent=parent, type=ctype,
+                                        name=name, **fields)
+
+    def assertRollupsMatch(self):
+        rows = Construct.all_objects.filter(organization=self.org).values('id', *TRACKED_FIELDS)
+        expected = {
+            pk: (c.count, c.types, c.done, c.blocked, c.approved, c.latest)
+            for pk, c in compute_rollups(rows).items()
+        }
+        stored = {
+            r.construct_id: (r.descendant_count, r.type_counts, r.done_count, r.blocked_count, r.approved_count,
+                             r.latest_completed_at)
+            for r in ConstructRollup.objects.filter(construct__organization=self.org)
+        }
+        self.assertEqual(stored, expected)
+
+    def test_create(self):
+        self.assertRollupsMatch()
+        self.assertEqual(ConstructRollup.objects.get(pk=self.root.pk).descendant_count, 5)
+
+    def test_reparent_moves_the_subtree(self):
+        self.a1.parent = self.b
+        self.a1.save()
+        self.assertRollupsMatch()
+
+    def test_soft_delete_and_restore(self):
+        self.a.delete()
+        self.assertRollupsMatch()
+        self.assertEqual(ConstructRollup.objects.get(pk=self.root.pk).descendant_count, 2)
+        self.a.deleted = False
+        self.a.active = True
+        self.a.save(update_fields=['deleted', 'active', 'updated_at'])
+        self.assertRollupsMatch()
+
+    def test_completed_at_decrease_recomputes_the_latest(self):
+        self.a1.completed_at = timezone.now() - timedelta(days=30)
+        self.a1.save()
+        self.assertRollupsMatch()
+        self.assertEqual(ConstructRollup.objects.get(pk=self.root.pk).latest_completed_at, self.b1.completed_at)
+
+    def test_hard_delete(self):
+        self.a.hard_delete()
+        self.assertRollupsMatch()
+        self.assertFalse(Construct.all_objects.filter(pk=self.a2.pk).exists())
+
+    def test_rebuild_command(self):
+        ConstructRollup.objects.filter(construct__organization=self.org).update(
+            descendant_count=99, type_counts={}, latest_completed_at=None,
+        )
+        call_command('rebuild_construct_rollups', org=self.org.pk, stdout=StringIO())
+        self.assertRollupsMatch()
+
+
+class ConstructImportTests(TestCase):
+    """Imports need org or site admin rights; external ids are unique per organization."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.site = Site.objects.create(name='Import site', slug='import-site')
+        cls.org = Organization.objects.create(site=cls.site, name='Import org', slug='import-org')
+        cls.other = Organization.objects.create(site=cls.site, name='Import other', slug='import-other')
+        cls.type = ConstructType.objects.create(name='Import epic', code='import-epic')
+        cls.users = {}
+        for code in ('member', 'orgadmin'):
+            cls.users[code] = User.objects.create_user(f'import-{code}', f'import-{code}@example.com', 'x')
+            Membership.objects.create(user=cls.users[code], site=cls.site, organization=cls.org,
+                                      role=Role.objects.get(code=code))
+
+    def post(self, user, body='external_id,parent_external_id,type,name\nimp-1,,Import epic,One\n'):
+        self.client.force_login(user)
+        return self.client.post(reverse('api_construct_import', args=[self.org.pk]), body, content_type='text/csv')
+
+    def test_requires_admin_rights(self):
+        self.assertEqual(self.post(self.users['member']).status_code, 403)
+        response = self.post(self.users['orgadmin'])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(Construct.objects.filter(organization=self.org, external_id='imp-1').exists())
+
+    def test_external_id_unique_per_organization(self):
+        def create(org, external_id):
+            return Construct.objects.create(site=self.site, organization=org, type=self.type, name=external_id,
+                                            external_id=external_id)
+        create(self.org, 'dup')
+        create(self.other, 'dup')
+        create(self.org, '')
+        create(self.org, '')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            create(self.org, 'dup')
+
+    def test_deleted_constructs_are_not_parents(self):
+        live = Construct.objects.create(site=self.site, organization=self.org, type=self.type, name='Live',
+                                        external_id='live')
+        gone = Construct.objects.create(site=self.site, organization=self.org, type=self.type, name='Gone',
+                                        external_id='gone')
+        gone.delete()
+        body = ('external_id,parent_external_id,type,name\n'
+                'under-gone,gone,Import epic,A\ngone,,Import epic,B\nunder-live,live,Import epic,C\n')
+        response = self.post(self.users['orgadmin'], body)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], [
+            {'row': 1, 'error': "Parent 'gone' is deleted"},
+            {'row': 2, 'error': "external_id 'gone' belongs to a deleted construct"},
+        ])
+
+        response = self.post(self.users['orgadmin'], 'under-live,live,Import epic,C\n')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Construct.objects.get(organization=self.org, external_id='under-live').parent, live)
+
+
+class ConstructSynonymTests(TestCase):
+    """A term a type gives up (edit, soft or hard delete) resolves to the next type listing it."""
+
+    def setUp(self):
+        self.program = ConstructType.objects.create(name='Syn program', code='syn-program', synonyms='ART, Train',
+                                                    position=1)
+        self.train = ConstructType.objects.create(name='Syn train', code='syn-train', synonyms='art', position=2)
+        self.solution = ConstructType.objects.create(name='Syn solution', code='syn-solution', synonyms=' art ',
+                                                     position=3)
+
+    def test_edit_releases_terms(self):
+        self.assertEqual(resolve_construct_type('ART'), self.program)
+        self.program.synonyms = 'Train'
+        self.program.save()
+        self.assertEqual(resolve_construct_type('art'), self.train)
+
+    def test_soft_delete_and_restore(self):
+        self.program.delete()
+        self.assertEqual(resolve_construct_type('ART'), self.train)
+        self.train.delete()
+        self.assertEqual(resolve_construct_type('ART'), self.solution)
+        self.assertIsNone(resolve_construct_type('Syn program'))
+        # Restoring does not take a term back from its current holder
+        self.program.deleted = False
+        self.program.save()
+        self.assertEqual(resolve_construct_type('ART'), self.solution)
+        self.assertEqual(resolve_construct_type('Syn program'), self.program)
+
+    def test_hard_delete_releases_terms(self):
+        self.program.hard_delete()
+        self.assertEqual(resolve_construct_type('ART'), self.train)
+
+
+class QueryInspectorTests(TestCase):
+    """SQL shapes; QueryInspectorMiddleware flags an N+1 loop (raise or log) and passes a clean view."""
+
+    CONFIG = {'ENABLED': True, 'REPEAT_THRESHOLD': 5, 'CAPTURE_STACK': True}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sites = [Site.objects.create(name=f'QI site {i}', slug=f'qi-site-{i}') for i in range(6)]
+
+    def test_normalize(self):
+        self.assertEqual(
+            querycheck.normalize('SELECT "a"\n  FROM "t" WHERE "id" = 12 AND "name" = \'it\'\'s\' AND "x" IN (%s, %s, %s)'),
+            'SELECT "a" FROM "t" WHERE "id" = ? AND "name" = ? AND "x" IN (...)',
+        )
+        self.assertEqual(querycheck.normalize('SELECT * FROM "t" WHERE "id" IN (?, ?)'),
+                         querycheck.normalize('SELECT * FROM "t" WHERE "id" IN (?)'))
+
+    def n_plus_one(self, request):
+        for site in self.sites:
+            Site.objects.get(pk=site.pk)
+        return HttpResponse('ok')
+
+    def clean(self, request):
+        list(Site.objects.filter(pk__in=[site.pk for site in self.sites]))
+        return HttpResponse('ok')
+
+    def call(self, view, **config):
+        with override_settings(QUERY_INSPECTOR={**self.CONFIG, **config}):
+            middleware = QueryInspectorMiddleware(view)
+        request = RequestFactory().get('/')
+        request.resolver_match = mock.Mock(view_name='qi_view')
+        return middleware(request)
+
+    def test_n_plus_one_raises(self):
+        with self.assertRaisesMessage(querycheck.QueryBudgetExceeded, 'qi_view: likely N+1, 6x SELECT'):
+            self.call(self.n_plus_one, ACTION='raise')
+
+    def test_n_plus_one_logs_with_stack(self):
+        with self.assertLogs('jivapms.queries', 'WARNING') as logs:
+            response = self.call(self.n_plus_one, ACTION='log')
+        self.assertEqual(response['X-Query-Count'], '6')
+        self.assertIn('likely N+1, 6x', logs.output[0])
+        self.assertIn('in n_plus_one', logs.output[0])
+
+    def test_budget(self):
+        with self.assertRaisesMessage(querycheck.QueryBudgetExceeded, 'qi_view: 1 queries, budget 0'):
+            self.call(self.clean, ACTION='raise', BUDGETS={'qi_view': 0})
+
+    def test_clean_view_passes(self):
+        with self.assertNoLogs('jivapms.queries'):
+            response = self.call(self.clean, ACTION='raise', DEFAULT_BUDGET=1)
+        self.assertEqual(response['X-Query-Count'], '1')
+
+    def test_disabled(self):
+        with override_settings(QUERY_INSPECTOR={'ENABLED': False}), self.assertRaises(MiddlewareNotUsed):
+            QueryInspectorMiddleware(self.clean)
+
+
+class ReportSnapshotTests(TestCase):
+    """build_all() stores one snapshot per kind with its rows; the views stream and refresh them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.site = Site.objects.create(name='Report site', slug='report-site')
+        cls.org = Organization.objects.create(site=cls.site, name='Report org', slug='report-org')
+        cls.admin = User.objects.create_superuser('report-admin', 'report-admin@example.com', 'x')
+        cls.outsider = User.objects.create_user('report-outsider', 'report-outsider@example.com', 'x')
+        cls.role = Role.objects.get(code='member')
+        for i, active in enumerate([True, True, False]):
+            user = User.objects.create_user(f'report-u{i}', f'report-u{i}@example.com', 'x')
+            Membership.objects.create(user=user, site=cls.site, organization=cls.org, role=cls.role, active=active)
+        OrganizationSection.objects.create(organization=cls.org, tab='business', key='a', title='A', content='Filled')
+        OrganizationSection.objects.create(organization=cls.org, tab='business', key='b', title='B')
+        ctype = ConstructType.objects.create(name='Report type', code='report-type')
+        Construct.objects.create(site=cls.site, organization=cls.org, type=ctype, name='Done', done=True)
+        Construct.objects.create(site=cls.site, organization=cls.org, type=ctype, name='Blocked', blocked=True)
+
+    def rows(self, snapshot):
+        return list(snapshot.rows.values_list('values', flat=True))
+
+    def test_build_all_stores_rows(self):
+        snapshots = {snap.kind: snap for snap in build_all(self.org)}
+        self.assertEqual(set(snapshots), set(BUILDERS))
+        membership, sections, constructs = snapshots['membership'], snapshots['sections'], snapshots['constructs']
+        self.assertEqual(membership.columns, ['Role', 'Active', 'Inactive', 'Total'])
+        self.assertEqual(self.rows(membership), [[self.role.label, 2, 1, 3]])
+        self.assertEqual(sections.row_count, len(OrganizationSection.TAB_CHOICES))
+        self.assertIn(['Business', 2, 1, 1, 50], self.rows(sections))
+        self.assertEqual(self.rows(constructs), [['Report type', 2, 1, 1, 1, 0, '']])
+        self.assertEqual(latest_snapshots(self.org), snapshots)
+
+    def test_keeps_recent_snapshots_only(self):
+        for _ in range(KEEP_SNAPSHOTS + 2):
+            build_all(self.org, kinds=['membership'])
+        self.assertEqual(ReportSnapshot.objects.filter(organization=self.org, kind='membership').count(), KEEP_SNAPSHOTS)
+        self.assertEqual(ReportRow.objects.filter(snapshot__organization=self.org).count(), KEEP_SNAPSHOTS)
+
+    def test_csv_and_refresh_views(self):
+        csv_url = reverse('siteadmin_org_report_csv', args=[self.site.pk, self.org.pk, 'membership'])
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(csv_url).status_code, 404)
+
+        response = self.client.post(reverse('siteadmin_org_report_refresh', args=[self.site.pk, self.org.pk]))
+        self.assertEqual(response.status_code, 302)
+        response = self.client.get(csv_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content).decode().splitlines(),
+                         ['Role,Active,Inactive,Total', f'{self.role.label},2,1,3'])
+        self.assertEqual(self.client.get(
+            reverse('siteadmin_org_report_csv', args=[self.site.pk, self.org.pk, 'unknown'])).status_code, 404)
+
+        self.client.force_login(self.outsider)
+        self.assertEqual(self.client.get(csv_url).status_code, 403)
+
+    def test_admin_is_registered(self):
+        self.assertTrue(admin.site.is_registered(ReportSnapshot))
+
+
+class DeliveryTabTests(TestCase):
+    """The cached Delivery tab is rebuilt after construct writes and construct type renames."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(name='Delivery site', slug='delivery-site')
+        cls.org = Organization.objects.create(site=cls.site, name='Delivery org', slug='delivery-org')
+        cls.type = ConstructType.objects.create(name='Release', code='release')
+        cls.item = Construct.objects.create(site=cls.site, organization=cls.org, type=cls.type, name='R1')
+
+    def setUp(self):
+        cache.clear()
+
+    def tab(self):
+        with mock.patch('apps.app_constructs.delivery.build_delivery_sections',
+                        wraps=delivery.build_delivery_sections) as build:
+            result = delivery.delivery_tab(self.org)
+        return result, build.call_count
+
+    def test_cache_hit_and_invalidation(self):
+        first, builds = self.tab()
+        self.assertEqual((first['toc'], builds), ([('release', 'Release')], 1))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.tab(), (first, 0))
+
+        self.item.name = 'R1 renamed'
+        self.item.save()
+        after_save, builds = self.tab()
+        self.assertEqual(builds, 1)
+        self.assertIn('R1 renamed', after_save['html'])
+
+        self.type.name = 'Increment'
+        self.type.save()
+        after_rename, builds = self.tab()
+        self.assertEqual((after_rename['toc'], builds), ([('increment', 'Increment')], 1))
+        self.assertIn('Increment', after_rename['html'])
+        self.assertNotIn('Release', after_rename['html'])
+
+
+class FlowMetricsTests(TestCase):
+    """load_arrays()/compute() on a fixed tree with known cycle times, checked against a plain
+    Python reference; NumPy missing; an empty organization; 100k constructs.
+    """
+    NOW = datetime(2026, 10, 14, 12, tzinfo=dt_timezone.utc)  # a Wednesday
+    CYCLES = [1, 2, 3, 4, 10]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(name='Flow site', slug='flow-site')
+        cls.org = Organization.objects.create(site=cls.site, name='Flow org', slug='flow-org')
+        cls.empty = Organization.objects.create(site=cls.site, name='Flow empty', slug='flow-empty')
+        cls.type = ConstructType.objects.create(name='Flow item', code='flow-item')
+        cls.root = cls.add('root', None, -30)
+        for i, days in enumerate(cls.CYCLES):
+            # One is finished through done_at only
+            cls.add(f'c{i}', cls.root, -20, done=True, **{'done_at' if i == 1 else 'completed_at': cls.day(-20 + days)})
+        cls.add('backwards', cls.root, -5, done=True, completed_at=cls.day(-6))
+        cls.add('blocked', cls.root, -3, blocked=True, blocked_count=2)
+        cls.add('other', None, -2)
+
+    @classmethod
+    def day(cls, offset: float) -> datetime:
+        return cls.NOW + timedelta(days=offset)
+
+    @classmethod
+    def add(cls, name, parent, created: float, **fields) -> Construct:
+        obj = Construct.objects.create(site=cls.site, organization=cls.org, parent=parent, type=cls.type,
+                                       name=name, **fields)
+        Construct.all_objects.filter(pk=obj.pk).update(created_at=cls.day(created))
+        return obj
+
+    def metrics(self, org=None, root_id=None) -> dict:
+        return flow_compute(load_arrays(org or self.org, root_id=root_id), weeks=12, now=self.NOW.timestamp())
+
+    def reference(self, root_id=None) -> dict:
+        rows = list(Construct.objects.filter(organization=self.org).values(
+            'id', 'parent_id', 'created_at', 'done', 'done_at', 'completed_at', 'blocked'))
+        if root_id is not None:
+            keep = {root_id}
+            for _ in rows:
+                keep |= {r['id'] for r in rows if r['parent_id'] in keep}
+            rows = [r for r in rows if r['id'] in keep]
+        for r in rows:
+            r['finished'] = r['completed_at'] or (r['done_at'] if r['done'] else None)
+        cycles = sorted((r['finished'] - r['created_at']).total_seconds() / 86400
+                        for r in rows if r['finished'] and r['finished'] >= r['created_at'])
+        monday = (self.NOW - timedelta(days=self.NOW.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+        weeks = [monday - timedelta(weeks=11 - n) for n in range(12)]
+        quantiles = statistics.quantiles(cycles, n=100, method='inclusive')
+        return {
+            'total': len(rows),
+            'finished': sum(1 for r in rows if r['finished']),
+            'weeks': [{
+                'week': start.date().isoformat(),
+                'throughput': sum(1 for r in rows if r['finished'] and start <= r['finished'] < start + timedelta(weeks=1)),
+                'wip': (sum(1 for r in rows if r['created_at'] < start + timedelta(weeks=1))
+                        - sum(1 for r in rows if r['finished'] and r['finished'] < start + timedelta(weeks=1))),
+            } for start in weeks],
+            'cycle_time_days': {f'p{p}': round(quantiles[p - 1], 1) for p in (50, 75, 85, 95)},
+            'cycle_time_mean_days': round(statistics.mean(cycles), 1),
+        }
+
+    def test_known_values(self):
+        metrics = self.metrics()
+        self.assertEqual(metrics['cycle_time_days'], {'p50': 3.0, 'p75': 4.0, 'p85': 6.4, 'p95': 8.8})
+        self.assertEqual(metrics['cycle_time_mean_days'], 4.0)
+        self.assertEqual((metrics['total'], metrics['finished'], metrics['open']), (9, 6, 3))
+        self.assertEqual(metrics['blocked_open_ratio'], 0.333)
+        self.assertEqual(metrics['ever_blocked_ratio'], 0.111)
+        self.assertEqual(metrics['blocked_events_mean'], 0.22)
+
+    def test_matches_reference(self):
+        for root_id in (None, self.root.pk):
+            with self.subTest(root_id=root_id):
+                metrics, expected = self.metrics(root_id=root_id), self.reference(root_id)
+                self.assertEqual({k: metrics[k] for k in expected}, expected)
+        self.assertEqual(self.metrics(root_id=self.root.pk)['total'], 8)
+
+    def test_empty_organization(self):
+        metrics = self.metrics(self.empty)
+        self.assertEqual((metrics['total'], metrics['finished'], metrics['open']), (0, 0, 0))
+        self.assertEqual(set(metrics['cycle_time_days'].values()), {None})
+        self.assertIsNone(metrics['cycle_time_mean_days'])
+        self.assertEqual({(w['throughput'], w['wip']) for w in metrics['weeks']}, {(0, 0)})
+
+    def test_without_numpy(self):
+        self.client.force_login(get_user_model().objects.create_superuser('flow-admin', 'flow@example.com', 'x'))
+        with mock.patch('apps.app_constructs.flow_metrics._numpy', return_value=None):
+            self.assertIsNone(flow_metrics(self.org))
+            response = self.client.get(reverse('api_construct_metrics', args=[self.org.pk]))
+        self.assertEqual(response.status_code, 501)
+
+    def test_100k_constructs_under_a_second(self):
+        created = self.day(-100)
+        Construct.objects.bulk_create(
+            (Construct(site=self.site, organization=self.empty, type=self.type, name=f'n{i}', created_at=created,
+                       done=i % 2 == 0, completed_at=created + timedelta(hours=i % 1000) if i % 2 == 0 else None)
+             for i in range(100_000)),
+            batch_size=5000,
+        )
+        start = time.perf_counter()
+        metrics = self.metrics(self.empty)
+        elapsed = time.perf_counter() - start
+        self.assertEqual((metrics['total'], metrics['finished']), (100_000, 50_000))
+        self.assertLess(elapsed, 1.0)
+
+
+class BatchApiTests(TestCase):
+    """POST /api/v1/batch/: per-operation results, and nothing is written unless every operation is valid."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.site = Site.objects.create(name='Batch site', slug='batch-site')
+        cls.other_site = Site.objects.create(name='Batch other', slug='batch-other')
+        cls.org = Organization.objects.create(site=cls.site, name='Batch org', slug='batch-org')
+        cls.other_org = Organization.objects.create(site=cls.other_site, name='Other org', slug='other-org')
+        cls.gone = Organization.objects.create(site=cls.site, name='Gone', slug='gone')
+        cls.gone.delete()
+        cls.admin = User.objects.create_user('batch-admin', 'batch-admin@example.com', 'x')
+        cls.member = User.objects.create_user('batch-member', 'batch-member@example.com', 'x')
+        Membership.objects.create(user=cls.admin, site=cls.site, role=Role.objects.get(code='siteadmin'))
+
+    def post(self, *operations):
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('api_batch'), json.dumps({'operations': list(operations)}),
+                                    content_type='application/json')
+        return response, response.json()
+
+    def assertRejected(self, response, body, failing: dict):
+        """400, errors on the `failing` indexes ({index: message fragment}), the others aborted."""
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(body['ok'])
+        for result in body['results']:
+            self.assertFalse(result['ok'])
+            if result['index'] in failing:
+                self.assertIn(failing[result['index']], ' '.join(result['errors']))
+            else:
+                self.assertEqual(result['errors'], ['batch aborted'])
+
+    def test_valid_batch_is_applied(self):
+        membership = Membership.objects.create(user=self.member, site=self.site, organization=self.org,
+                                               role=Role.objects.get(code='member'))
+        response, body = self.post(
+            {'op': 'create', 'type': 'organization', 'data': {'site': self.site.pk, 'name': 'Batch new'}},
+            {'op': 'update', 'type': 'organization', 'id': self.org.pk, 'data': {'name': 'Batch renamed'}},
+            {'op': 'create', 'type': 'membership',
+             'data': {'site': self.site.pk, 'user': self.member.pk, 'organization': self.org.pk, 'role': 'orgadmin'}},
+            {'op': 'delete', 'type': 'membership', 'id': membership.pk},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['ok'] for r in body['results']], [True] * 4)
+        created = Organization.objects.get(pk=body['results'][0]['id'])
+        self.assertEqual((created.site_id, created.name, created.slug), (self.site.pk, 'Batch new', 'batch-new'))
+        self.org.refresh_from_db()
+        self.assertEqual(self.org.name, 'Batch renamed')
+        self.assertEqual(Membership.objects.get(pk=body['results'][2]['id']).role.code, 'orgadmin')
+        self.assertTrue(Membership.all_objects.get(pk=membership.pk).deleted)
+
+    def test_duplicate_ids(self):
+        response, body = self.post(
+            {'op': 'update', 'type': 'organization', 'id': self.org.pk, 'data': {'name': 'First'}},
+            {'op': 'delete', 'type': 'organization', 'id': self.org.pk},
+        )
+        self.assertRejected(response, body, {1: 'appears more than once'})
+        self.org.refresh_from_db()
+        self.assertEqual((self.org.name, self.org.deleted), ('Batch org', False))
+
+    def test_name_of_a_soft_deleted_organization_is_taken(self):
+        response, body = self.post(
+            {'op': 'create', 'type': 'organization', 'data': {'site': self.site.pk, 'name': 'Gone'}},
+        )
+        self.assertRejected(response, body, {0: 'already exists'})
+        self.assertEqual(Organization.all_objects.filter(site=self.site, name='Gone').count(), 1)
+
+    def test_membership_organization_must_belong_to_the_site(self):
+        response, body = self.post(
+            {'op': 'create', 'type': 'membership', 'data': {
+                'site': self.site.pk, 'user': self.member.pk, 'organization': self.other_org.pk, 'role': 'member'}},
+        )
+        self.assertRejected(response, body, {0: 'not found in this site'})
+        self.assertFalse(Membership.all_objects.filter(user=self.member).exists())
+
+    def test_forbidden_site(self):
+        response, body = self.post(
+            {'op': 'create', 'type': 'organization', 'data': {'site': self.other_site.pk, 'name': 'Intruder'}},
+            {'op': 'update', 'type': 'organization', 'id': self.other_org.pk, 'data': {'name': 'Hijacked'}},
+        )
+        self.assertRejected(response, body, {0: 'Forbidden', 1: 'Forbidden'})
+        self.assertFalse(Organization.all_objects.filter(name__in=['Intruder', 'Hijacked']).exists())
+
+    def test_one_bad_operation_writes_nothing(self):
+        orgs_before = list(Organization.all_objects.order_by('id').values_list('id', 'name', 'deleted'))
+        response, body = self.post(
+            {'op': 'create', 'type': 'organization', 'data': {'site': self.site.pk, 'name': 'Batch new'}},
+            {'op': 'update', 'type': 'organization', 'id': self.org.pk, 'data': {'name': 'Batch renamed'}},
+            {'op': 'create', 'type': 'membership',
+             'data': {'site': self.site.pk, 'user': self.member.pk, 'role': 'member'}},
+            {'op': 'create', 'type': 'membership', 'data': {'site': self.site.pk, 'user': self.member.pk, 'role': 'boss'}},
+        )
+        self.assertRejected(response, body, {3: "Unknown role 'boss'"})
+        self.assertEqual(list(Organization.all_objects.order_by('id').values_list('id', 'name', 'deleted')), orgs_before)
+        self.assertFalse(Membership.all_objects.filter(user=self.member).exists())
+
+    def test_malformed_data_on_delete(self):
+        response, body = self.post(
+            {'op': 'delete', 'type': 'organization', 'id': self.org.pk, 'data': [1]},
+            {'op': 'delete', 'type': 'membership', 'id': 1, 'data': 'x'},
+            {'op': 'delete', 'type': 'organization', 'id': self.other_org.pk, 'data': {}},
+        )
+        self.assertRejected(response, body, {0: 'data must be an object', 1: 'data must be an object',
+                                             2: 'Forbidden'})
+        self.assertFalse(Organization.all_objects.get(pk=self.org.pk).deleted)
+
+
+class ChangeFeedTests(TestCase):
+    """Paging /api/v1/changes/ while rows change between pages: every row's latest state is
+    delivered, ties on updated_at are neither skipped nor repeated, and soft deletes arrive as
+    tombstones once they are older than SETTLE_SECONDS.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser('feed-admin', 'feed-admin@example.com', 'x')
+        cls.site = Site.objects.create(name='Feed site', slug='feed-site')
+        cls.orgs = [Organization.objects.create(site=cls.site, name=f'Feed org {i}', slug=f'feed-org-{i}')
+                    for i in range(5)]
+        role = Role.objects.get(code='member')
+        cls.memberships = [
+            Membership.objects.create(user=User.objects.create_user(f'feed-u{i}', f'feed-u{i}@example.com', 'x'),
+                                      site=cls.site, organization=cls.orgs[0], role=role)
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        base = timezone.now() - timedelta(hours=1)
+        # Three organizations and a membership share a timestamp: ties across ids and feed types
+        for obj, seconds in [(self.site, 0), *((o, 0) for o in self.orgs[:3]), (self.memberships[0], 0),
+                             (self.orgs[3], 1), (self.memberships[1], 2), (self.orgs[4], 3), (self.memberships[2], 3)]:
+            type(obj).all_objects.filter(pk=obj.pk).update(updated_at=base + timedelta(seconds=seconds))
+        self.seen = {}
+
+    def page(self, cursor=None) -> tuple[str, bool]:
+        params = {'types': 'organization,membership', 'limit': 2}
+        if cursor:
+            params['since'] = cursor
+        body = self.client.get(reverse('api_changes'), params).json()
+        for item in body['changes']:
+            key = (item['type'], item['id'])
+            self.assertNotEqual(self.seen.get(key), item, 'the same change was delivered twice')
+            self.seen[key] = item
+        return body['cursor'], body['has_more']
+
+    def drain(self, cursor) -> str:
+        has_more = True
+        while has_more:
+            cursor, has_more = self.page(cursor)
+        return cursor
+
+    def assertFeedMatchesDatabase(self):
+        for model, name in ((Organization, 'organization'), (Membership, 'membership')):
+            for pk, deleted, updated_at in model.all_objects.filter(site=self.site).values_list('id', 'deleted', 'updated_at'):
+                item = self.seen.get((name, pk))
+                self.assertIsNotNone(item, f'{name} {pk} was skipped')
+                self.assertEqual((item['deleted'], item['updated_at']), (deleted, updated_at.isoformat()))
+                self.assertEqual(item['data'] is None, deleted)
+
+    def test_paging_through_concurrent_updates_and_soft_deletes(self):
+        cursor, has_more = self.page()
+        self.assertTrue(has_more)
+        seen_org, unseen_org = self.orgs[0], self.orgs[4]
+        self.assertIn(('organization', seen_org.pk), self.seen)
+        self.assertNotIn(('organization', unseen_org.pk), self.seen)
+
+        # Between pages: rename a delivered row, soft-delete an undelivered organization and a
+        # membership; orgs[1:3] and memberships[0] stay on the tied first timestamp
+        seen_org.name = 'Feed org renamed'
+        seen_org.save()
+        self.client.post(reverse('siteadmin_org_delete', args=[self.site.pk, unseen_org.pk]))
+        self.client.post(reverse('siteadmin_membership_delete', args=[self.site.pk, self.memberships[1].pk]))
+
+        cursor = self.drain(cursor)
+        # Fresh writes are held back by the settle horizon
+        self.assertFalse(any(item['deleted'] for item in self.seen.values()))
+        self.assertEqual(self.seen[('organization', seen_org.pk)]['data']['name'], 'Feed org 0')
+
+        # A negative horizon lets the rows written just now through
+        with mock.patch('apis.api_v1.changes.SETTLE_SECONDS', -1):
+            cursor = self.drain(cursor)
+            self.assertFeedMatchesDatabase()
+            self.assertTrue(self.seen[('organization', unseen_org.pk)]['deleted'])
+            self.assertTrue(self.seen[('membership', self.memberships[1].pk)]['deleted'])
+
+            # Restore bumps updated_at, so the row comes back after the tombstone
+            self.client.post(reverse('siteadmin_org_restore', args=[self.site.pk, unseen_org.pk]))
+            self.drain(cursor)
+            self.assertFeedMatchesDatabase()
+            self.assertFalse(self.seen[('organization', unseen_org.pk)]['deleted'])
+
+
+class DashboardEventsTests(TestCase):
+    """The dashboard stream carries events of every site the user administers and no others;
+    saves cost no extra query while nobody is subscribed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sites = [Site.objects.create(name=f'Events site {i}', slug=f'events-site-{i}') for i in range(2)]
+        cls.orgs = [Organization.objects.create(site=site, name=f'Events org {i}', slug=f'events-org-{i}')
+                    for i, site in enumerate(cls.sites)]
+        cls.admin = get_user_model().objects.create_user('events-admin', 'events-admin@example.com', 'x')
+        Membership.objects.create(user=cls.admin, site=cls.sites[0], role=Role.objects.get(code='siteadmin'))
+
+    def events(self) -> list[dict]:
+        # Under WSGI the stream answers one poll per request
+        since = encode_cursor([(timezone.now() - timedelta(hours=1)).isoformat(), 0, 0])
+        with mock.patch('apis.api_v1.changes.SETTLE_SECONDS', -1):
+            response = self.client.get(reverse('siteadmin_dashboard_events'), {'since': since})
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line[len('data: '):]) for line in response.content.decode().splitlines()
+                if line.startswith('data: ')]
+
+    def test_site_admin_sees_only_their_sites(self):
+        self.client.force_login(self.admin)
+        events = self.events()
+        self.assertIn(('organization', self.orgs[0].pk), {(e['type'], e['id']) for e in events})
+        self.assertEqual({e['site'] for e in events if e['site'] is not None}, {self.sites[0].pk})
+
+    def test_staff_sees_every_site(self):
+        self.client.force_login(get_user_model().objects.create_superuser('events-staff', 'es@example.com', 'x'))
+        self.assertLessEqual({s.pk for s in self.sites}, {e['site'] for e in self.events()})
+
+    def test_other_users_are_forbidden(self):
+        self.client.force_login(get_user_model().objects.create_user('events-user', 'eu@example.com', 'x'))
+        self.assertEqual(self.client.get(reverse('siteadmin_dashboard_events')).status_code, 403)
+
+    def test_no_site_lookup_without_subscribers(self):
+        section = OrganizationSection.objects.create(organization=self.orgs[0], tab='overview', key='events', title='Events section')
+        section = OrganizationSection.objects.get(pk=section.pk)
+        with mock.patch.object(site_events, '_site_id', wraps=site_events._site_id) as lookup:
+            section.save()
+        lookup.assert_not_called()
+
+
+class MetricsEndpointTests(TestCase):
+    """/metrics/ for staff: in-memory totals without METRICS_STORE, merged through the store with it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = get_user_model().objects.create_user('metrics-staff', 'metrics@example.com', 'x', is_staff=True)
+
+    def scrape(self) -> str:
+        self.client.force_login(self.staff)
+        self.client.get(reverse('health'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    @override_settings(METRICS_STORE='')
+    def test_without_store_nothing_is_written(self):
+        self.assertIn('jivapms_requests_total{view="health",method="GET",status="2xx"}', self.scrape())
+        self.assertFalse(any(Path(settings.BASE_DIR).glob('metrics.sqlite3*')))
+
+    def test_shared_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = Path(tmp) / 'metrics.sqlite3'
+            with override_settings(METRICS_STORE=str(store)):
+                self.assertIn('view="health"', self.scrape())
+            self.assertTrue(store.exists())
+
+    def test_forked_process_gets_its_own_row_and_dead_rows_are_pruned(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(METRICS_STORE=str(Path(tmp) / 'm.sqlite3')):
+            telemetry.flush(force=True)
+            with telemetry._connect() as conn:
+                conn.execute('INSERT INTO process_metrics VALUES (?, ?, ?)', ('dead', time.time() - 86400, '[]'))
+            with mock.patch('os.getpid', return_value=os.getpid() + 1):
+                telemetry.flush(force=True)
+            with telemetry._connect() as conn:
+                rows = [r[0] for r in conn.execute('SELECT process FROM process_metrics')]
+        self.assertEqual(len(rows), 2)
+        self.assertNotIn('dead', rows)
+        self.assertEqual(len({row.split('-')[0] for row in rows}), 2)
+
+    def test_requires_staff(self):
+        self.client.force_login(get_user_model().objects.create_user('metrics-user', 'mu@example.com', 'x'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
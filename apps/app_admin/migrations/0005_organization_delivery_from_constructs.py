@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0004_invitetoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='delivery_from_constructs',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0005_organization_delivery_from_constructs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['updated_at', 'id'], name='membership_updated_id'),
+        ),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(fields=['updated_at', 'id'], name='org_updated_id'),
+        ),
+        migrations.AddIndex(
+            model_name='site',
+            index=models.Index(fields=['updated_at', 'id'], name='site_updated_id'),
+        ),
+    ]
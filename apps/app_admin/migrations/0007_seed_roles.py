@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+ROLES = (
+    ('siteadmin', 'Site Admin'),
+    ('orgadmin', 'Org Admin'),
+    ('member', 'Member'),
+)
+
+
+def seed_roles(apps, schema_editor):
+    # Previously done in AppAdminConfig.ready() on every process start. Role is unique on
+    # (code, label), so a code may already exist under several labels: get_or_create(code=...)
+    # would raise MultipleObjectsReturned there.
+    Role = apps.get_model('app_admin', 'Role')
+    for code, label in ROLES:
+        if not Role.objects.filter(code=code).exists():
+            Role.objects.create(code=code, label=label)
+
+
+def unseed_roles(apps, schema_editor):
+    # Memberships reference roles; keep them on reverse
+    pass
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('app_admin', '0006_membership_membership_updated_id_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_roles, unseed_roles),
+    ]
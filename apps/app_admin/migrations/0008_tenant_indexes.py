@@ -0,0 +1,27 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0007_seed_roles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['site', 'organization', 'role', 'active'], name='membership_site_org_role'),
+        ),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['site', 'name'], name='org_site_name_alive'),
+        ),
+        migrations.AddIndex(
+            model_name='organization',
+            index=models.Index(condition=models.Q(('deleted', True)), fields=['site', 'name'], name='org_site_name_deleted'),
+        ),
+    ]
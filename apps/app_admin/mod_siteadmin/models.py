@@ -1,7 +1,8 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 
-from apps.app_0.mod_0.models import BaseModelImpl
+from apps.app_0.mod_0.models import BaseModelImpl, TenantManager, TenantQuerySet
 
 
 User = get_user_model()
@@ -13,6 +14,7 @@ class Site(BaseModelImpl):
     description = models.TextField(blank=True)
 
     class Meta(BaseModelImpl.Meta):
+        indexes = [models.Index(fields=['updated_at', 'id'], name='site_updated_id')]
         verbose_name = "Site"
         verbose_name_plural = "Sites"
 
@@ -25,9 +27,21 @@ class Organization(BaseModelImpl):
     name = models.CharField(max_length=150)
     slug = models.SlugField(max_length=160)
     description = models.TextField(blank=True)
+    # Render the Delivery tab from the construct tree instead of free-text sections
+    delivery_from_constructs = models.BooleanField(default=False)
+
+    objects = TenantManager()
+    all_objects = TenantQuerySet.as_manager()
 
     class Meta(BaseModelImpl.Meta):
         unique_together = (('site', 'slug'), ('site', 'name'))
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='org_updated_id'),
+            # Per-site lists ordered by name, split on `deleted`: the ORM renders it as a bare
+            # (NOT) "deleted" term, which SQLite only matches as a partial index condition
+            models.Index(fields=['site', 'name'], condition=Q(deleted=False), name='org_site_name_alive'),
+            models.Index(fields=['site', 'name'], condition=Q(deleted=True), name='org_site_name_deleted'),
+        ]
         verbose_name = "Organization"
         verbose_name_plural = "Organizations"
 
@@ -59,8 +73,17 @@ class Membership(BaseModelImpl):
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='memberships', null=True, blank=True)
     role = models.ForeignKey(Role, on_delete=models.PROTECT, related_name='memberships')
 
+    objects = TenantManager()
+    all_objects = TenantQuerySet.as_manager()
+
     class Meta(BaseModelImpl.Meta):
         unique_together = (('user', 'site', 'organization', 'role'),)
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='membership_updated_id'),
+            # Site and organization member/admin lists; organization IS NULL for site-level roles
+            models.Index(fields=['site', 'organization', 'role', 'active'], condition=Q(deleted=False),
+                         name='membership_site_org_role'),
+        ]
         verbose_name = "Membership"
         verbose_name_plural = "Memberships"
 
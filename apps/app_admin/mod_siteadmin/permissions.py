@@ -0,0 +1,24 @@
+"""Role checks shared by the siteadmin, orgadmin, reports and API views."""
+from .models import Membership, Organization, Role, Site
+
+
+def is_site_admin(user, site: Site | None = None) -> bool:
+    """Staff, or an active site-level (no organization) siteadmin membership of `site`."""
+    if not user.is_authenticated:
+        return False
+    if user.is_superuser or user.is_staff:
+        return True
+    if site is None:
+        return False
+    role = Role.objects.filter(code='siteadmin').first()
+    if not role:
+        return False
+    return Membership.objects.for_site(site).filter(organization__isnull=True, role=role, active=True, user=user).exists()
+
+
+def is_org_admin(user, site: Site, org: Organization) -> bool:
+    """Active orgadmin membership of `org`; staff is not implied."""
+    role = Role.objects.filter(code='orgadmin').first()
+    if not role:
+        return False
+    return Membership.objects.for_site(site).filter(organization=org, role=role, active=True, user=user).exists()
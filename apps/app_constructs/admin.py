@@ -1,5 +1,16 @@
 from django.contrib import admin
-from .models import ConstructType, Construct
+from .models import ConstructType, ConstructTypeSynonym, Construct, ConstructRollup
+
+
+class ConstructTypeSynonymInline(admin.TabularInline):
+    model = ConstructTypeSynonym
+    extra = 0
+    can_delete = False
+    fields = ('label', 'term')
+    readonly_fields = ('label', 'term')
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(ConstructType)
@@ -7,10 +18,16 @@ class ConstructTypeAdmin(admin.ModelAdmin):
     list_display = ('name', 'code', 'position', 'active', 'deleted')
     list_filter = ('active', 'deleted')
     search_fields = ('name', 'code', 'synonyms')
+    inlines = [ConstructTypeSynonymInline]
 
 
 @admin.register(Construct)
 class ConstructAdmin(admin.ModelAdmin):
     list_display = ('name', 'type', 'organization', 'site', 'parent', 'position', 'active', 'deleted')
     list_filter = ('type', 'site', 'organization', 'active', 'deleted')
-    search_fields = ('name',)
\ No newline at end of file
+    search_fields = ('name',)
+
+@admin.register(ConstructRollup)
+class ConstructRollupAdmin(admin.ModelAdmin):
+    list_display = ('construct', 'descendant_count', 'done_count', 'blocked_count', 'approved_count', 'latest_completed_at')
+    readonly_fields = ('construct', 'descendant_count', 'type_counts', 'done_count', 'blocked_count', 'approved_count', 'latest_completed_at', 'updated_at')
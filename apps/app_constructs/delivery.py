@@ -0,0 +1,65 @@
+"""Delivery tab content generated from an organization's construct tree.
+
+The rendered fragment is cached under the organization's construct namespace
+(gencache.org_ns(org, Construct)) and the construct type namespace (section titles are type
+names), so reading the tab costs one generation lookup plus a cache hit; any construct or type
+write bumps a namespace and the next read rebuilds it once.
+"""
+from django.db.models import Count, Max, Q
+from django.template.loader import render_to_string
+from django.utils.text import slugify
+
+from apps.app_0.mod_0.gencache import get_or_set, model_ns, org_ns
+
+from .models import Construct, ConstructType
+
+
+CACHE_TIMEOUT = 60 * 60 * 24
+ITEMS_PER_TYPE = 25
+
+
+def build_delivery_sections(org) -> list[dict]:
+    """One section per ConstructType used by the organization, in type order."""
+    alive = Construct.objects.for_organization(org)
+    stats = {
+        row['type_id']: row
+        for row in alive.order_by().values('type_id').annotate(
+            total=Count('id'),
+            done=Count('id', filter=Q(done=True)),
+            blocked=Count('id', filter=Q(blocked=True)),
+            approved=Count('id', filter=Q(approved=True)),
+            latest_completed_at=Max('completed_at'),
+        )
+    }
+    sections = []
+    for ctype in ConstructType.all_objects.filter(pk__in=stats).order_by('position', 'name'):
+        row = stats[ctype.pk]
+        items = list(
+            alive.filter(type=ctype).select_related('rollup').order_by('position', 'id')[:ITEMS_PER_TYPE]
+        )
+        sections.append({
+            'slug': slugify(ctype.name or ctype.code) or ctype.code,
+            'title': ctype.name or ctype.code,
+            'total': row['total'],
+            'done': row['done'],
+            'blocked': row['blocked'],
+            'approved': row['approved'],
+            'open': row['total'] - row['done'],
+            'latest_completed_at': row['latest_completed_at'],
+            'items': items,
+            'more': max(0, row['total'] - len(items)),
+        })
+    return sections
+
+
+def delivery_tab(org) -> dict:
+    """{'toc': [(slug, title)], 'html': str} for the Delivery tab, served from cache."""
+    def build():
+        sections = build_delivery_sections(org)
+        return {
+            'toc': [(s['slug'], s['title']) for s in sections],
+            'html': render_to_string('app_site/siteadmin/_org_delivery_constructs.html', {'sections': sections}),
+        }
+    # Never stale by time: only a construct or type write changes the fragment
+    return get_or_set(f'constructs:delivery:{org.pk}', [org_ns(org.pk, Construct), model_ns(ConstructType)], build,
+                      soft_ttl=CACHE_TIMEOUT, hard_ttl=CACHE_TIMEOUT)
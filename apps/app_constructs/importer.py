@@ -0,0 +1,156 @@
+"""Bulk import of construct trees.
+
+Rows are (external_id, parent_external_id, type, name). Parents are resolved in memory:
+rows are grouped into levels (a row's parent is either empty, a live construct of the
+organization or a row of the previous level) and each level is written with one
+`bulk_create`, so a 30k-row portfolio takes a handful of statements per level instead of
+one save() per construct. Rollups of the new rows are computed in the same pass.
+"""
+import csv
+import io
+import json
+from collections import defaultdict
+
+from django.db import transaction
+
+from apps.app_0.mod_0.gencache import bump, namespaces_for
+from apps.app_admin.mod_siteadmin.models import Organization
+
+from .models import Construct, ConstructRollup
+from .rollups import TRACKED_FIELDS, Contribution, _unit, compute_rollups, propagate, rollup_rows
+from .synonyms import TypeResolver
+
+
+FIELDS = ('external_id', 'parent_external_id', 'type', 'name')
+
+
+class ConstructImportError(Exception):
+    def __init__(self, errors: list[dict]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid row(s)")
+
+
+def parse_rows(text: str, fmt: str = 'csv') -> list[dict]:
+    """Parse CSV (optional header row) or NDJSON into row dicts."""
+    rows = []
+    if fmt == 'ndjson':
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as exc:
+                raise ConstructImportError([{"row": line_no, "error": f"Invalid JSON: {exc}"}])
+            if not isinstance(item, dict):
+                raise ConstructImportError([{"row": line_no, "error": "Expected a JSON object"}])
+            if 'parent_external_id' not in item and 'parent' in item:
+                item['parent_external_id'] = item['parent']
+            rows.append({key: str(item.get(key) or '').strip() for key in FIELDS})
+        return rows
+    reader = csv.reader(io.StringIO(text))
+    for idx, record in enumerate(reader):
+        if not record or not any(c.strip() for c in record):
+            continue
+        values = [c.strip() for c in record[:4]] + [''] * (4 - len(record[:4]))
+        if idx == 0 and values[0].lower() == 'external_id':
+            continue
+        rows.append(dict(zip(FIELDS, values)))
+    return rows
+
+
+def import_constructs(org: Organization, rows: list[dict], batch_size: int = 2000) -> dict:
+    """Validate all rows, then insert them level by level in one transaction.
+    Raises ConstructImportError (nothing written) when any row is invalid.
+    """
+    resolver = TypeResolver()
+    existing, deleted = {}, set()
+    # Deleted constructs keep their external_id (unique per organization) but cannot be parents
+    for ext, pk, is_deleted in (
+        Construct.all_objects.for_organization(org).exclude(external_id='').values_list('external_id', 'id', 'deleted')
+    ):
+        if is_deleted:
+            deleted.add(ext)
+        else:
+            existing[ext] = pk
+    errors = []
+    by_ext: dict[str, dict] = {}
+    types = {}
+    for row_no, row in enumerate(rows, start=1):
+        ext = row.get('external_id') or ''
+        if not ext:
+            errors.append({"row": row_no, "error": "external_id is required"})
+            continue
+        if ext in by_ext or ext in existing:
+            errors.append({"row": row_no, "error": f"Duplicate external_id '{ext}'"})
+            continue
+        if ext in deleted:
+            errors.append({"row": row_no, "error": f"external_id '{ext}' belongs to a deleted construct"})
+            continue
+        ctype = resolver.resolve(row.get('type'))
+        if ctype is None:
+            errors.append({"row": row_no, "error": f"Unknown construct type '{row.get('type')}'"})
+            continue
+        types[ext] = ctype
+        by_ext[ext] = dict(row, row_no=row_no)
+
+    # Group rows into levels (Kahn's algorithm over the parent edges)
+    children = defaultdict(list)
+    level = []
+    for ext, row in by_ext.items():
+        parent = row.get('parent_external_id') or ''
+        if not parent or parent in existing:
+            level.append(ext)
+        elif parent in by_ext:
+            children[parent].append(ext)
+        elif parent in deleted:
+            errors.append({"row": row['row_no'], "error": f"Parent '{parent}' is deleted"})
+        else:
+            errors.append({"row": row['row_no'], "error": f"Unknown parent_external_id '{parent}'"})
+    levels = []
+    placed = 0
+    while level:
+        levels.append(level)
+        placed += len(level)
+        level = [child for ext in level for child in children.get(ext, ())]
+    if placed < len(by_ext) and not errors:
+        reachable = {ext for lvl in levels for ext in lvl}
+        for ext, row in by_ext.items():
+            if ext not in reachable:
+                errors.append({"row": row['row_no'], "error": f"Parent cycle at '{ext}'"})
+    if errors:
+        raise ConstructImportError(sorted(errors, key=lambda e: e['row']))
+
+    ids = dict(existing)
+    created = []
+    with transaction.atomic():
+        for lvl in levels:
+            objs = [
+                Construct(
+                    site_id=org.site_id,
+                    organization=org,
+                    type=types[ext],
+                    parent_id=ids.get(by_ext[ext].get('parent_external_id') or '') or None,
+                    name=(by_ext[ext].get('name') or ext)[:100],
+                    external_id=ext,
+                    position=by_ext[ext]['row_no'],
+                )
+                for ext in lvl
+            ]
+            Construct.objects.bulk_create(objs, batch_size=batch_size)
+            for obj in objs:
+                ids[obj.external_id] = obj.pk
+            created.extend(objs)
+
+        # Rollups: the new rows form a forest; attach its roots to existing parents afterwards
+        states = [dict({name: getattr(obj, name) for name in TRACKED_FIELDS}, id=obj.pk) for obj in created]
+        totals = compute_rollups(states)
+        ConstructRollup.objects.bulk_create(rollup_rows(totals), batch_size=batch_size)
+        attach: dict[int, Contribution] = defaultdict(Contribution)
+        for state in states:
+            if state['parent_id'] is not None and state['parent_id'] not in totals:
+                attach[state['parent_id']].add(_unit(state)).add(totals[state['id']])
+        for parent_id, contribution in attach.items():
+            propagate(parent_id, added=contribution)
+        if created:
+            bump(*namespaces_for(created[0]))
+    return {"created": len(created), "levels": len(levels)}
@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.app_admin.mod_siteadmin.models import Organization
+from apps.app_constructs.importer import ConstructImportError, import_constructs, parse_rows
+
+
+class Command(BaseCommand):
+    help = "Import a construct tree from CSV or NDJSON rows: external_id, parent_external_id, type, name"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Path to a .csv or .ndjson file')
+        parser.add_argument('--org', type=int, required=True, help='Target organization id')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        org = Organization.objects.filter(pk=options['org']).first()
+        if org is None:
+            raise CommandError(f"Organization {options['org']} not found")
+        fmt = options.get('format') or ('ndjson' if path.suffix.lower() in {'.ndjson', '.jsonl'} else 'csv')
+        try:
+            rows = parse_rows(path.read_text(encoding='utf-8'), fmt)
+            result = import_constructs(org, rows, batch_size=options['batch_size'])
+        except ConstructImportError as exc:
+            for err in exc.errors[:50]:
+                self.stderr.write(f"row {err['row']}: {err['error']}")
+            raise CommandError(f"Import aborted: {exc}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} constructs in {result['levels']} levels into '{org.name}'."
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.app_admin.mod_siteadmin.models import Organization
+from apps.app_constructs.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute cached construct subtree rollups (counts by type and status, latest completion)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--org', type=int, help='Only rebuild constructs of this organization id')
+
+    def handle(self, *args, **options):
+        org = None
+        if options.get('org'):
+            org = Organization.all_objects.filter(pk=options['org']).first()
+            if org is None:
+                raise CommandError(f"Organization {options['org']} not found")
+        count = rebuild_rollups(organization=org)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {count} constructs."))
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_rollups(apps, schema_editor):
+    from apps.app_constructs.rollups import TRACKED_FIELDS, compute_rollups
+    Construct = apps.get_model('app_constructs', 'Construct')
+    ConstructRollup = apps.get_model('app_constructs', 'ConstructRollup')
+    totals = compute_rollups(Construct.objects.values('id', *TRACKED_FIELDS))
+    ConstructRollup.objects.bulk_create([
+        ConstructRollup(
+            construct_id=pk,
+            descendant_count=c.count,
+            type_counts=c.types,
+            done_count=c.done,
+            blocked_count=c.blocked,
+            approved_count=c.approved,
+            latest_completed_at=c.latest,
+        )
+        for pk, c in totals.items()
+    ], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_constructs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConstructRollup',
+            fields=[
+                ('construct', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rollup', serialize=False, to='app_constructs.construct')),
+                ('descendant_count', models.PositiveIntegerField(default=0)),
+                ('type_counts', models.JSONField(blank=True, default=dict)),
+                ('done_count', models.PositiveIntegerField(default=0)),
+                ('blocked_count', models.PositiveIntegerField(default=0)),
+                ('approved_count', models.PositiveIntegerField(default=0)),
+                ('latest_completed_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Construct rollup',
+                'verbose_name_plural': 'Construct rollups',
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.2 on 2026-10-19 15:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize_term(value):
+    # Frozen copy of apps.app_constructs.synonyms.normalize_term
+    return ' '.join((value or '').split()).casefold()
+
+
+def backfill_synonyms(apps, schema_editor):
+    ConstructType = apps.get_model('app_constructs', 'ConstructType')
+    ConstructTypeSynonym = apps.get_model('app_constructs', 'ConstructTypeSynonym')
+    taken = set()
+    rows = []
+    for t in ConstructType.objects.filter(deleted=False).order_by('position', 'id'):
+        labels = [t.name, t.code, *(t.synonyms or '').split(',')]
+        for label in labels:
+            term = normalize_term(label)
+            if term and term not in taken:
+                taken.add(term)
+                rows.append(ConstructTypeSynonym(type_id=t.pk, term=term, label=label.strip()[:150]))
+    ConstructTypeSynonym.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_constructs', '0002_constructrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConstructTypeSynonym',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=150, unique=True)),
+                ('label', models.CharField(max_length=150)),
+                ('type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='synonym_index', to='app_constructs.constructtype')),
+            ],
+            options={
+                'verbose_name': 'Construct type synonym',
+                'verbose_name_plural': 'Construct type synonyms',
+            },
+        ),
+        migrations.RunPython(backfill_synonyms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_constructs', '0003_constructtypesynonym'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='construct',
+            name='external_id',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=100),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0005_organization_delivery_from_constructs'),
+        ('app_constructs', '0004_construct_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConstructTreeVersion',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='construct_version', serialize=False, to='app_admin.organization')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Construct tree version',
+                'verbose_name_plural': 'Construct tree versions',
+            },
+        ),
+    ]
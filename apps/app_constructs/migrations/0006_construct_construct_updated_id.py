@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0006_membership_membership_updated_id_and_more'),
+        ('app_constructs', '0005_constructtreeversion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='construct',
+            index=models.Index(fields=['updated_at', 'id'], name='construct_updated_id'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0008_tenant_indexes'),
+        ('app_constructs', '0006_construct_construct_updated_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='construct',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['organization', 'parent', 'position'], name='construct_org_parent_pos'),
+        ),
+    ]
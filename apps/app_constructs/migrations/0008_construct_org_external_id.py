@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0008_tenant_indexes'),
+        ('app_constructs', '0007_tenant_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='construct',
+            constraint=models.UniqueConstraint(condition=models.Q(('external_id', ''), _negated=True), fields=('organization', 'external_id'), name='construct_org_external_id'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.1.2 on 2026-10-19 17:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_constructs', '0008_construct_org_external_id'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='ConstructTreeVersion',
+        ),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils.text import slugify
-from apps.app_0.mod_0.models import BaseModelImpl
+from apps.app_0.mod_0.models import BaseModelImpl, TenantManager, TenantQuerySet
 from apps.app_admin.mod_siteadmin.models import Site, Organization
 
 
@@ -16,9 +17,39 @@ class ConstructType(BaseModelImpl):
         verbose_name_plural = 'Construct Types'
 
     def save(self, *args, **kwargs):
+        from .synonyms import sync_synonyms
         if not self.code and self.name:
             self.code = slugify(self.name)[:64]
-        super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            sync_synonyms(self, using=kwargs.get('using'))
+
+    def hard_delete(self, using=None, keep_parents=False):
+        from .synonyms import release_terms
+        with transaction.atomic(using=using):
+            terms = set(self.synonym_index.using(using).values_list('term', flat=True))
+            result = super().hard_delete(using=using, keep_parents=keep_parents)
+            release_terms(terms, using=using)
+        return result
+
+    def synonym_list(self) -> list[str]:
+        return [s.strip() for s in (self.synonyms or '').split(',') if s.strip()]
+
+
+class ConstructTypeSynonym(models.Model):
+    """Normalized lookup of every name a ConstructType answers to (name, code and synonyms).
+    Rebuilt from ConstructType.save(); `term` is unique so resolution is a single index probe.
+    """
+    type = models.ForeignKey(ConstructType, on_delete=models.CASCADE, related_name='synonym_index')
+    term = models.CharField(max_length=150, unique=True)
+    label = models.CharField(max_length=150)
+
+    class Meta:
+        verbose_name = 'Construct type synonym'
+        verbose_name_plural = 'Construct type synonyms'
+
+    def __str__(self):
+        return f"{self.label} → {self.type}"
 
 
 class Construct(BaseModelImpl):
@@ -26,7 +57,83 @@ class Construct(BaseModelImpl):
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='constructs')
     type = models.ForeignKey(ConstructType, on_delete=models.PROTECT, related_name='constructs')
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='children')
+    # Identifier in the source system for bulk imports (unique per organization when set)
+    external_id = models.CharField(max_length=100, blank=True, default='', db_index=True)
+
+    objects = TenantManager()
+    all_objects = TenantQuerySet.as_manager()
 
     class Meta(BaseModelImpl.Meta):
         verbose_name = 'Construct'
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='construct_updated_id'),
+            # Tree reads of live constructs; the rowid tail also satisfies ORDER BY parent_id, position, id
+            models.Index(fields=['organization', 'parent', 'position'], condition=Q(deleted=False),
+                         name='construct_org_parent_pos'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['organization', 'external_id'], condition=~Q(external_id=''),
+                                    name='construct_org_external_id'),
+        ]
         verbose_name_plural = 'Constructs'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        from .rollups import snapshot
+        instance = super().from_db(db, field_names, values)
+        # Remember the state the rollups were built from so save() can apply a delta
+        instance._rollup_snapshot = snapshot(instance)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        from .rollups import snapshot
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._rollup_snapshot = snapshot(self)
+
+    def save(self, *args, **kwargs):
+        from apps.app_0.mod_0.gencache import bump, org_ns
+        from .rollups import apply_change, load_snapshot
+        using = kwargs.get('using')
+        created = self._state.adding
+        previous = None
+        if not created:
+            previous = getattr(self, '_rollup_snapshot', None) or load_snapshot(self.pk, using=using)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            self._rollup_snapshot = apply_change(
+                self, previous, created=created, update_fields=kwargs.get('update_fields'), using=using,
+            )
+            if previous and previous['organization_id'] != self._rollup_snapshot['organization_id']:
+                # post_save bumps the new organization's namespaces; the old one lost the subtree
+                bump(org_ns(previous['organization_id']), org_ns(previous['organization_id'], Construct), using=using)
+
+    def hard_delete(self, using=None, keep_parents=False):
+        from .rollups import propagate, subtree_contribution
+        with transaction.atomic(using=using):
+            parent_id, contribution = subtree_contribution(self, using=using)
+            result = super().hard_delete(using=using, keep_parents=keep_parents)
+            propagate(parent_id, removed=contribution, using=using)
+        return result
+
+
+class ConstructRollup(models.Model):
+    """Cached aggregates over the alive (not soft-deleted) descendants of a construct.
+    Maintained incrementally by Construct.save()/hard_delete(); rebuild with
+    `manage.py rebuild_construct_rollups` after raw queryset updates.
+    """
+    construct = models.OneToOneField(Construct, on_delete=models.CASCADE, primary_key=True, related_name='rollup')
+    descendant_count = models.PositiveIntegerField(default=0)
+    # {"<ConstructType id>": count}
+    type_counts = models.JSONField(default=dict, blank=True)
+    done_count = models.PositiveIntegerField(default=0)
+    blocked_count = models.PositiveIntegerField(default=0)
+    approved_count = models.PositiveIntegerField(default=0)
+    latest_completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Construct rollup'
+        verbose_name_plural = 'Construct rollups'
+
+    def __str__(self):
+        return f"Rollup({self.construct_id}, {self.descendant_count})"
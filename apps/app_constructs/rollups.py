@@ -0,0 +1,230 @@
+"""Incremental subtree rollups for constructs.
+
+A construct contributes to its parent's rollup only while it is alive (not soft-deleted);
+the contribution is the construct itself plus its own rollup. A write computes the old and
+new contribution of the saved construct and applies the difference along the ancestor chain,
+so a write costs O(depth) and reading a rollup is a single row (`construct.rollup`).
+"""
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Max
+
+from apps.app_0.mod_0.gencache import bump, org_ns
+
+from .models import Construct, ConstructRollup
+
+
+# Attribute names whose values feed the rollups of the ancestors
+TRACKED_FIELDS = ('organization_id', 'parent_id', 'deleted', 'type_id', 'done', 'blocked', 'approved', 'completed_at')
+
+
+@dataclass
+class Contribution:
+    count: int = 0
+    types: dict = field(default_factory=dict)
+    done: int = 0
+    blocked: int = 0
+    approved: int = 0
+    latest: datetime | None = None
+
+    def add(self, other: 'Contribution'):
+        self.count += other.count
+        for key, value in other.types.items():
+            self.types[key] = self.types.get(key, 0) + value
+        self.done += other.done
+        self.blocked += other.blocked
+        self.approved += other.approved
+        if other.latest is not None and (self.latest is None or other.latest > self.latest):
+            self.latest = other.latest
+        return self
+
+    def is_empty(self):
+        return not self.count and self.latest is None
+
+
+def snapshot(obj) -> dict | None:
+    """Tracked values of a construct instance, or None when some of them were deferred."""
+    if obj.get_deferred_fields() & set(TRACKED_FIELDS):
+        return None
+    return {name: getattr(obj, name) for name in TRACKED_FIELDS}
+
+
+def load_snapshot(pk, using=None) -> dict | None:
+    return Construct.all_objects.using(using).filter(pk=pk).values(*TRACKED_FIELDS).first()
+
+
+def _unit(state: dict | None) -> Contribution:
+    if not state or state['deleted']:
+        return Contribution()
+    return Contribution(
+        count=1,
+        types={str(state['type_id']): 1},
+        done=int(bool(state['done'])),
+        blocked=int(bool(state['blocked'])),
+        approved=int(bool(state['approved'])),
+        latest=state['completed_at'],
+    )
+
+
+def _from_row(row: ConstructRollup | None) -> Contribution:
+    if row is None:
+        return Contribution()
+    return Contribution(
+        count=row.descendant_count,
+        types=dict(row.type_counts or {}),
+        done=row.done_count,
+        blocked=row.blocked_count,
+        approved=row.approved_count,
+        latest=row.latest_completed_at,
+    )
+
+
+def _subtree(pk, using=None) -> Contribution:
+    return _from_row(ConstructRollup.objects.using(using).filter(construct_id=pk).first())
+
+
+def _apply_to_row(row: ConstructRollup, added: Contribution, removed: Contribution, using=None):
+    row.descendant_count = max(0, row.descendant_count + added.count - removed.count)
+    types = dict(row.type_counts or {})
+    for key, value in added.types.items():
+        types[key] = types.get(key, 0) + value
+    for key, value in removed.types.items():
+        types[key] = types.get(key, 0) - value
+    row.type_counts = {key: value for key, value in types.items() if value > 0}
+    row.done_count = max(0, row.done_count + added.done - removed.done)
+    row.blocked_count = max(0, row.blocked_count + added.blocked - removed.blocked)
+    row.approved_count = max(0, row.approved_count + added.approved - removed.approved)
+
+    current = row.latest_completed_at
+    if (removed.latest is not None and current is not None and removed.latest >= current
+            and removed.latest != added.latest):
+        # The removed value may have been the maximum; children are already up to date
+        agg = Construct.objects.using(using).filter(parent_id=row.construct_id).aggregate(
+            own=Max('completed_at'), sub=Max('rollup__latest_completed_at'),
+        )
+        values = [v for v in (agg['own'], agg['sub']) if v is not None]
+        row.latest_completed_at = max(values) if values else None
+    elif added.latest is not None and (current is None or added.latest > current):
+        row.latest_completed_at = added.latest
+
+
+def propagate(parent_id, added: Contribution | None = None, removed: Contribution | None = None, using=None):
+    """Apply a contribution change to `parent_id` and its alive ancestors."""
+    added = added or Contribution()
+    removed = removed or Contribution()
+    if added.is_empty() and removed.is_empty():
+        return
+    seen = set()
+    node_id = parent_id
+    while node_id is not None and node_id not in seen:
+        seen.add(node_id)
+        row, _ = ConstructRollup.objects.using(using).select_for_update().get_or_create(construct_id=node_id)
+        _apply_to_row(row, added, removed, using=using)
+        row.save(using=using)
+        parent = Construct.all_objects.using(using).filter(pk=node_id).values_list('parent_id', 'deleted').first()
+        if parent is None or parent[1]:
+            # A soft-deleted node keeps its own rollup but does not contribute upwards
+            break
+        node_id = parent[0]
+
+
+def apply_change(obj, previous: dict | None, created: bool = False, update_fields=None, using=None) -> dict | None:
+    """Propagate the effect of saving `obj` (whose tracked state was `previous`). Returns the new state."""
+    if created:
+        ConstructRollup.objects.using(using).get_or_create(construct_id=obj.pk)
+    current = snapshot(obj)
+    if current is not None and update_fields is not None and previous is not None:
+        # Only the listed fields reached the database; keep the stored values for the rest
+        written = {Construct._meta.get_field(name).attname for name in update_fields}
+        current = {name: (current[name] if name in written else previous[name]) for name in TRACKED_FIELDS}
+    if current is None:
+        current = load_snapshot(obj.pk, using=using)
+    if current == previous:
+        return current
+
+    old_parent = previous['parent_id'] if previous else None
+    new_parent = current['parent_id']
+    old_alive = bool(previous) and not previous['deleted']
+    new_alive = not current['deleted']
+    if old_parent == new_parent and old_alive == new_alive:
+        # The subtree part of the contribution is unchanged and cancels out
+        propagate(new_parent, added=_unit(current), removed=_unit(previous), using=using)
+        return current
+
+    subtree = Contribution() if created else _subtree(obj.pk, using=using)
+    removed = _unit(previous).add(subtree) if old_alive else Contribution()
+    added = _unit(current).add(subtree) if new_alive else Contribution()
+    if old_parent == new_parent:
+        propagate(new_parent, added=added, removed=removed, using=using)
+    else:
+        propagate(old_parent, removed=removed, using=using)
+        propagate(new_parent, added=added, using=using)
+    return current
+
+
+def subtree_contribution(obj, using=None) -> tuple[int | None, Contribution]:
+    """(parent id, contribution) of `obj` as currently stored; used before a hard delete."""
+    state = load_snapshot(obj.pk, using=using)
+    if not state or state['deleted']:
+        return (state or {}).get('parent_id'), Contribution()
+    return state['parent_id'], _unit(state).add(_subtree(obj.pk, using=using))
+
+
+def compute_rollups(rows) -> dict:
+    """Aggregate rollups for a whole forest in memory.
+    `rows` are dicts with `id` and TRACKED_FIELDS; returns {id: Contribution}.
+    """
+    nodes = {row['id']: row for row in rows}
+    children = defaultdict(list)
+    roots = []
+    for pk, row in nodes.items():
+        if row['parent_id'] in nodes:
+            children[row['parent_id']].append(pk)
+        else:
+            roots.append(pk)
+    order = []
+    queue = deque(roots)
+    while queue:
+        pk = queue.popleft()
+        order.append(pk)
+        queue.extend(children.get(pk, ()))
+    totals = {pk: Contribution() for pk in nodes}
+    # Reverse breadth-first order visits every subtree before its root
+    for pk in reversed(order):
+        row = nodes[pk]
+        parent_id = row['parent_id']
+        if parent_id in nodes and not row['deleted']:
+            totals[parent_id].add(_unit(row)).add(totals[pk])
+    return totals
+
+
+def rollup_rows(totals: dict) -> list[ConstructRollup]:
+    return [
+        ConstructRollup(
+            construct_id=pk,
+            descendant_count=c.count,
+            type_counts=c.types,
+            done_count=c.done,
+            blocked_count=c.blocked,
+            approved_count=c.approved,
+            latest_completed_at=c.latest,
+        )
+        for pk, c in totals.items()
+    ]
+
+
+def rebuild_rollups(organization=None, batch_size: int = 2000) -> int:
+    """Recompute rollups from scratch (all constructs, or one organization). Returns rows written."""
+    qs = Construct.all_objects.all()
+    if organization is not None:
+        qs = qs.filter(organization=organization)
+    totals = compute_rollups(qs.values('id', *TRACKED_FIELDS).iterator(chunk_size=batch_size))
+    with transaction.atomic():
+        ConstructRollup.objects.filter(construct_id__in=qs.values('id')).delete()
+        ConstructRollup.objects.bulk_create(rollup_rows(totals), batch_size=batch_size)
+        org_ids = qs.order_by().values_list('organization_id', flat=True).distinct()
+        bump(*(org_ns(org_id, Construct) for org_id in org_ids))
+    return len(totals)
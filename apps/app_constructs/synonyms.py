@@ -0,0 +1,82 @@
+"""Resolve framework terms ("ART", "Release Train", " program ") to a ConstructType.
+
+ConstructType.synonyms stays the editable free-text field; every save mirrors the type's
+name, code and synonyms into ConstructTypeSynonym keyed by the normalized term.
+"""
+from .models import ConstructType, ConstructTypeSynonym
+
+
+def normalize_term(value: str | None) -> str:
+    """Case-insensitive, whitespace-collapsed form used as the lookup key."""
+    return ' '.join((value or '').split()).casefold()
+
+
+def type_terms(construct_type: ConstructType) -> dict[str, str]:
+    """{normalized term: label} for a type; the name wins over code and synonyms."""
+    terms: dict[str, str] = {}
+    for label in [construct_type.name, construct_type.code, *construct_type.synonym_list()]:
+        key = normalize_term(label)
+        if key and key not in terms:
+            terms[key] = label.strip()
+    return terms
+
+
+def sync_synonyms(construct_type: ConstructType, using=None):
+    """Rewrite the index rows of one type. Soft-deleted types leave the index; a term
+    already claimed by another type is kept by that type, and terms this type gives up
+    pass to the next type listing them (see release_terms).
+    """
+    index = ConstructTypeSynonym.objects.using(using)
+    held = index.filter(type=construct_type)
+    previous = set(held.values_list('term', flat=True))
+    held.delete()
+    terms = {} if construct_type.deleted else type_terms(construct_type)
+    taken = set(index.filter(term__in=list(terms)).values_list('term', flat=True))
+    index.bulk_create([
+        ConstructTypeSynonym(type=construct_type, term=term, label=label[:150])
+        for term, label in terms.items() if term not in taken
+    ])
+    release_terms(previous - set(terms), using=using)
+
+
+def release_terms(terms: set[str], using=None):
+    """Give freed terms to the first live type (by position) whose name, code or synonyms
+    list them, as the initial backfill would have.
+    """
+    if not terms:
+        return
+    rows = {}
+    for other in ConstructType.objects.using(using).order_by('position', 'id'):
+        for term, label in type_terms(other).items():
+            if term in terms and term not in rows:
+                rows[term] = ConstructTypeSynonym(type=other, term=term, label=label[:150])
+    ConstructTypeSynonym.objects.using(using).bulk_create(rows.values())
+
+
+def resolve_construct_type(name: str | None) -> ConstructType | None:
+    """Single lookup through the unique term index."""
+    key = normalize_term(name)
+    if not key:
+        return None
+    row = ConstructTypeSynonym.objects.select_related('type').filter(term=key, type__deleted=False).first()
+    return row.type if row else None
+
+
+class TypeResolver:
+    """In-memory term map for batch work (importers): one query up front, O(1) per lookup.
+    Build a new resolver per batch; it does not see types saved after it was created.
+    """
+
+    def __init__(self):
+        types = {t.pk: t for t in ConstructType.objects.all()}
+        self._map = {
+            term: types[type_id]
+            for term, type_id in ConstructTypeSynonym.objects.values_list('term', 'type_id')
+            if type_id in types
+        }
+
+    def resolve(self, name: str | None) -> ConstructType | None:
+        return self._map.get(normalize_term(name))
+
+    def __contains__(self, name):
+        return normalize_term(name) in self._map
@@ -5,3 +5,12 @@ class AppOrganizationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.app_organization'
     verbose_name = 'Organizations'
+
+    def ready(self):
+        # Ensure nested admin registrations are loaded
+        try:
+            import apps.app_organization.mod_organization.admin  # noqa: F401
+            import apps.app_organization.mod_reports.admin  # noqa: F401
+        except Exception:
+            # Admin module may not load during certain management commands; ignore.
+            pass
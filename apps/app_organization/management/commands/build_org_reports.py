@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.app_admin.mod_siteadmin.models import Organization
+from apps.app_organization.mod_reports.builders import BUILDERS, build_all
+
+
+class Command(BaseCommand):
+    help = "Build report snapshots (membership, sections, constructs) for organizations; run from cron for scheduled refreshes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--org', type=int, action='append', help='Organization id (repeatable); default all')
+        parser.add_argument('--site', type=int, help='Only organizations of this site id')
+        parser.add_argument('--kind', choices=sorted(BUILDERS), action='append', help='Report kind (repeatable); default all')
+
+    def handle(self, *args, **options):
+        orgs = Organization.objects.all().order_by('id')
+        if options.get('org'):
+            orgs = orgs.filter(id__in=options['org'])
+        if options.get('site'):
+            orgs = orgs.filter(site_id=options['site'])
+        if not orgs.exists():
+            raise CommandError("No matching organizations")
+        count = 0
+        for org in orgs.iterator():
+            count += len(build_all(org, kinds=options.get('kind')))
+        self.stdout.write(self.style.SUCCESS(f"Built {count} report snapshots."))
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0005_organization_delivery_from_constructs'),
+        ('app_organization', '0003_seed_default_types'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('membership', 'Membership by role'), ('sections', 'Section completeness'), ('constructs', 'Construct status by type')], max_length=32)),
+                ('columns', models.JSONField(default=list)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_snapshots', to='app_admin.organization')),
+            ],
+            options={
+                'verbose_name': 'Report snapshot',
+                'verbose_name_plural': 'Report snapshots',
+                'ordering': ('-created_at', '-id'),
+            },
+        ),
+        migrations.CreateModel(
+            name='ReportRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('values', models.JSONField(default=list)),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='app_organization.reportsnapshot')),
+            ],
+            options={
+                'verbose_name': 'Report row',
+                'verbose_name_plural': 'Report rows',
+                'ordering': ('snapshot', 'position'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='reportsnapshot',
+            index=models.Index(fields=['organization', 'kind', '-created_at'], name='report_org_kind_created'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reportrow',
+            unique_together={('snapshot', 'position')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_admin', '0006_membership_membership_updated_id_and_more'),
+        ('app_organization', '0004_reportsnapshot_reportrow_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='organizationsection',
+            index=models.Index(fields=['updated_at', 'id'], name='section_updated_id'),
+        ),
+    ]
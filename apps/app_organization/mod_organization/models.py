@@ -31,6 +31,7 @@ class OrganizationSection(BaseModelImpl):
 
     class Meta(BaseModelImpl.Meta):
         unique_together = (('organization', 'tab', 'key'),)
+        indexes = [models.Index(fields=['updated_at', 'id'], name='section_updated_id')]
         ordering = ('tab', 'order', 'title')
         verbose_name = 'Organization section'
         verbose_name_plural = 'Organization sections'
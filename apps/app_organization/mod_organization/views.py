@@ -3,7 +3,8 @@ from django.http import HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 
 from apps.app_admin.mod_siteadmin.models import Site, Organization, Membership, Role
-from apps.app_site.mod_site.views import _is_org_admin, organization_home, organization_tab_edit_modal
+from apps.app_admin.mod_siteadmin.permissions import is_org_admin
+from apps.app_site.mod_site.views import organization_home, organization_tab_edit_modal
 
 
 @login_required
@@ -24,7 +25,7 @@ def org_portal_home(request):
 def org_portal_org_home(request, site_id: int, org_id: int):
     site = get_object_or_404(Site.objects.all(), pk=site_id)
     org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
-    if not _is_org_admin(request.user, site, org) and not request.user.is_staff:
+    if not is_org_admin(request.user, site, org) and not request.user.is_staff:
         return HttpResponseForbidden()
     # Delegate rendering to existing organization_home
     return organization_home(request, site_id=site.id, org_id=org.id)
@@ -34,7 +35,7 @@ def org_portal_org_home(request, site_id: int, org_id: int):
 def org_portal_org_edit(request, site_id: int, org_id: int):
     site = get_object_or_404(Site.objects.all(), pk=site_id)
     org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
-    if not _is_org_admin(request.user, site, org) and not request.user.is_staff:
+    if not is_org_admin(request.user, site, org) and not request.user.is_staff:
         return HttpResponseForbidden()
     # Call the bulk tab edit modal; default to overview
     request.GET = request.GET.copy()
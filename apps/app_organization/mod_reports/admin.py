@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import ReportSnapshot
+
+
+@admin.register(ReportSnapshot)
+class ReportSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("organization", "kind", "row_count", "created_at")
+    list_filter = ("kind", "organization__site")
+    readonly_fields = ("organization", "kind", "columns", "row_count", "created_at")
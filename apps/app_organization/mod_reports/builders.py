@@ -0,0 +1,102 @@
+"""Build per-organization report snapshots (membership, section completeness, construct status).
+
+Each builder returns (columns, rows); `build_snapshot` stores them as a ReportSnapshot and
+keeps only the most recent KEEP_SNAPSHOTS per organization and kind.
+"""
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+from apps.app_admin.mod_siteadmin.models import Membership
+from apps.app_constructs.models import Construct, ConstructType
+from apps.app_organization.mod_organization.models import OrganizationSection
+
+from .models import ReportRow, ReportSnapshot
+
+
+KEEP_SNAPSHOTS = 5
+
+
+def membership_by_role(org):
+    columns = ['Role', 'Active', 'Inactive', 'Total']
+    rows = []
+    qs = Membership.objects.for_site(org.site_id).for_organization(org).order_by().values('role__code', 'role__label').annotate(
+        active=Count('id', filter=Q(active=True)),
+        total=Count('id'),
+    ).order_by('role__code')
+    for r in qs:
+        rows.append([r['role__label'] or r['role__code'], r['active'], r['total'] - r['active'], r['total']])
+    return columns, rows
+
+
+def section_completeness(org):
+    columns = ['Tab', 'Sections', 'Filled', 'Empty', 'Complete %']
+    labels = dict(OrganizationSection.TAB_CHOICES)
+    stats = {
+        r['tab']: r
+        for r in OrganizationSection.objects.filter(organization=org, active=True).order_by().values('tab').annotate(
+            total=Count('id'),
+            filled=Count('id', filter=~Q(content='')),
+        )
+    }
+    rows = []
+    for tab, label in OrganizationSection.TAB_CHOICES:
+        r = stats.get(tab)
+        total = r['total'] if r else 0
+        filled = r['filled'] if r else 0
+        rows.append([labels[tab], total, filled, total - filled, round(100 * filled / total) if total else 0])
+    return columns, rows
+
+
+def construct_status(org):
+    columns = ['Type', 'Total', 'Done', 'Open', 'Blocked', 'Approved', 'Last completed']
+    stats = {
+        r['type_id']: r
+        for r in Construct.objects.for_organization(org).order_by().values('type_id').annotate(
+            total=Count('id'),
+            done=Count('id', filter=Q(done=True)),
+            blocked=Count('id', filter=Q(blocked=True)),
+            approved=Count('id', filter=Q(approved=True)),
+            last=Max('completed_at'),
+        )
+    }
+    rows = []
+    for ctype in ConstructType.all_objects.filter(pk__in=stats).order_by('position', 'name'):
+        r = stats[ctype.pk]
+        rows.append([
+            ctype.name or ctype.code, r['total'], r['done'], r['total'] - r['done'], r['blocked'], r['approved'],
+            r['last'].isoformat() if r['last'] else '',
+        ])
+    return columns, rows
+
+
+BUILDERS = {
+    'membership': membership_by_role,
+    'sections': section_completeness,
+    'constructs': construct_status,
+}
+
+
+@transaction.atomic
+def build_snapshot(org, kind: str) -> ReportSnapshot:
+    columns, rows = BUILDERS[kind](org)
+    snap = ReportSnapshot.objects.create(organization=org, kind=kind, columns=columns, row_count=len(rows))
+    ReportRow.objects.bulk_create(
+        [ReportRow(snapshot=snap, position=idx, values=values) for idx, values in enumerate(rows)],
+        batch_size=2000,
+    )
+    stale = ReportSnapshot.objects.filter(organization=org, kind=kind).values_list('id', flat=True)[KEEP_SNAPSHOTS:]
+    ReportSnapshot.objects.filter(id__in=list(stale)).delete()
+    return snap
+
+
+def build_all(org, kinds=None) -> list[ReportSnapshot]:
+    return [build_snapshot(org, kind) for kind in (kinds or BUILDERS)]
+
+
+def latest_snapshots(org) -> dict[str, ReportSnapshot]:
+    """Most recent snapshot per kind, with its rows prefetched."""
+    ids = {}
+    for pk, kind in ReportSnapshot.objects.filter(organization=org).values_list('id', 'kind')[:len(BUILDERS) * KEEP_SNAPSHOTS]:
+        ids.setdefault(kind, pk)
+    snaps = ReportSnapshot.objects.filter(id__in=ids.values()).prefetch_related('rows')
+    return {snap.kind: snap for snap in snaps}
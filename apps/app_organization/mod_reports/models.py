@@ -0,0 +1,41 @@
+from django.db import models
+
+from apps.app_admin.mod_siteadmin.models import Organization
+
+
+class ReportSnapshot(models.Model):
+    """A precomputed organization report. Rows are stored once at build time so that viewing
+    or downloading a report never aggregates live data.
+    """
+    KIND_CHOICES = (
+        ('membership', 'Membership by role'),
+        ('sections', 'Section completeness'),
+        ('constructs', 'Construct status by type'),
+    )
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='report_snapshots')
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    columns = models.JSONField(default=list)
+    row_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('-created_at', '-id')
+        indexes = [models.Index(fields=['organization', 'kind', '-created_at'], name='report_org_kind_created')]
+        verbose_name = 'Report snapshot'
+        verbose_name_plural = 'Report snapshots'
+
+    def __str__(self):
+        return f"{self.organization} [{self.kind}] {self.created_at:%Y-%m-%d %H:%M}"
+
+
+class ReportRow(models.Model):
+    snapshot = models.ForeignKey(ReportSnapshot, on_delete=models.CASCADE, related_name='rows')
+    position = models.PositiveIntegerField()
+    # Cell values in the order of snapshot.columns
+    values = models.JSONField(default=list)
+
+    class Meta:
+        ordering = ('snapshot', 'position')
+        unique_together = (('snapshot', 'position'),)
+        verbose_name = 'Report row'
+        verbose_name_plural = 'Report rows'
@@ -0,0 +1,60 @@
+import csv
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponseForbidden, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.utils.text import slugify
+from django.views.decorators.http import require_http_methods
+
+from apps.app_admin.mod_siteadmin.models import Site, Organization
+from apps.app_admin.mod_siteadmin.permissions import is_org_admin, is_site_admin
+
+from .builders import BUILDERS, build_all
+from .models import ReportRow, ReportSnapshot
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def _stream_csv(snapshot: ReportSnapshot):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(snapshot.columns)
+    rows = ReportRow.objects.filter(snapshot=snapshot).order_by('position').values_list('values', flat=True)
+    for values in rows.iterator(chunk_size=2000):
+        yield writer.writerow(values)
+
+
+@login_required
+@require_http_methods(["GET"])
+def report_csv(request, site_id: int, org_id: int, kind: str):
+    site = get_object_or_404(Site.objects.all(), pk=site_id)
+    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
+    if not (is_site_admin(request.user, site) or is_org_admin(request.user, site, org)):
+        return HttpResponseForbidden()
+    if kind not in BUILDERS:
+        raise Http404()
+    snapshot = ReportSnapshot.objects.filter(organization=org, kind=kind).first()
+    if snapshot is None:
+        raise Http404("No snapshot built yet")
+    response = StreamingHttpResponse(_stream_csv(snapshot), content_type='text/csv')
+    stamp = snapshot.created_at.strftime('%Y%m%d-%H%M')
+    name = org.slug or slugify(org.name) or f'org-{org.pk}'
+    response['Content-Disposition'] = f'attachment; filename="{name}-{kind}-{stamp}.csv"'
+    return response
+
+
+@login_required
+@require_http_methods(["POST"])
+def report_refresh(request, site_id: int, org_id: int):
+    """Build fresh snapshots for one organization on demand (the scheduled path is build_org_reports)."""
+    site = get_object_or_404(Site.objects.all(), pk=site_id)
+    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
+    if not (is_site_admin(request.user, site) or is_org_admin(request.user, site, org)):
+        return HttpResponseForbidden()
+    build_all(org)
+    return redirect(reverse('siteadmin_org_home', args=[site.id, org.id]) + '?tab=reports')
@@ -5,3 +5,7 @@ class AppSiteConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.app_site'
     verbose_name = 'Sites'
+
+    def ready(self):
+        from .mod_site import events
+        events.connect()
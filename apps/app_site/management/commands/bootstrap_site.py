@@ -6,6 +6,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from apps.app_0.mod_0.gencache import batched
 from apps.app_admin.mod_siteadmin.models import Site, Organization, Role, Membership
 
 
@@ -32,8 +33,12 @@ class Command(BaseCommand):
             u.save()
             return u
 
-    @transaction.atomic
     def handle(self, *args, **options):
+        # One cache bump per namespace for the whole file instead of one per saved row
+        with transaction.atomic(), batched():
+            self.bootstrap(options)
+
+    def bootstrap(self, options):
         path = Path(options['json_file'])
         if not path.exists():
             raise CommandError(f"File not found: {path}")
@@ -0,0 +1,280 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import chain, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.app_0.mod_0 import gencache
+from apps.app_admin.mod_siteadmin.models import Site, Organization, Role, Membership
+from apps.app_constructs.models import Construct, ConstructRollup, ConstructType
+from apps.app_constructs.rollups import compute_rollups
+from apps.app_organization.mod_organization.models import OrganizationSection
+
+
+User = get_user_model()
+
+# Roughly 100, 10k and 1M rows in total (constructs count twice: the row and its rollup)
+SIZES = {
+    'small': dict(sites=1, orgs=2, users=20, site_admins=1, org_admins=1, members=10,
+                  sections=1, roots=1, depth=2, fanout=3),
+    'medium': dict(sites=2, orgs=20, users=500, site_admins=2, org_admins=2, members=40,
+                   sections=2, roots=3, depth=3, fanout=6),
+    'large': dict(sites=10, orgs=50, users=20000, site_admins=5, org_admins=3, members=300,
+                  sections=4, roots=3, depth=4, fanout=6),
+}
+DEFAULT_TYPES = ('Portfolio', 'Program', 'Project', 'Team')
+CHUNK = 20000
+
+
+def _chunks(iterable, size: int = CHUNK):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _max_id(manager) -> int:
+    return manager.aggregate(m=Max('pk'))['m'] or 0
+
+
+class Command(BaseCommand):
+    help = ("Generate a deterministic synthetic dataset (sites, organizations, users, memberships, sections "
+            "and construct trees) with bulk inserts, for benchmarking and profiling at production scale")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', choices=sorted(SIZES), default='small',
+                            help='Preset (small ≈ 100 rows, medium ≈ 10k, large ≈ 1M); options below override it')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed; the same seed yields the same rows')
+        parser.add_argument('--prefix', default='load', help='Prefix of generated site slugs and usernames')
+        parser.add_argument('--flush', action='store_true', help='Hard delete data generated earlier with this prefix first')
+        parser.add_argument('--sites', type=int)
+        parser.add_argument('--orgs', type=int, help='Organizations per site')
+        parser.add_argument('--users', type=int, help='Size of the user pool memberships are drawn from')
+        parser.add_argument('--site-admins', type=int, help='Site admin memberships per site')
+        parser.add_argument('--org-admins', type=int, help='Org admin memberships per organization')
+        parser.add_argument('--members', type=int, help='Member memberships per organization')
+        parser.add_argument('--sections', type=int, help='Sections per tab per organization')
+        parser.add_argument('--roots', type=int, help='Construct trees per organization')
+        parser.add_argument('--depth', type=int, help='Levels per construct tree (1 = roots only)')
+        parser.add_argument('--fanout', type=int, help='Children per construct')
+
+    def handle(self, *args, **options):
+        cfg = dict(SIZES[options['size']])
+        cfg.update({k: options[k] for k in cfg if options.get(k) is not None})
+        for role in ('site_admins', 'org_admins', 'members'):
+            if cfg[role] > cfg['users']:
+                raise CommandError(f"--{role.replace('_', '-')} ({cfg[role]}) exceeds --users ({cfg['users']})")
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.now = timezone.now()
+        started = time.perf_counter()
+
+        if options['flush']:
+            self.flush()
+        if (Site.all_objects.filter(slug__startswith=f'{self.prefix}-').exists()
+                or User.objects.filter(username__startswith=f'{self.prefix}_u').exists()):
+            raise CommandError(f"Data with prefix '{self.prefix}' already exists; use --flush or another --prefix")
+
+        self.counts = {}
+        with self.fast_inserts(), transaction.atomic():
+            roles = {code: Role.objects.get_or_create(code=code, defaults={'label': label})[0]
+                     for code, label in Role.ROLE_CHOICES}
+            types = list(ConstructType.objects.order_by('position', 'id')[:len(DEFAULT_TYPES)])
+            if not types:
+                types = [ConstructType.objects.create(name=name, position=(i + 1) * 10)
+                         for i, name in enumerate(DEFAULT_TYPES)]
+            user_ids = self.create_users(cfg)
+            orgs = self.create_sites(cfg)
+            self.create_memberships(cfg, orgs, user_ids, roles)
+            self.create_sections(cfg, orgs)
+            self.create_constructs(cfg, orgs, types)
+
+        elapsed = time.perf_counter() - started
+        total = sum(self.counts.values())
+        for label, count in self.counts.items():
+            self.stdout.write(f"  {label:<16} {count:>10}")
+        self.stdout.write(self.style.SUCCESS(f"Generated {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)."))
+
+    @contextmanager
+    def fast_inserts(self):
+        """On SQLite, skip fsyncs for the duration of the load (the data is disposable). Not
+        possible inside a transaction (e.g. when called from a test case); the load then runs as is.
+        """
+        restore = []
+        if connection.vendor == 'sqlite' and not connection.in_atomic_block:
+            with connection.cursor() as cursor:
+                for pragma, value in (('synchronous', 'OFF'), ('cache_size', '-200000')):
+                    cursor.execute(f'PRAGMA {pragma}')
+                    restore.append((pragma, cursor.fetchone()[0]))
+                    cursor.execute(f'PRAGMA {pragma} = {value}')
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                for pragma, value in restore:
+                    cursor.execute(f'PRAGMA {pragma} = {value}')
+
+    def flush(self):
+        with transaction.atomic(), gencache.batched():
+            sites = Site.all_objects.filter(slug__startswith=f'{self.prefix}-')
+            org_ids = Organization.all_objects.filter(site__in=sites).values('id')
+            # Constructs first: PROTECT on type and the self-referencing cascade make the
+            # collector walk them one level at a time otherwise
+            Construct.all_objects.filter(organization_id__in=org_ids).update(parent=None)
+            Construct.all_objects.filter(organization_id__in=org_ids).hard_delete()
+            deleted, _ = sites.hard_delete()
+            users, _ = User.objects.filter(username__startswith=f'{self.prefix}_u').delete()
+        self.stdout.write(f"Flushed {deleted} rows under '{self.prefix}-' sites and {users} user rows.")
+
+    def bulk(self, label: str, model, objs):
+        count = 0
+        for chunk in _chunks(objs):
+            model.objects.bulk_create(chunk)
+            count += len(chunk)
+        self.counts[label] = self.counts.get(label, 0) + count
+
+    def insert(self, label: str, model, rows):
+        """Plain executemany for the high-volume tables. `rows` are dicts keyed by attname; columns a
+        row leaves out get the field default (auto_now fields: now), prepared once per table rather
+        than once per value as bulk_create does.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return
+        fields = model._meta.concrete_fields
+        given = [f for f in fields if f.attname in first]
+        template = {}
+        for f in fields:
+            if f.attname not in first:
+                value = self.now if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False) else f.get_default()
+                template[f.attname] = f.get_db_prep_save(value, connection)
+        # Values other than these go through the field (datetimes, JSON)
+        raw = (int, str, type(None))
+        columns = [f.column for f in given] + [f.column for f in fields if f.attname in template]
+        tail = tuple(template.values())
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(connection.ops.quote_name(c) for c in columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+        count = 0
+        with connection.cursor() as cursor:
+            for chunk in _chunks(chain([first], rows)):
+                params = [
+                    tuple(v if isinstance(v, raw) else f.get_db_prep_save(v, connection)
+                          for f, v in ((f, row[f.attname]) for f in given)) + tail
+                    for row in chunk
+                ]
+                cursor.executemany(sql, params)
+                count += len(params)
+        self.counts[label] = self.counts.get(label, 0) + count
+
+    def create_users(self, cfg) -> list[int]:
+        # Hashing is deliberately slow; every generated user shares one hash (the password is --prefix)
+        password = make_password(self.prefix)
+        start = _max_id(User.objects) + 1
+        ids = list(range(start, start + cfg['users']))
+        self.bulk('users', User, (
+            User(pk=pk, username=f'{self.prefix}_u{n:07d}', email=f'{self.prefix}_u{n:07d}@example.com',
+                 password=password, is_active=True)
+            for n, pk in enumerate(ids)
+        ))
+        return ids
+
+    def create_sites(self, cfg) -> list[tuple[int, int]]:
+        """Returns [(site id, org id)]."""
+        site_start = _max_id(Site.all_objects) + 1
+        org_id = _max_id(Organization.all_objects)
+        sites, orgs, pairs = [], [], []
+        for s in range(cfg['sites']):
+            site_id = site_start + s
+            sites.append(Site(pk=site_id, name=f'{self.prefix} site {s:04d}', slug=f'{self.prefix}-site-{s:04d}',
+                              description='Generated load-test site', position=s))
+            for o in range(cfg['orgs']):
+                org_id += 1
+                orgs.append(Organization(pk=org_id, site_id=site_id, name=f'Org {o:05d}', slug=f'org-{o:05d}',
+                                         description='Generated organization', position=o))
+                pairs.append((site_id, org_id))
+        self.bulk('sites', Site, sites)
+        self.bulk('organizations', Organization, orgs)
+        return pairs
+
+    def create_memberships(self, cfg, orgs, user_ids, roles):
+        rng, users = self.rng, len(user_ids)
+
+        def rows():
+            site_ids = sorted({site_id for site_id, _ in orgs})
+            for site_id in site_ids:
+                for n in rng.sample(range(users), cfg['site_admins']):
+                    yield {'user_id': user_ids[n], 'site_id': site_id, 'organization_id': None,
+                           'role_id': roles['siteadmin'].pk}
+            for site_id, org_id in orgs:
+                for role, count in ((roles['orgadmin'], cfg['org_admins']), (roles['member'], cfg['members'])):
+                    for n in rng.sample(range(users), count):
+                        yield {'user_id': user_ids[n], 'site_id': site_id, 'organization_id': org_id, 'role_id': role.pk}
+
+        self.insert('memberships', Membership, rows())
+
+    def create_sections(self, cfg, orgs):
+        self.bulk('sections', OrganizationSection, (
+            OrganizationSection(organization_id=org_id, tab=tab, key=f'section-{n}', title=f'{label} {n}',
+                                content=f'Generated {tab} content {n}', order=n, position=n)
+            for _, org_id in orgs
+            for tab, label in OrganizationSection.TAB_CHOICES
+            for n in range(cfg['sections'])
+        ))
+
+    def create_constructs(self, cfg, orgs, types):
+        """Breadth-first trees with explicit ids, so children reference parents without a round trip.
+        Rollups are aggregated in memory per organization instead of propagated per save.
+        """
+        rng = self.rng
+        next_id = _max_id(Construct.all_objects)
+        for chunk in _chunks(orgs, 50):
+            constructs = []
+            for site_id, org_id in chunk:
+                level = []
+                for r in range(cfg['roots']):
+                    next_id += 1
+                    level.append(next_id)
+                    constructs.append(self.construct(next_id, site_id, org_id, None, types[0], f'T{r}', rng))
+                for depth in range(1, cfg['depth']):
+                    children = []
+                    for parent_id in level:
+                        for c in range(cfg['fanout']):
+                            next_id += 1
+                            children.append(next_id)
+                            constructs.append(self.construct(
+                                next_id, site_id, org_id, parent_id, types[depth % len(types)], f'{parent_id}.{c}', rng,
+                            ))
+                    level = children
+            self.insert('constructs', Construct, constructs)
+            self.insert('construct rollups', ConstructRollup, (
+                {'construct_id': pk, 'descendant_count': c.count, 'type_counts': c.types, 'done_count': c.done,
+                 'blocked_count': c.blocked, 'approved_count': c.approved, 'latest_completed_at': c.latest}
+                for pk, c in compute_rollups(constructs).items()
+            ))
+
+    def construct(self, pk, site_id, org_id, parent_id, ctype, label, rng) -> dict:
+        """Row of a construct; carries `id` and the rollup TRACKED_FIELDS for compute_rollups().
+        Created within the past year; done ones complete 0.5-60 days later (never in the future),
+        so cycle times are positive.
+        """
+        done = rng.random() < 0.4
+        age = timedelta(days=rng.uniform(1, 365))
+        created_at = self.now - age
+        completed_at = created_at + min(timedelta(days=rng.uniform(0.5, 60)), age) if done else None
+        return {
+            'id': pk, 'site_id': site_id, 'organization_id': org_id, 'parent_id': parent_id, 'type_id': ctype.pk,
+            'name': f'{ctype.name} {label}', 'external_id': f'gen-{pk}', 'deleted': False,
+            'created_at': created_at, 'done': done, 'done_at': completed_at, 'completed_at': completed_at,
+            'blocked': not done and rng.random() < 0.1,
+            'approved': rng.random() < 0.5,
+        }
@@ -0,0 +1,166 @@
+"""Live site change events for the siteadmin pages (Server-Sent Events).
+
+Two sources feed a site's event stream:
+
+* an in-process broadcaster, fed by post_save signals after commit, which delivers changes
+  made by the same process immediately;
+* polling of the change feed (apis.api_v1.changes) every SITE_EVENTS_POLL_SECONDS, which
+  catches writes made by other processes and bulk statements that send no signals.
+
+Events from both sources are de-duplicated per stream. After each poll the stream sends an
+SSE `id` holding the change-feed cursor, so a reconnecting EventSource resumes from a durable
+position.
+"""
+import asyncio
+import json
+import threading
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from apps.app_admin.mod_siteadmin.models import Site, Organization, Membership
+from apps.app_organization.mod_organization.models import Organization as OrganizationProxy, OrganizationSection
+
+
+EVENT_TYPES = ('site', 'organization', 'membership', 'section')
+QUEUE_SIZE = 1000
+SEEN_SIZE = 2000
+
+
+def poll_seconds() -> float:
+    """0 disables polling (single-process deployments rely on the broadcaster alone)."""
+    return float(getattr(settings, 'SITE_EVENTS_POLL_SECONDS', 5))
+
+
+class Broadcaster:
+    """Fan-out of events to the asyncio queues of open streams, per site (None: every site).
+    publish() is thread-safe: sync views and signal handlers hand events to each stream's
+    event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[int | None, set] = defaultdict(set)
+
+    def subscribe(self, site_ids) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            for site_id in site_ids:
+                self._subscribers[site_id].add(entry)
+        return queue
+
+    def unsubscribe(self, site_ids, queue: asyncio.Queue):
+        with self._lock:
+            for site_id in site_ids:
+                subs = self._subscribers.get(site_id, set())
+                subs.difference_update({entry for entry in subs if entry[1] is queue})
+                if not subs:
+                    self._subscribers.pop(site_id, None)
+
+    def has_subscribers(self) -> bool:
+        # Read without the lock: a stream opened meanwhile catches up on its next poll
+        return bool(self._subscribers)
+
+    def publish(self, site_id: int, event: dict):
+        with self._lock:
+            targets = self._subscribers.get(site_id, set()) | self._subscribers.get(None, set())
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(_offer, queue, event)
+
+
+def _offer(queue: asyncio.Queue, event: dict):
+    # A slow client drops live events; the next poll delivers them again
+    if not queue.full():
+        queue.put_nowait(event)
+
+
+broadcaster = Broadcaster()
+
+
+def event_from_change(change: dict, site_id: int | None = None) -> dict:
+    """Compact event from a change-feed item; clients re-fetch what they need. Without
+    `site_id` the site is taken from the item (unknown for sections and tombstones).
+    """
+    data = change.get('data') or {}
+    if site_id is None:
+        site_id = change['id'] if change['type'] == 'site' else data.get('site')
+    if change['deleted']:
+        action = 'deleted'
+    else:
+        action = 'created' if change.get('created') else 'updated'
+    return {
+        "type": change['type'],
+        "id": change['id'],
+        "site": site_id,
+        "action": action,
+        "organization": data.get('organization') if change['type'] != 'organization' else change['id'],
+        "name": data.get('title') or data.get('name'),
+        "updated_at": change['updated_at'],
+    }
+
+
+def event_key(event: dict) -> tuple:
+    return event['type'], event['id'], event['updated_at']
+
+
+class SeenEvents:
+    """Bounded set of recently sent event keys (de-duplicates the two sources)."""
+
+    def __init__(self, size: int = SEEN_SIZE):
+        self._keys = OrderedDict()
+        self._size = size
+
+    def add(self, event: dict) -> bool:
+        """True when the event is new."""
+        key = event_key(event)
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self._size:
+            self._keys.popitem(last=False)
+        return True
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+# -- signal handlers ----------------------------------------------------------------------
+def _site_id(instance) -> int | None:
+    if isinstance(instance, Site):
+        return instance.pk
+    if isinstance(instance, OrganizationSection):
+        if OrganizationSection.organization.is_cached(instance):
+            return instance.organization.site_id
+        return Organization.all_objects.filter(pk=instance.organization_id).values_list('site_id', flat=True).first()
+    return instance.site_id
+
+
+def _on_save(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw or not broadcaster.has_subscribers():
+        return
+    site_id = _site_id(instance)
+    if site_id is None:
+        return
+    name = {Site: 'site', Organization: 'organization', Membership: 'membership', OrganizationSection: 'section'}[sender._meta.concrete_model]
+    change = {
+        "type": name,
+        "id": instance.pk,
+        "created": created,
+        "deleted": instance.deleted,
+        "updated_at": instance.updated_at.isoformat() if instance.updated_at else None,
+        "data": {
+            "organization": getattr(instance, 'organization_id', None),
+            "name": getattr(instance, 'title', None) or instance.name,
+        },
+    }
+    event = event_from_change(change, site_id)
+    transaction.on_commit(lambda: broadcaster.publish(site_id, event), using=using)
+
+
+def connect():
+    for model in (Site, Organization, OrganizationProxy, Membership, OrganizationSection):
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'site_events_{model._meta.label}')
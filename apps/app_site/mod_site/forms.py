@@ -86,7 +86,10 @@ class MembershipForm(forms.ModelForm):
             except Role.DoesNotExist:
                 pass
         if site is not None:
-            self.fields["organization"].queryset = Organization.objects.filter(site=site, active=True).order_by("name")
+            # Option labels (Organization.__str__) include the site
+            self.fields["organization"].queryset = (
+                Organization.objects.for_site(site).filter(active=True).select_related("site").order_by("name")
+            )
         # Allow empty organization (site-level membership)
         self.fields["organization"].required = False
 
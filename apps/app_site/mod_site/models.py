@@ -14,4 +14,4 @@ class Site(BaseSite):
             role = Role.objects.get(code='siteadmin')
         except Role.DoesNotExist:
             return []
-        return [m.user for m in Membership.objects.filter(site=self, organization__isnull=True, role=role, active=True)]
+        return [m.user for m in Membership.objects.for_site(self).filter(organization__isnull=True, role=role, active=True)]
@@ -1,7 +1,10 @@
 from django.urls import path
+from apps.app_organization.mod_reports.views import report_csv, report_refresh
 from .views import (
     dashboard,
+    dashboard_events,
     site_detail,
+    site_events,
     organization_detail,
     organization_home,
     site_create_modal,
@@ -30,9 +33,13 @@ from .views import (
 
 urlpatterns = [
     path('', dashboard, name='siteadmin_dashboard'),
+    path('events/', dashboard_events, name='siteadmin_dashboard_events'),
     path('<int:site_id>/', site_detail, name='siteadmin_detail'),
+    path('<int:site_id>/events/', site_events, name='siteadmin_site_events'),
     path('<int:site_id>/orgs/<int:org_id>/', organization_detail, name='siteadmin_org_detail'),
     path('<int:site_id>/orgs/<int:org_id>/home/', organization_home, name='siteadmin_org_home'),
+    path('<int:site_id>/orgs/<int:org_id>/reports/refresh/', report_refresh, name='siteadmin_org_report_refresh'),
+    path('<int:site_id>/orgs/<int:org_id>/reports/<slug:kind>.csv', report_csv, name='siteadmin_org_report_csv'),
     path('<int:site_id>/orgs/bulk-admin/', org_list_bulk_admin, name='siteadmin_org_bulk_admin'),
     path('<int:site_id>/orgs/<int:org_id>/delete/', org_soft_delete, name='siteadmin_org_delete'),
     path('<int:site_id>/orgs/<int:org_id>/restore/', org_restore, name='siteadmin_org_restore'),
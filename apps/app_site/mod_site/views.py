@@ -1,18 +1,36 @@
+import asyncio
+from collections import defaultdict
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.utils import timezone
 from django.utils.text import slugify
 from django.template.loader import render_to_string
 from django.views.decorators.http import require_http_methods
 from django.core.paginator import Paginator
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 
+from apis.api_v1.changes import SETTLE_SECONDS, _parse_since, read_changes
+from apis.api_v1.pagination import PageError, encode_cursor
+from apps.app_0.mod_0.gencache import batched, bump, cached, get_or_set, model_ns, org_ns, site_ns
 from apps.app_admin.mod_siteadmin.models import Site, Organization, Membership, Role
+from apps.app_admin.mod_siteadmin.permissions import is_org_admin, is_site_admin
+from apps.app_constructs.delivery import delivery_tab
+from apps.app_constructs.flow_metrics import flow_metrics
 from apps.app_organization.mod_organization.models import OrganizationSection, OrganizationTypeOption
+from apps.app_organization.mod_reports.builders import latest_snapshots
+from apps.app_organization.mod_reports.models import ReportSnapshot
 from apps.app_organization.mod_organization.forms import (
     OrganizationSectionForm,
     OrganizationSectionTypeForm,
     OrganizationTypeOptionForm,
 )
+from .events import EVENT_TYPES, SeenEvents, broadcaster, event_from_change, format_sse, poll_seconds
 from .forms import SiteForm, OrganizationForm, MembershipForm, BulkOrgAdminForm
 
 
@@ -20,28 +38,64 @@ def _is_staff(user):
     return user.is_authenticated and (user.is_staff or user.is_superuser)
 
 
-def _is_site_admin(user, site: Site | None = None) -> bool:
-    if not user.is_authenticated:
-        return False
-    if user.is_superuser or user.is_staff:
-        return True
-    if site is None:
-        return False
-    role = Role.objects.filter(code='siteadmin').first()
-    if not role:
-        return False
-    return Membership.objects.filter(user=user, site=site, organization__isnull=True, role=role, active=True).exists()
+# Sections every organization gets on first visit of these tabs
+DEFAULT_SECTION_TITLES = {
+    'overview': ['Vision', 'Mission', 'Value', 'Strategy', 'Structure', 'Type', 'Summary'],
+    'delivery': ['Portfolio', 'Program', 'Projects / Products / Services'],
+}
 
 
-def _is_org_admin(user, site: Site, org: Organization) -> bool:
-    role = Role.objects.filter(code='orgadmin').first()
-    if not role:
-        return False
-    return Membership.objects.filter(user=user, site=site, organization=org, role=role, active=True).exists()
+def _ensure_default_sections(org: Organization, tab: str):
+    """Create missing baseline sections of `tab` and restore soft-deleted ones; a single query
+    when they are all in place.
+    """
+    titles = DEFAULT_SECTION_TITLES.get(tab)
+    if not titles:
+        return
+    wanted = {slugify(title)[:64]: (idx, title) for idx, title in enumerate(titles)}
+    existing = dict(
+        OrganizationSection.all_objects.filter(organization=org, tab=tab, key__in=wanted).values_list('key', 'deleted')
+    )
+    deleted = [key for key, is_deleted in existing.items() if is_deleted]
+    if deleted:
+        OrganizationSection.all_objects.filter(organization=org, tab=tab, key__in=deleted).update(
+            deleted=False, active=True, updated_at=timezone.now(),
+        )
+    missing = [
+        # Canonical order index; an existing section keeps its order
+        OrganizationSection(organization=org, tab=tab, key=key, title=title, order=idx)
+        for key, (idx, title) in wanted.items() if key not in existing
+    ]
+    if missing:
+        OrganizationSection.objects.bulk_create(missing, ignore_conflicts=True)
+    if deleted or missing:
+        bump(org_ns(org.pk), org_ns(org.pk, OrganizationSection))
+
+
+def _count_per_site(qs):
+    """Correlated COUNT(*) of `qs` rows per outer site, for annotate()."""
+    counts = qs.filter(site=OuterRef('pk')).order_by().values('site').annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts), 0)
+
+
+def _site_counts(site_ids: list[int]) -> dict[int, tuple[int, int]]:
+    """{site id: (organizations, active memberships)}, cached until an organization or a
+    membership of one of the sites changes.
+    """
+    def compute():
+        rows = Site.all_objects.filter(pk__in=site_ids).annotate(
+            org_count=_count_per_site(Organization.objects.all()),
+            member_count=_count_per_site(Membership.objects.filter(active=True)),
+        ).values_list('pk', 'org_count', 'member_count')
+        return {pk: (orgs, members) for pk, orgs, members in rows}
+
+    depends_on = [site_ns(pk, model) for pk in site_ids for model in (Organization, Membership)]
+    return get_or_set(f"siteadmin:site_counts:{','.join(map(str, site_ids))}", depends_on, compute)
 
 
 @login_required
 def dashboard(request):
+    """Site list with admin and count columns (sync, like the other siteadmin views)."""
     # Staff sees all sites; site admins see their sites; others forbidden
     if request.user.is_staff or request.user.is_superuser:
         sites = Site.objects.all().order_by('name')
@@ -66,25 +120,26 @@ def dashboard(request):
         ).distinct().filter(blocked=False).order_by('name')
 
     role_siteadmin = Role.objects.filter(code='siteadmin').first()
-    data = []
-    for s in sites:
-        admins_qs = Membership.objects.filter(site=s, organization__isnull=True, role=role_siteadmin, active=True) if role_siteadmin else Membership.objects.none()
-        org_count = s.organizations.count()
-        member_count = Membership.objects.filter(site=s, active=True).count()
-        data.append({
+    admins = Membership.objects.filter(organization__isnull=True, role=role_siteadmin, active=True).select_related('user')
+    sites = list(sites.prefetch_related(
+        Prefetch('memberships', queryset=admins if role_siteadmin else admins.none(), to_attr='admin_memberships')
+    ))
+    counts = _site_counts([s.pk for s in sites])
+    data = [
+        {
             'site': s,
-            'admins': [m.user for m in admins_qs],
-            'org_count': org_count,
-            'member_count': member_count,
-        })
+            'admins': [m.user for m in s.admin_memberships],
+            'org_count': counts[s.pk][0],
+            'member_count': counts[s.pk][1],
+        }
+        for s in sites
+    ]
 
     # Deleted items (recycle bin) - keep minimal info
-    deleted_items = []
-    for s in deleted_sites_qs:
-        deleted_items.append({
-            'site': s,
-            'org_count': s.organizations.count(),
-        })
+    deleted_items = [
+        {'site': s, 'org_count': s.org_count}
+        for s in deleted_sites_qs.annotate(org_count=_count_per_site(Organization.objects.all()))
+    ]
 
     view_mode = request.GET.get('view', 'card')
     if view_mode not in {'card', 'table'}:
@@ -128,18 +183,39 @@ def dashboard(request):
     return render(request, 'app_site/siteadmin/dashboard.html', ctx)
 
 
+@cached(lambda site: [site_ns(site.pk, Organization), site_ns(site.pk, Membership)])
+def _site_summary(site: Site) -> dict:
+    """Counts and per-organization admin usernames for the site page. Usernames are not in the
+    site namespaces; a rename shows up once the soft TTL lapses.
+    """
+    org_admins = defaultdict(list)
+    for org_id, username in Membership.objects.for_site(site).filter(
+        organization__isnull=False, role__code='orgadmin', active=True,
+    ).order_by('user__username').values_list('organization_id', 'user__username'):
+        org_admins[org_id].append(username)
+    return {
+        'org_count': Organization.objects.for_site(site).count(),
+        'member_count': Membership.objects.for_site(site).filter(active=True).count(),
+        'orgs_deleted_count': Organization.all_objects.dead().for_site(site).count(),
+        'org_admins': dict(org_admins),
+    }
+
+
 @login_required
 def site_detail(request, site_id: int):
     s = get_object_or_404(Site.objects.all(), pk=site_id)
-    if not _is_site_admin(request.user, s):
+    if not is_site_admin(request.user, s):
         return HttpResponseForbidden()
     role_siteadmin = Role.objects.filter(code='siteadmin').first()
     role_orgadmin = Role.objects.filter(code='orgadmin').first()
 
-    admins_qs = Membership.objects.select_related('user').filter(site=s, organization__isnull=True, role=role_siteadmin, active=True) if role_siteadmin else Membership.objects.none()
-    members_qs = Membership.objects.select_related('user', 'organization', 'role').filter(site=s, active=True)
-    orgs = Organization.objects.filter(site=s).order_by('name')
-    orgs_deleted_qs = Organization.all_objects.dead().filter(site=s).order_by('name')
+    admins_qs = Membership.objects.for_site(s).filter(organization__isnull=True, role=role_siteadmin, active=True).select_related('user') if role_siteadmin else Membership.objects.none()
+    members_qs = Membership.objects.for_site(s).filter(active=True).select_related('user', 'organization', 'role')
+    summary = _site_summary(s)
+    orgs = list(Organization.objects.for_site(s).order_by('name'))
+    for o in orgs:
+        o.admin_usernames = summary['org_admins'].get(o.pk, [])
+    orgs_deleted_qs = Organization.all_objects.dead().for_site(s).order_by('name')
     org_show_bin = request.GET.get('org_bin') == '1'
     # Determine which tab to show initially (default to overview)
     active_tab = request.GET.get('tab', 'overview').lower()
@@ -155,21 +231,127 @@ def site_detail(request, site_id: int):
         'role_orgadmin': role_orgadmin,
         'active_tab': active_tab,
     'orgs_deleted': orgs_deleted_qs,
-    'orgs_deleted_count': orgs_deleted_qs.count(),
+    'orgs_deleted_count': summary['orgs_deleted_count'],
     'org_show_bin': org_show_bin,
+        'summary': summary,
     }
     return render(request, 'app_site/siteadmin/site_detail.html', context)
 
 
 # Organization detail view
+# ----- Live site events (Server-Sent Events) -----
+EVENTS_STREAM_SECONDS = 300
+EVENTS_HEARTBEAT_SECONDS = 15
+
+
+def _cursor_token(cursor) -> str:
+    return encode_cursor([cursor[0].isoformat(), cursor[1], cursor[2]])
+
+
+async def _poll_events(user, site_ids, cursor, seen: SeenEvents):
+    """One change-feed read for the sites (None: every site in the user's scope): (SSE chunk, new cursor)."""
+    items, new_cursor, _ = await sync_to_async(read_changes)(user, cursor, 200, types=set(EVENT_TYPES), site_ids=site_ids)
+    site_id = site_ids[0] if site_ids is not None and len(site_ids) == 1 else None
+    chunk = ''.join(
+        format_sse(event) for event in (event_from_change(item, site_id) for item in items) if seen.add(event)
+    )
+    if new_cursor != cursor:
+        # id-only message: moves the client's Last-Event-ID to the durable feed position
+        chunk += f"id: {_cursor_token(new_cursor)}\n\n"
+    return chunk, new_cursor
+
+
+async def _event_stream(user, site_ids, cursor):
+    loop = asyncio.get_running_loop()
+    keys = [None] if site_ids is None else site_ids
+    queue = broadcaster.subscribe(keys)
+    seen = SeenEvents()
+    interval = poll_seconds()
+    deadline = loop.time() + EVENTS_STREAM_SECONDS
+    next_poll = loop.time()
+    try:
+        yield "retry: 3000\n\n"
+        while loop.time() < deadline:
+            if interval and loop.time() >= next_poll:
+                chunk, cursor = await _poll_events(user, site_ids, cursor, seen)
+                if chunk:
+                    yield chunk
+                next_poll = loop.time() + interval
+            wait = EVENTS_HEARTBEAT_SECONDS
+            if interval:
+                wait = min(wait, max(next_poll - loop.time(), 0))
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=wait)
+            except asyncio.TimeoutError:
+                if not interval or loop.time() < next_poll:
+                    yield ": ping\n\n"
+                continue
+            if seen.add(event):
+                yield format_sse(event)
+    finally:
+        broadcaster.unsubscribe(keys, queue)
+
+
+@login_required
+async def site_events(request, site_id: int):
+    """Stream site-scoped change events. The stream ends after EVENTS_STREAM_SECONDS and the
+    browser reconnects with Last-Event-ID. Under WSGI one poll is answered per request instead.
+    """
+    user = await request.auser()
+    site = await Site.objects.filter(pk=site_id).afirst()
+    if site is None:
+        return JsonResponse({"error": "Not found"}, status=404)
+    if not await sync_to_async(is_site_admin)(user, site):
+        return HttpResponseForbidden()
+    return await _events_response(request, user, [site.id])
+
+
+@login_required
+async def dashboard_events(request):
+    """Stream change events of every site the user administers, for the dashboard (staff:
+    all sites, so sites created after the page loaded are announced too).
+    """
+    user = await request.auser()
+    if user.is_staff or user.is_superuser:
+        site_ids = None
+    else:
+        role = await Role.objects.filter(code='siteadmin').afirst()
+        site_ids = [] if role is None else [
+            pk async for pk in Membership.objects.filter(
+                user=user, role=role, organization__isnull=True, active=True, site__deleted=False,
+            ).values_list('site_id', flat=True).distinct()
+        ]
+        if not site_ids:
+            return HttpResponseForbidden()
+    return await _events_response(request, user, site_ids)
+
+
+async def _events_response(request, user, site_ids):
+    try:
+        cursor = _parse_since(request.headers.get('Last-Event-ID') or request.GET.get('since'))
+    except PageError:
+        cursor = None
+    if cursor is None:
+        cursor = (timezone.now() - timedelta(seconds=SETTLE_SECONDS), 0, 0)
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(_event_stream(user, site_ids, cursor), content_type='text/event-stream')
+    else:
+        chunk, cursor = await _poll_events(user, site_ids, cursor, SeenEvents())
+        retry = int(max(poll_seconds(), 1) * 1000)
+        response = HttpResponse(f"retry: {retry}\n\n{chunk}id: {_cursor_token(cursor)}\n\n", content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
 def organization_detail(request, site_id: int, org_id: int):
     site = get_object_or_404(Site.objects.all(), pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
-    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
+    org = get_object_or_404(Organization.objects.for_site(site), pk=org_id)
     role_orgadmin = Role.objects.filter(code='orgadmin').first()
-    members_qs = Membership.objects.select_related('user', 'role').filter(site=site, organization=org, active=True)
+    members_qs = Membership.objects.for_site(site).filter(organization=org, active=True).select_related('user', 'role')
     admins = [m.user for m in members_qs if role_orgadmin and m.role_id == role_orgadmin.id]
     ctx = {
         'site': site,
@@ -184,24 +366,16 @@ def organization_detail(request, site_id: int, org_id: int):
 @login_required
 def organization_home(request, site_id: int, org_id: int):
     site = get_object_or_404(Site.objects.all(), pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
-    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
+    org = get_object_or_404(Organization.objects.for_site(site), pk=org_id)
     active_tab = request.GET.get('tab', 'overview').lower()
     if active_tab not in {'overview','business','delivery','operations','metrics','review','reports'}:
         active_tab = 'overview'
-    # Ensure baseline sections exist for known tabs/titles
-    default_titles = {
-        'overview': ['Vision','Mission','Value','Strategy','Structure','Type','Summary'],
-        'delivery': ['Portfolio','Program','Projects / Products / Services'],
-    }
-    if active_tab in default_titles:
-        for idx, title in enumerate(default_titles[active_tab]):
-            key = slugify(title)[:64]
-            sec, created = OrganizationSection.objects.get_or_create(
-                organization=org, tab=active_tab, key=key, defaults={'title': title, 'order': idx}
-            )
-            # Do not change order if already exists; only set on creation
+    # Delivery can be generated from the construct tree (cached per construct version)
+    delivery = delivery_tab(org) if active_tab == 'delivery' and org.delivery_from_constructs else None
+    if delivery is None:
+        _ensure_default_sections(org, active_tab)
     # Load sections and build maps
     sections = OrganizationSection.objects.filter(organization=org, active=True).order_by('tab', 'order', 'id')
     meta: dict[str, dict[str, str]] = {}
@@ -212,8 +386,8 @@ def organization_home(request, site_id: int, org_id: int):
     org.meta = meta
     org.meta_ids = meta_ids
     # Permissions for editing
-    is_site_admin = _is_site_admin(request.user, site)
-    is_org_admin = _is_org_admin(request.user, site, org)
+    site_admin = is_site_admin(request.user, site)
+    org_admin = is_org_admin(request.user, site, org)
     # Org admin can edit only a subset of sections; site admin can edit all
     editable_by_org_admin = {
         'overview': {t: True for t in ['Vision','Mission','Value','Strategy','Structure','Type','Summary']},
@@ -223,11 +397,18 @@ def organization_home(request, site_id: int, org_id: int):
         'site': site,
         'org': org,
         'active_tab': active_tab,
-        'can_manage_types': (is_site_admin or is_org_admin),
-        'is_site_admin': is_site_admin,
-        'is_org_admin': is_org_admin,
+        'can_manage_types': (site_admin or org_admin),
+        'is_site_admin': site_admin,
+        'is_org_admin': org_admin,
         'editable_by_org_admin': editable_by_org_admin,
+        'delivery': delivery,
     }
+    if active_tab == 'metrics':
+        root = request.GET.get('root')
+        ctx['flow'] = flow_metrics(org, root_id=int(root) if root and root.isdigit() else None)
+    if active_tab == 'reports':
+        latest = latest_snapshots(org)
+        ctx['reports'] = [(kind, label, latest.get(kind)) for kind, label in ReportSnapshot.KIND_CHOICES]
     return render(request, 'app_site/siteadmin/org_home.html', ctx)
 
 
@@ -236,14 +417,14 @@ def organization_home(request, site_id: int, org_id: int):
 @require_http_methods(["GET", "POST"])
 def organization_section_edit_modal(request, site_id: int, org_id: int, section_id: int):
     site = get_object_or_404(Site.objects.all(), pk=site_id)
-    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
-    is_site_admin = _is_site_admin(request.user, site)
-    is_org_admin = _is_org_admin(request.user, site, org)
-    if not (is_site_admin or is_org_admin):
+    org = get_object_or_404(Organization.objects.for_site(site), pk=org_id)
+    site_admin = is_site_admin(request.user, site)
+    org_admin = is_org_admin(request.user, site, org)
+    if not (site_admin or org_admin):
         return HttpResponseForbidden()
     sec = get_object_or_404(OrganizationSection.objects.all(), pk=section_id, organization=org)
     # If org admin, restrict to allowed sections
-    if is_org_admin and not is_site_admin:
+    if org_admin and not site_admin:
         allowed_titles = {
             'overview': {'Vision','Mission','Value','Strategy','Structure','Type','Summary'},
             'delivery': {'Portfolio','Program','Projects / Products / Services'},
@@ -276,8 +457,8 @@ def organization_section_edit_modal(request, site_id: int, org_id: int, section_
 @require_http_methods(["GET", "POST"])
 def organization_type_option_create_modal(request, site_id: int, org_id: int):
     site = get_object_or_404(Site.objects.all(), pk=site_id)
-    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
-    if not (_is_site_admin(request.user, site) or _is_org_admin(request.user, site, org)):
+    org = get_object_or_404(Organization.objects.for_site(site), pk=org_id)
+    if not (is_site_admin(request.user, site) or is_org_admin(request.user, site, org)):
         return HttpResponseForbidden()
     if request.method == 'POST':
         form = OrganizationTypeOptionForm(request.POST)
@@ -301,36 +482,19 @@ def organization_tab_edit_modal(request, site_id: int, org_id: int):
     Overview→Type uses OrganizationSectionTypeForm; others use OrganizationSectionForm.
     """
     site = get_object_or_404(Site.objects.all(), pk=site_id)
-    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
-    is_site_admin = _is_site_admin(request.user, site)
-    is_org_admin = _is_org_admin(request.user, site, org)
-    if not (is_site_admin or is_org_admin):
+    org = get_object_or_404(Organization.objects.for_site(site), pk=org_id)
+    site_admin = is_site_admin(request.user, site)
+    org_admin = is_org_admin(request.user, site, org)
+    if not (site_admin or org_admin):
         return HttpResponseForbidden()
     tab = (request.GET.get('tab') or request.POST.get('tab') or 'overview').lower()
     allowed_tabs = {'overview','business','delivery','operations','metrics','review','reports'}
     if tab not in allowed_tabs:
         tab = 'overview'
-    # Ensure baseline sections similar to organization_home
-    default_titles = {
-        'overview': ['Vision','Mission','Value','Strategy','Structure','Type','Summary'],
-        'delivery': ['Portfolio','Program','Projects / Products / Services'],
-    }
-    if tab in default_titles:
-        for idx, title in enumerate(default_titles[tab]):
-            key = slugify(title)[:64]
-            # Look across all records including deleted; restore if necessary
-            existing = OrganizationSection.all_objects.filter(organization=org, tab=tab, key=key).first()
-            if existing:
-                if getattr(existing, 'deleted', False):
-                    existing.deleted = False
-                    existing.active = True
-                    existing.save(update_fields=['deleted', 'active'])
-            else:
-                # Create with canonical order index
-                OrganizationSection.objects.create(organization=org, tab=tab, key=key, title=title, order=idx)
+    _ensure_default_sections(org, tab)
     sections_qs = OrganizationSection.objects.filter(organization=org, tab=tab, active=True).order_by('order','id')
     # Restrict editable set for org admin (site admin sees all)
-    if not is_site_admin and is_org_admin:
+    if not site_admin and org_admin:
         allowed_titles = {
             'overview': ['Vision','Mission','Value','Strategy','Structure','Type','Summary'],
             'delivery': ['Portfolio','Program','Projects / Products / Services'],
@@ -354,8 +518,11 @@ def organization_tab_edit_modal(request, site_id: int, org_id: int):
             if not form.is_valid():
                 all_valid = False
         if all_valid:
-            for _, form in form_specs:
-                form.save()
+            with batched():
+                for _, form in form_specs:
+                    # Untouched sections are not rewritten
+                    if form.has_changed():
+                        form.save()
             html = render_to_string('app_site/siteadmin/_toast_success.html', {"message": f"{tab.title()} updated."}, request=request)
             return JsonResponse({"ok": True, "toast": html})
         else:
@@ -378,8 +545,8 @@ def organization_tab_edit_modal(request, site_id: int, org_id: int):
 def organization_type_manage_modal(request, site_id: int, org_id: int):
     """Simple list-management modal for type options: reorder, activate/deactivate, delete."""
     site = get_object_or_404(Site.objects.all(), pk=site_id)
-    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
-    if not (_is_site_admin(request.user, site) or _is_org_admin(request.user, site, org)):
+    org = get_object_or_404(Organization.objects.for_site(site), pk=org_id)
+    if not (is_site_admin(request.user, site) or is_org_admin(request.user, site, org)):
         return HttpResponseForbidden()
     if request.method == 'POST':
         action = request.POST.get('action')
@@ -389,6 +556,7 @@ def organization_type_manage_modal(request, site_id: int, org_id: int):
             # Reorder by list order
             for idx, pk in enumerate(ids):
                 OrganizationTypeOption.all_objects.filter(pk=pk).update(position=idx)
+            bump(model_ns(OrganizationTypeOption))
         elif action in {'delete','restore'} and ids:
             qs = OrganizationTypeOption.all_objects.filter(pk__in=ids)
             if action == 'delete':
@@ -459,12 +627,17 @@ def organization_type_manage_modal(request, site_id: int, org_id: int):
 
 
 @login_required
-@require_http_methods(["GET"])
+@require_http_methods(["GET", "POST"])
 def organization_settings_modal(request, site_id: int, org_id: int):
     site = get_object_or_404(Site.objects.all(), pk=site_id)
-    org = get_object_or_404(Organization.objects.all(), pk=org_id, site=site)
-    if not (_is_site_admin(request.user, site) or _is_org_admin(request.user, site, org)):
+    org = get_object_or_404(Organization.objects.for_site(site), pk=org_id)
+    if not (is_site_admin(request.user, site) or is_org_admin(request.user, site, org)):
         return HttpResponseForbidden()
+    if request.method == 'POST':
+        org.delivery_from_constructs = request.POST.get('delivery_from_constructs') == 'on'
+        org.save(update_fields=['delivery_from_constructs', 'updated_at'])
+        html = render_to_string('app_site/siteadmin/_toast_success.html', {"message": "Settings saved."}, request=request)
+        return JsonResponse({"ok": True, "toast": html})
     html = render_to_string('app_site/siteadmin/_org_settings.html', {"site": site, "org": org}, request=request)
     return JsonResponse({"ok": True, "form": html})
 
@@ -473,7 +646,7 @@ def organization_settings_modal(request, site_id: int, org_id: int):
 @require_http_methods(["GET", "POST"])
 def site_edit_modal(request, site_id: int):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     if request.method == "POST":
         form = SiteForm(request.POST, instance=site)
@@ -514,7 +687,7 @@ def site_create_modal(request):
 @require_http_methods(["GET", "POST"])
 def organization_edit_modal(request, site_id: int, org_id: int | None = None):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     org = get_object_or_404(Organization, pk=org_id, site=site) if org_id else Organization(site=site)
     if request.method == "POST":
@@ -538,7 +711,7 @@ def organization_edit_modal(request, site_id: int, org_id: int | None = None):
 @require_http_methods(["GET", "POST"])
 def membership_edit_modal(request, site_id: int, membership_id: int | None = None, role_code: str | None = None, org_id: int | None = None):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     if membership_id:
         membership = get_object_or_404(Membership, pk=membership_id, site=site)
@@ -575,7 +748,7 @@ def membership_edit_modal(request, site_id: int, membership_id: int | None = Non
 @require_http_methods(["GET", "POST"])
 def org_list_bulk_admin(request, site_id: int):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     if request.method == "POST":
         form = BulkOrgAdminForm(request.POST, site=site)
@@ -585,17 +758,18 @@ def org_list_bulk_admin(request, site_id: int):
             role = Role.objects.filter(code='orgadmin').first()
             if not role:
                 return JsonResponse({"ok": False, "error": "Role orgadmin missing"}, status=400)
-            orgs = Organization.objects.filter(site=site, id__in=selected)
-            for org in orgs:
-                mem, _ = Membership.objects.get_or_create(user=user, site=site, organization=org, role=role)
-                mem.active = True
-                mem.save()
+            orgs = Organization.objects.for_site(site).filter(id__in=selected)
+            with batched():
+                for org in orgs:
+                    mem, _ = Membership.objects.get_or_create(user=user, site=site, organization=org, role=role)
+                    mem.active = True
+                    mem.save()
             return JsonResponse({"ok": True})
-        html = render_to_string('app_site/siteadmin/_org_bulk_admin.html', {"form": form, "site": site, "orgs": Organization.objects.filter(site=site)}, request=request)
+        html = render_to_string('app_site/siteadmin/_org_bulk_admin.html', {"form": form, "site": site, "orgs": Organization.objects.for_site(site)}, request=request)
         return JsonResponse({"ok": False, "form": html}, status=400)
     else:
         form = BulkOrgAdminForm(site=site)
-        html = render_to_string('app_site/siteadmin/_org_bulk_admin.html', {"form": form, "site": site, "orgs": Organization.objects.filter(site=site)}, request=request)
+        html = render_to_string('app_site/siteadmin/_org_bulk_admin.html', {"form": form, "site": site, "orgs": Organization.objects.for_site(site)}, request=request)
         return JsonResponse({"ok": True, "form": html})
 
 
@@ -603,7 +777,7 @@ def org_list_bulk_admin(request, site_id: int):
 @require_http_methods(["POST"])
 def org_soft_delete(request, site_id: int, org_id: int):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     org = get_object_or_404(Organization, pk=org_id, site=site)
     org.delete()
@@ -614,12 +788,12 @@ def org_soft_delete(request, site_id: int, org_id: int):
 @require_http_methods(["POST"])
 def org_restore(request, site_id: int, org_id: int):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     org = get_object_or_404(Organization.all_objects, pk=org_id, site=site)
     org.deleted = False
     org.active = True
-    org.save(update_fields=['deleted', 'active'])
+    org.save(update_fields=['deleted', 'active', 'updated_at'])
     return JsonResponse({"ok": True})
 
 
@@ -627,10 +801,10 @@ def org_restore(request, site_id: int, org_id: int):
 @require_http_methods(["POST"])
 def org_bulk_delete(request, site_id: int):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     ids = request.POST.getlist('org_ids') or request.POST.getlist('ids')
-    qs = Organization.objects.filter(site=site, id__in=ids)
+    qs = Organization.objects.for_site(site).filter(id__in=ids)
     count = 0
     for o in qs:
         o.delete()
@@ -642,15 +816,15 @@ def org_bulk_delete(request, site_id: int):
 @require_http_methods(["POST"])
 def org_bulk_restore(request, site_id: int):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     ids = request.POST.getlist('org_ids') or request.POST.getlist('ids')
-    qs = Organization.all_objects.filter(site=site, id__in=ids)
+    qs = Organization.all_objects.for_site(site).filter(id__in=ids)
     count = 0
     for o in qs:
         o.deleted = False
         o.active = True
-        o.save(update_fields=['deleted', 'active'])
+        o.save(update_fields=['deleted', 'active', 'updated_at'])
         count += 1
     return JsonResponse({"ok": True, "count": count})
 
@@ -659,7 +833,7 @@ def org_bulk_restore(request, site_id: int):
 @require_http_methods(["POST"])
 def membership_soft_delete(request, site_id: int, membership_id: int):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     membership = get_object_or_404(Membership, pk=membership_id, site=site)
     membership.delete()
@@ -670,7 +844,7 @@ def membership_soft_delete(request, site_id: int, membership_id: int):
 @require_http_methods(["POST"])
 def site_soft_delete(request, site_id: int):
     site = get_object_or_404(Site, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     site.delete()
     return JsonResponse({"ok": True})
@@ -680,11 +854,11 @@ def site_soft_delete(request, site_id: int):
 @require_http_methods(["POST"])
 def site_restore(request, site_id: int):
     site = get_object_or_404(Site.all_objects, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     site.deleted = False
     site.active = True
-    site.save(update_fields=['deleted', 'active'])
+    site.save(update_fields=['deleted', 'active', 'updated_at'])
     return JsonResponse({"ok": True})
 
 
@@ -695,7 +869,7 @@ def site_bulk_delete(request):
     qs = Site.objects.filter(id__in=ids)
     # Ensure caller is admin of each site
     for s in list(qs):
-        if not _is_site_admin(request.user, s):
+        if not is_site_admin(request.user, s):
             return HttpResponseForbidden()
     for s in qs:
         s.delete()
@@ -709,12 +883,12 @@ def site_bulk_restore(request):
     qs = Site.all_objects.filter(id__in=ids)
     # Ensure caller is admin of each site
     for s in list(qs):
-        if not _is_site_admin(request.user, s):
+        if not is_site_admin(request.user, s):
             return HttpResponseForbidden()
     for s in qs:
         s.deleted = False
         s.active = True
-        s.save(update_fields=['deleted', 'active'])
+        s.save(update_fields=['deleted', 'active', 'updated_at'])
     return JsonResponse({"ok": True, "count": qs.count()})
 
 
@@ -722,15 +896,15 @@ def site_bulk_restore(request):
 @require_http_methods(["POST"])
 def site_permadelete(request, site_id: int):
     site = get_object_or_404(Site.all_objects, pk=site_id)
-    if not _is_site_admin(request.user, site):
+    if not is_site_admin(request.user, site):
         return HttpResponseForbidden()
     site.deleted = True
     site.active = False
     if hasattr(site, 'blocked'):
         site.blocked = True
-        site.save(update_fields=['deleted', 'active', 'blocked'])
+        site.save(update_fields=['deleted', 'active', 'blocked', 'updated_at'])
     else:
-        site.save(update_fields=['deleted', 'active'])
+        site.save(update_fields=['deleted', 'active', 'updated_at'])
     return JsonResponse({"ok": True})
 
 
@@ -740,7 +914,7 @@ def site_bulk_permadelete(request):
     ids = request.POST.getlist('ids')
     qs = Site.all_objects.filter(id__in=ids)
     for s in list(qs):
-        if not _is_site_admin(request.user, s):
+        if not is_site_admin(request.user, s):
             return HttpResponseForbidden()
     count = 0
     for s in qs:
@@ -748,8 +922,8 @@ def site_bulk_permadelete(request):
         s.active = False
         if hasattr(s, 'blocked'):
             s.blocked = True
-            s.save(update_fields=['deleted', 'active', 'blocked'])
+            s.save(update_fields=['deleted', 'active', 'blocked', 'updated_at'])
         else:
-            s.save(update_fields=['deleted', 'active'])
+            s.save(update_fields=['deleted', 'active', 'updated_at'])
         count += 1
     return JsonResponse({"ok": True, "count": count})
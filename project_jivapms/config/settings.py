@@ -32,11 +32,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.app_0.mod_0.middleware.MetricsMiddleware',
+    'apps.app_0.mod_0.middleware.QueryInspectorMiddleware',
+    'apps.app_0.mod_0.middleware.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.app_0.mod_0.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -69,6 +72,37 @@ DATABASES = {
     }
 }
 
+# Database profile. DB_PROFILE=production keeps connections open between requests, starts
+# write transactions with BEGIN IMMEDIATE (waits on the busy timeout instead of failing with
+# "database is locked" on lock upgrade) and applies SQLITE_PRAGMAS to every new connection
+# (apps/app_0/mod_0/sqlite.py).
+DB_PROFILE = os.environ.get('DB_PROFILE', 'development')
+SQLITE_PRAGMAS = {}
+if DB_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    })
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'wal',      # readers and the writer no longer block each other
+        'synchronous': 'normal',    # fsync at checkpoints only; durable enough with WAL
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,   # negative: KiB, i.e. a 64 MiB page cache
+        'temp_store': 'memory',
+    }
+
+# Read replicas: DB_REPLICAS=/path/a.sqlite3,/path/b.sqlite3 adds aliases replica1..N that
+# serve reads (apps/app_0/mod_0/dbrouter.py). Replication itself happens outside Django.
+# After a write, the request and the same browser for REPLICA_PIN_SECONDS read the primary.
+DATABASE_REPLICAS = []
+for _n, _name in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{_n}'] = {**DATABASES['default'], 'NAME': _name, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{_n}')
+DATABASE_ROUTERS = ['apps.app_0.mod_0.dbrouter.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = float(os.environ.get('REPLICA_PIN_SECONDS', '5'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -94,6 +128,71 @@ TOP_LEVEL_DIR = PROJECT_ROOT  # contains 'apps/' and 'apis/'
 if str(TOP_LEVEL_DIR) not in sys.path:
     sys.path.insert(0, str(TOP_LEVEL_DIR))
 
+# Cache: per-process memory unless CACHE_BACKEND/CACHE_LOCATION point elsewhere. Invalidation
+# bumps generation counters in the database (apps/app_0/mod_0/gencache.py), so each process
+# sees the others' writes with no shared cache service.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'jivapms'),
+    }
+}
+if CACHE_BACKEND.endswith(('LocMemCache', 'FileBasedCache')):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '10000'))}
+# Cached builders (gencache.get_or_set): entries are fresh for the soft TTL, then served stale
+# while one caller recomputes, and dropped after the hard TTL. Callers that find no entry wait
+# up to LOCK_WAIT seconds for the one computing it; LOCK_TIMEOUT bounds a crashed holder's lock.
+GENCACHE_SOFT_TTL = float(os.environ.get('GENCACHE_SOFT_TTL', '60'))
+GENCACHE_HARD_TTL = int(os.environ.get('GENCACHE_HARD_TTL', '3600'))
+GENCACHE_LOCK_TIMEOUT = int(os.environ.get('GENCACHE_LOCK_TIMEOUT', '30'))
+GENCACHE_LOCK_WAIT = float(os.environ.get('GENCACHE_LOCK_WAIT', '5'))
+
 # Auth
 LOGIN_URL = '/useradmin/login/'
-LOGIN_REDIRECT_URL = '/useradmin/dashboard/'
\ No newline at end of file
+LOGIN_REDIRECT_URL = '/useradmin/dashboard/'
+
+# Sessions: SESSION_MODE=db (default), cached_db (reads from CACHES, writes through to the
+# database) or signed_cookies (no server-side storage). AUTH_USER_CACHE_SECONDS>0 also serves
+# request.user from the cache (apps/app_0/mod_0/authcache.py); keep it short when CACHES is
+# per process, since another process's user save is only seen after it expires.
+SESSION_MODE = os.environ.get('SESSION_MODE', 'db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_MODE]
+AUTH_USER_CACHE_SECONDS = int(os.environ.get('AUTH_USER_CACHE_SECONDS', '0'))
+
+# Live site events (SSE): seconds between change-feed polls that pick up writes from other
+# processes; 0 relies on the in-process broadcaster only (single-process deployments)
+SITE_EVENTS_POLL_SECONDS = float(os.environ.get('SITE_EVENTS_POLL_SECONDS', '5'))
+
+# Readiness probe: seconds a pending-migrations check is reused before the next one; a check
+# that found pending migrations (or failed) is retried sooner
+HEALTH_MIGRATIONS_TTL = float(os.environ.get('HEALTH_MIGRATIONS_TTL', '300'))
+HEALTH_MIGRATIONS_RETRY_TTL = float(os.environ.get('HEALTH_MIGRATIONS_RETRY_TTL', '5'))
+
+# Request metrics (/metrics/): per-process totals are merged through this SQLite file. Point it
+# outside the source tree (e.g. /var/lib/jivapms/metrics.sqlite3); unset, each process keeps
+# its own totals in memory and /metrics/ reports only the process that serves it.
+METRICS_STORE = os.environ.get('METRICS_STORE', '')
+METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', '10'))
+# Optional bearer token for scrapers; staff sessions are always accepted
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# N+1 / query budget inspection (debug and staging; see apps/app_0/mod_0/querycheck.py).
+# QUERY_INSPECTOR=1 enables it; QUERY_INSPECTOR_SAMPLE=0.1 inspects 10% of requests.
+QUERY_INSPECTOR = {
+    'ENABLED': os.environ.get('QUERY_INSPECTOR', '') == '1',
+    'SAMPLE_RATE': float(os.environ.get('QUERY_INSPECTOR_SAMPLE', '1')),
+    'REPEAT_THRESHOLD': 5,
+    'ACTION': os.environ.get('QUERY_INSPECTOR_ACTION', 'log'),
+    'CAPTURE_STACK': os.environ.get('QUERY_INSPECTOR_STACKS', '1') == '1',
+    'DEFAULT_BUDGET': 50,
+    'BUDGETS': {
+        'siteadmin_dashboard': 30,
+        'siteadmin_detail': 30,
+        'siteadmin_org_home': 30,
+    },
+}
@@ -0,0 +1,7 @@
+"""Settings for `manage.py test` (selected in manage.py)."""
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES
+
+# Stand-in for a lagging replica in ReplicaRoutingTests. Not routed to unless listed in
+# DATABASE_REPLICAS; without a TEST NAME its test database is in memory.
+DATABASES['replica_test'] = {**DATABASES['default'], 'TEST': {}}
@@ -2,10 +2,10 @@ from django.contrib import admin
 from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.urls import include, path
-from apps.app_0.mod_0.views import index
+from apps.app_0.mod_0.views import index, metrics, readiness
 
 
-def health(_):
+async def health(_):
     return JsonResponse({'status': 'ok'})
 
 
@@ -18,5 +18,7 @@ urlpatterns = [
     path('adminx/', include('apps.app_adminx.urls')),
     path('orgadmin/', include('apps.app_organization.mod_organization.urls')),
     path('health/', health, name='health'),
+    path('health/ready/', readiness, name='health_ready'),
+    path('metrics/', metrics, name='metrics'),
     path('', include('apps.app_0.mod_0.urls')),
 ]
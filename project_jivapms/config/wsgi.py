@@ -3,3 +3,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_wsgi_application()
+
+# Read the migration graph once at startup so readiness probes stay cheap
+from apps.app_0.mod_0.health import warm  # noqa: E402
+
+warm()
@@ -4,7 +4,9 @@ import sys
 
 
 def main():
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    # Tests add a database alias (see config/settings_test.py) that other commands must not open
+    test = sys.argv[1:2] == ['test']
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings_test' if test else 'config.settings')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc: